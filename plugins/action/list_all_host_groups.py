@@ -0,0 +1,17 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from ansible_collections.parnoud.centreon.plugins.modules import list_all_host_groups
+from ansible_collections.parnoud.centreon.plugins.plugin_utils.centreon_action import CentreonActionBase
+
+
+class ActionModule(CentreonActionBase):
+
+    MODULE = list_all_host_groups
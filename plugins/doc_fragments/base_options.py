@@ -14,6 +14,8 @@ class ModuleDocFragment(object):
 notes:
   - All modules require a token to acces to Centreon APIv2
   - All modules require a account with API access
+  - When the task uses the C(parnoud.centreon.centreon) httpapi connection, the connection options and credentials
+    come from the inventory and O(hostname), O(username), O(password), O(token) and the session options are ignored.
 options:
   hostname:
     description:
@@ -50,4 +52,129 @@ options:
     type: int
     required: false
     default: 30
+  pool_maxsize:
+    description:
+    - Maximum number of connections kept in the HTTP connection pool.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_POOL_MAXSIZE) will be used instead.
+    type: int
+    required: false
+    default: 10
+  keep_alive:
+    description:
+    - Reuse TCP/TLS connections between requests to the Centreon API.
+    - Set to V(false) to open a new connection for every request.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_KEEP_ALIVE) will be used instead.
+    type: bool
+    required: false
+    default: True
+  max_concurrency:
+    description:
+    - Maximum number of pages fetched in parallel when listing a paginated endpoint.
+    - The first page is always fetched alone to learn the total, the remaining pages are then fetched concurrently.
+    - V(1) fetches pages one after another.
+    - Keep O(pool_maxsize) greater than or equal to this value so every worker gets a pooled connection.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_MAX_CONCURRENCY) will be used instead.
+    type: int
+    required: false
+    default: 1
+  page_size:
+    description:
+    - Number of rows requested per page when listing a paginated endpoint.
+    - Larger pages reduce round trips for bulk exports, smaller pages are gentler on slow servers.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_PAGE_SIZE) will be used instead.
+    type: int
+    required: false
+    default: 100
+  adaptive_page_size:
+    description:
+    - Start with O(page_size) then halve or double the page size according to the response time and payload size of each page.
+    - Only applies when pages are fetched one after another, that is when O(max_concurrency) is V(1).
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_ADAPTIVE_PAGE_SIZE) will be used instead.
+    type: bool
+    required: false
+    default: False
+  pagination:
+    description:
+    - How the rows of the configuration listings are paged.
+    - V(offset) requests the pages by number, and can fetch them concurrently with O(max_concurrency).
+    - V(keyset) sorts the rows by id and requests each page as the rows above the last id received.
+      Every page costs the same on the database, and hosts created or deleted during the scan do not
+      make other rows duplicated or skipped. Pages are then always fetched one after another.
+    - Listings that are not part of the configuration API, such as the real-time monitoring ones, always use V(offset).
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_PAGINATION) will be used instead.
+    type: str
+    required: false
+    choices: [offset, keyset]
+    default: offset
+  token_cache:
+    description:
+    - Share the token obtained with O(username) and O(password) between tasks and forks through a locked file.
+    - The cached token is reused until O(token_cache_ttl) expires, and a new login is done when the server rejects it.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_TOKEN_CACHE) will be used instead.
+    type: bool
+    required: false
+    default: False
+  token_cache_path:
+    description:
+    - Path of the token cache file, a lock file with the C(.lock) suffix is created next to it.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_TOKEN_CACHE_PATH) will be used instead.
+    type: path
+    required: false
+    default: ~/.ansible/tmp/centreon_token_cache.json
+  token_cache_ttl:
+    description:
+    - Number of seconds a cached token is reused.
+    - Keep it below the session expiration time configured on the Centreon server.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_TOKEN_CACHE_TTL) will be used instead.
+    type: int
+    required: false
+    default: 3600
+  retries:
+    description:
+    - Number of times a request is retried after a connection error or a 429, 502, 503 or 504 response.
+    - The delay between attempts grows exponentially with random jitter, or follows the C(Retry-After) header when the server sends one.
+    - Only GET and PUT requests are retried unless O(retry_non_idempotent) is set, 429 responses are retried for every method.
+    - The number of retries done is returned as C(api_retries) in the task result.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_RETRIES) will be used instead.
+    type: int
+    required: false
+    default: 3
+  retry_backoff:
+    description:
+    - Base delay in seconds of the exponential backoff between retries.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_RETRY_BACKOFF) will be used instead.
+    type: float
+    required: false
+    default: 0.5
+  retry_non_idempotent:
+    description:
+    - Also retry POST, PATCH and DELETE requests after a connection error or a 502, 503 or 504 response.
+    - The request may then be applied twice by the server, and a DELETE that was applied fails with a 404 response.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_RETRY_NON_IDEMPOTENT) will be used instead.
+    type: bool
+    required: false
+    default: False
+  rate_limit:
+    description:
+    - Maximum number of requests per second sent to O(hostname), all forks of the controller together.
+    - The limit is enforced with a token bucket shared through the O(rate_limit_path) file.
+    - Requests are not limited when unset.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_RATE_LIMIT) will be used instead.
+    type: float
+    required: false
+  rate_limit_burst:
+    description:
+    - Number of requests that can be sent at once before O(rate_limit) applies.
+    - Defaults to O(rate_limit) rounded down, with a minimum of 1.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_RATE_LIMIT_BURST) will be used instead.
+    type: int
+    required: false
+  rate_limit_path:
+    description:
+    - Path of the file holding the shared token bucket.
+    - Every fork must use the same path for the limit to apply across them.
+    - If the value is not specified in the task, the value of environment variable E(CENTREON_RATE_LIMIT_PATH) will be used instead.
+    type: path
+    required: false
+    default: ~/.ansible/tmp/centreon_rate_limit.json
 '''
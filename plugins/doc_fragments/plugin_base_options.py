@@ -33,4 +33,49 @@ options:
     timeout:
         env:
             - name: CENTREON_TIMEOUT
+    pool_maxsize:
+        env:
+            - name: CENTREON_POOL_MAXSIZE
+    keep_alive:
+        env:
+            - name: CENTREON_KEEP_ALIVE
+    max_concurrency:
+        env:
+            - name: CENTREON_MAX_CONCURRENCY
+    page_size:
+        env:
+            - name: CENTREON_PAGE_SIZE
+    adaptive_page_size:
+        env:
+            - name: CENTREON_ADAPTIVE_PAGE_SIZE
+    pagination:
+        env:
+            - name: CENTREON_PAGINATION
+    token_cache:
+        env:
+            - name: CENTREON_TOKEN_CACHE
+    token_cache_path:
+        env:
+            - name: CENTREON_TOKEN_CACHE_PATH
+    token_cache_ttl:
+        env:
+            - name: CENTREON_TOKEN_CACHE_TTL
+    retries:
+        env:
+            - name: CENTREON_RETRIES
+    retry_backoff:
+        env:
+            - name: CENTREON_RETRY_BACKOFF
+    retry_non_idempotent:
+        env:
+            - name: CENTREON_RETRY_NON_IDEMPOTENT
+    rate_limit:
+        env:
+            - name: CENTREON_RATE_LIMIT
+    rate_limit_burst:
+        env:
+            - name: CENTREON_RATE_LIMIT_BURST
+    rate_limit_path:
+        env:
+            - name: CENTREON_RATE_LIMIT_PATH
 '''
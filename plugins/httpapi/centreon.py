@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+
+DOCUMENTATION = r'''
+---
+author:
+    - ARNOUD Pierre (@parnoud)
+name: centreon
+short_description: HttpApi plugin for Centreon REST API v2
+description:
+    - Keeps one authenticated and pooled session to the Centreon API v2 alive for the whole play.
+    - Modules of this collection route their requests through it when
+      C(ansible_connection=ansible.netcommon.httpapi) and C(ansible_network_os=parnoud.centreon.centreon).
+    - The host, port and TLS settings come from the C(ansible.netcommon.httpapi) connection.
+    - The credentials come from O(ansible.netcommon.httpapi#connection:remote_user) and
+      O(ansible.netcommon.httpapi#connection:password), or from a session key holding an C(X-AUTH-TOKEN) header.
+    - The timeout, token cache, retry and rate limit options of each task apply to the requests it sends through the session.
+options:
+    centreon_api_path:
+        description:
+            - Path of the Centreon API v2 on the server.
+        type: str
+        default: /centreon/api/latest
+        vars:
+            - name: ansible_httpapi_centreon_api_path
+    centreon_pool_maxsize:
+        description:
+            - Maximum number of connections kept in the HTTP connection pool.
+        type: int
+        default: 10
+        vars:
+            - name: ansible_httpapi_centreon_pool_maxsize
+    centreon_timeout:
+        description:
+            - Timeout in seconds of each request to the Centreon API, for the requests whose task does not set one.
+            - It should stay below O(ansible.netcommon.httpapi#connection:persistent_command_timeout), which bounds
+              the time a task waits for the connection, retries included.
+        type: int
+        default: 30
+        vars:
+            - name: ansible_httpapi_centreon_timeout
+'''
+
+EXAMPLES = r'''
+# inventory
+[centreon]
+central ansible_host=centreon.local
+
+[centreon:vars]
+ansible_connection=ansible.netcommon.httpapi
+ansible_network_os=parnoud.centreon.centreon
+ansible_httpapi_use_ssl=true
+ansible_user=username
+ansible_password=password
+
+# playbook, hostname, username and password are not needed in the tasks
+- name: Create host
+  parnoud.centreon.manage_host:
+    state: create
+    monitoring_server_id: 1
+    name: my-host
+    address: 127.0.0.1
+'''
+
+from ansible.module_utils.common.text.converters import to_text
+from ansible_collections.ansible.netcommon.plugins.plugin_utils.httpapi_base import HttpApiBase
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+
+
+class HttpApi(HttpApiBase):
+
+    def __init__(self, connection):
+        super(HttpApi, self).__init__(connection)
+        self._api = None
+        self._client_options = {}
+
+    def _task_options(self) -> dict:
+        """Return the client options of the current task, with the timeout of the connection by default."""
+        options = dict(self._client_options)
+        if options.get('timeout') is None:
+            options['timeout'] = self.get_option('centreon_timeout')
+        return options
+
+    def _build_api(self, **credentials) -> CentreonAPI:
+        """Build the client shared by all the tasks using this connection."""
+        return CentreonAPI(
+            hostname=f"{self.connection._url}{self.get_option('centreon_api_path')}",
+            validate_certs=self.connection.get_option('validate_certs'),
+            pool_maxsize=self.get_option('centreon_pool_maxsize'),
+            **credentials,
+            **self._task_options()
+        )
+
+    def login(self, username, password):
+        """Log in once for the lifetime of the persistent connection."""
+        self._api = self._build_api(username=username, password=password)
+
+    def logout(self):
+        """Release the token and the pooled connections."""
+        if self._api is None:
+            return
+        try:
+            if self._api.username:
+                self._api.logout()
+        finally:
+            self._api.close()
+            self._api = None
+
+    def send_request(self, method, endpoint, data=None, params=None, options=None):
+        """Send a request to the Centreon API and return the status code, the body and the number of retries.
+
+        options are the CLIENT_OPTIONS of the task sending the request, applied to the shared client first.
+        """
+        self._client_options = options or {}
+        if self._api is None:
+            # Runs login(), or stores the session key when one is configured.
+            self.connection._connect()
+        if self._api is None:
+            token = (self.connection._auth or {}).get('X-AUTH-TOKEN')
+            self._api = self._build_api(token=token)
+        else:
+            self._api.configure(**self._task_options())
+
+        retry_count = self._api.retry_count
+        code, response_data = self._api._request(method, endpoint, data=data, params=params)
+        return code, to_text(response_data), self._api.retry_count - retry_count
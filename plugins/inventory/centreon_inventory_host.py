@@ -27,6 +27,9 @@ options:
         description:
             - attributes to include in the inventory.
             - default add all attributes and groups by templates, groups and categories
+            - the id, alias, address, monitoring_server and list_groups of the hosts are always included,
+              the host variables of the other attributes are only set when they are listed
+            - hosts always belong to the groups of their centreon host groups
             - templates (cetreon host templates) listed as list_templates
             - groups (cetreon host groups) listed as list_groups
             - categories (centreon host categories) listed as list_categories
@@ -43,8 +46,95 @@ options:
             - categories
             - groups
             - is_activated
+    pollers:
+        description:
+            - Monitoring servers, given by id or by name, whose hosts are included in the inventory.
+            - All the hosts are included when not set.
+        type: list
+        elements: raw
+        required: false
+    shard_by_poller:
+        description:
+            - List the monitoring servers first, then fetch the hosts of each monitoring server
+              concurrently with a C(monitoring_server.id) search.
+            - Hosts returned for several monitoring servers are only added once.
+        type: bool
+        default: false
+    poller_concurrency:
+        description: Maximum number of monitoring servers whose hosts are fetched at the same time with O(shard_by_poller).
+        type: int
+        default: 4
+    realtime:
+        description:
+            - Add the real-time status of the hosts from C(monitoring/hosts), listed in parallel with the
+              configuration and joined by host id.
+            - Each host gets a C(status) variable with its status C(code) and C(name), C(in_downtime)
+              and C(acknowledged), and belongs to the C(status_<name>) group of its status, for example
+              C(status_down), as well as to C(status_in_downtime) and C(status_acknowledged) when they apply.
+            - These groups are children of the C(status) group. The status is never cached.
+        type: bool
+        default: false
+    instances:
+        description:
+            - Centreon central servers to fetch the hosts from concurrently, instead of O(hostname).
+            - Each instance is a dictionary with a C(name) and a C(hostname), and optionally C(username),
+              C(password), C(token), C(validate_certs) and C(search). Missing keys use the plugin options.
+            - An instance setting any of C(username), C(password) or C(token) only uses its own credentials,
+              none of them come from the plugin options then.
+            - Each host gets an C(instance) variable with the name of its instance and belongs to the
+              C(instance_<name>) group, child of the C(instances) group.
+            - Cannot be used with O(cache_invalidation=pollers).
+        type: list
+        elements: dict
+        required: false
+    instance_groups:
+        description:
+            - How the groups of several instances are combined.
+            - V(merge) puts the hosts of all the instances in the same group when the group names match.
+            - V(namespace) prefixes the group names with the instance name, for example C(paris_linux).
+        type: str
+        choices: ['merge', 'namespace']
+        default: merge
+    instance_conflict:
+        description:
+            - What to do when several instances have a host with the same name.
+            - V(error) fails the inventory, V(first) keeps the host of the first instance listed in O(instances).
+        type: str
+        choices: ['error', 'first']
+        default: error
+    refresh_mode:
+        description:
+            - How cached hosts older than O(cache_timeout) are refreshed.
+            - V(sync) fetches the hosts again before the inventory is returned.
+            - V(background) returns the cached hosts right away and refreshes the cache in a detached
+              process, only one refresher running at a time for a cache key.
+            - The lock of the refresher is kept in O(cache_connection) when it is a directory, else in
+              C(~/.ansible/tmp). A failed refresh is reported as a warning by the next run.
+            - Only used when O(cache) is enabled.
+        type: str
+        choices: ['sync', 'background']
+        default: sync
+    max_staleness:
+        description:
+            - With O(refresh_mode=background), cached hosts older than this number of seconds are
+              refreshed synchronously instead of being returned.
+        type: int
+        default: 86400
+    cache_invalidation:
+        description:
+            - How cached hosts are considered out of date.
+            - V(timeout) refreshes all the hosts once they are older than O(cache_timeout).
+            - V(pollers) lists the monitoring servers on each run and only fetches again the hosts of
+              the monitoring servers whose C(last_restart) changed or which have changes not exported
+              yet (C(is_updated)). O(cache_timeout) then only bounds how long the cache is kept,
+              and O(refresh_mode) is not used.
+            - Only used when O(cache) is enabled.
+        type: str
+        choices: ['timeout', 'pollers']
+        default: timeout
 extends_documentation_fragment:
     - parnoud.centreon.base_options
+    - inventory_cache
 '''
 
 EXAMPLES = r"""
@@ -73,18 +163,123 @@ EXAMPLES = r"""
             "$lk": "server-%"
         - "name":
             "$lk": "switch-%"
+
+# Sample configuration file for Centreon Host dynamic inventory cached for one hour
+    plugin: parnoud.centreon.centreon_inventory_host
+    hostname: http://centreon.local/centreon/api/latest
+    username: username
+    password: password
+    cache: true
+    cache_plugin: ansible.builtin.jsonfile
+    cache_connection: ~/.ansible/tmp/centreon_inventory
+    cache_timeout: 3600
+
+# Sample configuration file serving the cached hosts while they are refreshed in background
+    plugin: parnoud.centreon.centreon_inventory_host
+    hostname: http://centreon.local/centreon/api/latest
+    username: username
+    password: password
+    cache: true
+    cache_plugin: ansible.builtin.jsonfile
+    cache_connection: ~/.ansible/tmp/centreon_inventory
+    cache_timeout: 600
+    refresh_mode: background
+    max_staleness: 86400
+
+# Sample configuration file only fetching again the hosts of the monitoring servers with configuration changes
+    plugin: parnoud.centreon.centreon_inventory_host
+    hostname: http://centreon.local/centreon/api/latest
+    username: username
+    password: password
+    cache: true
+    cache_plugin: ansible.builtin.jsonfile
+    cache_connection: ~/.ansible/tmp/centreon_inventory
+    cache_timeout: 604800
+    cache_invalidation: pollers
+
+# Sample configuration file fetching the hosts of two monitoring servers concurrently
+    plugin: parnoud.centreon.centreon_inventory_host
+    hostname: http://centreon.local/centreon/api/latest
+    username: username
+    password: password
+    shard_by_poller: true
+    poller_concurrency: 2
+    pollers:
+        - Poller-Paris
+        - Poller-Lyon
+
+# Sample configuration file adding the real-time status of the hosts
+    plugin: parnoud.centreon.centreon_inventory_host
+    hostname: http://centreon.local/centreon/api/latest
+    username: username
+    password: password
+    realtime: true
+
+# Sample configuration file fetching the hosts of two centrals concurrently
+    plugin: parnoud.centreon.centreon_inventory_host
+    username: username
+    password: password
+    instance_groups: namespace
+    instances:
+        - name: paris
+          hostname: http://centreon-paris.local/centreon/api/latest
+        - name: lyon
+          hostname: http://centreon-lyon.local/centreon/api/latest
+          username: lyon-user
+          password: lyon-password
+          search:
+              "name":
+                  "$lk": "srv-%"
 """
 
+import fcntl
 import json
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-from ansible.plugins.inventory import BaseInventoryPlugin
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, get_cache_plugin
 from ansible.errors import AnsibleError
+from ansible.utils.display import Display
 from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
-from ansible_collections.parnoud.centreon.plugins.module_utils.host import find_all_host_configurations
+from ansible_collections.parnoud.centreon.plugins.module_utils.host import iter_host_configurations, iter_host_monitoring
+from ansible_collections.parnoud.centreon.plugins.module_utils.monitoring_server import iter_monitoring_server_configurations
+
+
+# Host variables always set, as (host attribute, variable name).
+HOST_VARIABLES = (
+    ('id', 'id'),
+    ('alias', 'alias'),
+    ('address', 'address'),
+    ('monitoring_server', 'monitoring_server'),
+    ('groups', 'list_groups'),
+)
 
+# Host variables set when their attribute is selected, as (host attribute, variable name).
+OPTIONAL_HOST_VARIABLES = (
+    ('templates', 'list_templates'),
+    ('normal_check_interval', 'normal_check_interval'),
+    ('retry_check_interval', 'retry_check_interval'),
+    ('check_timeperiod', 'check_timeperiod'),
+    ('severity', 'severity'),
+    ('categories', 'list_categories'),
+    ('is_activated', 'is_activated'),
+)
 
-class InventoryModule(BaseInventoryPlugin):
+# Attributes whose items become groups when selected, in addition to the host groups.
+GROUPING_ATTRIBUTES = ('templates', 'categories')
+
+# Options taken together from an instance when it sets any of them.
+CREDENTIAL_OPTIONS = ('token', 'username', 'password')
+
+# Directory of the files of the background refreshes when the cache is not kept in a directory.
+REFRESH_LOCK_DIR = '~/.ansible/tmp'
+
+display = Display()
+
+
+class InventoryModule(BaseInventoryPlugin, Cacheable):
 
     NAME = 'parnoud.centreon.centreon_inventory_host'
 
@@ -92,14 +287,39 @@ class InventoryModule(BaseInventoryPlugin):
         super(InventoryModule, self).__init__()
         self.config = None
 
-    def _get_data(self):
-        hostname = self.get_option('hostname') or os.getenv('CENTREON_HOSTNAME')
-        token = self.get_option('token') or os.getenv('CENTREON_TOKEN')
-        username = self.get_option('username') or os.getenv('CENTREON_USERNAME')
-        password = self.get_option('password') or os.getenv('CENTREON_PASSWORD')
-        validate_certs = self.get_option('validate_certs') or os.getenv('CENTREON_VALIDATE_CERTS') or False
+    def _instance_option(self, instance: dict, name: str):
+        """Return an option of an instance, or the plugin option when the instance does not set it."""
+        if instance and instance.get(name) is not None:
+            return instance[name]
+        return self.get_option(name)
+
+    def _build_api(self, instance: dict = None) -> CentreonAPI:
+        """Build a client from the plugin options, or from those of an instance."""
+        hostname = self._instance_option(instance, 'hostname') or os.getenv('CENTREON_HOSTNAME')
+        if instance and any(instance.get(name) for name in CREDENTIAL_OPTIONS):
+            # The credentials of an instance are used as a whole, a global token would take precedence.
+            token, username, password = (instance.get(name) for name in CREDENTIAL_OPTIONS)
+        else:
+            token = self.get_option('token') or os.getenv('CENTREON_TOKEN')
+            username = self.get_option('username') or os.getenv('CENTREON_USERNAME')
+            password = self.get_option('password') or os.getenv('CENTREON_PASSWORD')
+        validate_certs = self._instance_option(instance, 'validate_certs') or os.getenv('CENTREON_VALIDATE_CERTS') or False
         timeout = self.get_option('timeout') or os.getenv('CENTREON_TIMEOUT')
-        search_criteria = self.get_option('search') or None
+        pool_maxsize = self.get_option('pool_maxsize')
+        keep_alive = self.get_option('keep_alive')
+        max_concurrency = self.get_option('max_concurrency')
+        page_size = self.get_option('page_size')
+        adaptive_page_size = self.get_option('adaptive_page_size')
+        pagination = self.get_option('pagination')
+        token_cache = self.get_option('token_cache')
+        token_cache_path = self.get_option('token_cache_path')
+        token_cache_ttl = self.get_option('token_cache_ttl')
+        retries = self.get_option('retries')
+        retry_backoff = self.get_option('retry_backoff')
+        retry_non_idempotent = self.get_option('retry_non_idempotent')
+        rate_limit = self.get_option('rate_limit')
+        rate_limit_burst = self.get_option('rate_limit_burst')
+        rate_limit_path = self.get_option('rate_limit_path')
 
         if token == '':
             token = None
@@ -107,80 +327,408 @@ class InventoryModule(BaseInventoryPlugin):
             username = None
         if password == '':
             password = None
+        return CentreonAPI(hostname=hostname,
+                           token=token,
+                           username=username,
+                           password=password,
+                           validate_certs=validate_certs,
+                           timeout=timeout,
+                           pool_maxsize=pool_maxsize,
+                           keep_alive=keep_alive,
+                           max_concurrency=max_concurrency,
+                           page_size=page_size,
+                           adaptive_page_size=adaptive_page_size,
+                           pagination=pagination,
+                           token_cache=token_cache,
+                           token_cache_path=token_cache_path,
+                           token_cache_ttl=token_cache_ttl,
+                           retries=retries,
+                           retry_backoff=retry_backoff,
+                           retry_non_idempotent=retry_non_idempotent,
+                           rate_limit=rate_limit,
+                           rate_limit_burst=rate_limit_burst,
+                           rate_limit_path=rate_limit_path)
+
+    def _search_params(self, monitoring_server_ids: list = None, instance: dict = None):
+        """Return the search of the hosts, restricted to the given monitoring servers when set."""
+        search_criteria = self._instance_option(instance, 'search') or None
+        if monitoring_server_ids is not None:
+            poller_criteria = {'monitoring_server.id': {'$in': monitoring_server_ids}}
+            search_criteria = {'$and': [search_criteria, poller_criteria]} if search_criteria else poller_criteria
+
         filter_criteria = None
         if search_criteria:
             filter_criteria = {}
             filter_criteria['search'] = json.dumps(search_criteria)
+        return filter_criteria
+
+    def _is_selected_poller(self, poller: dict) -> bool:
+        """Return whether the hosts of a monitoring server belong to the inventory."""
+        selected = self.get_option('pollers')
+        if not selected:
+            return True
+        selected = {str(value) for value in selected}
+        return str(poller['id']) in selected or poller['name'] in selected
+
+    def _iter_sharded(self, api: CentreonAPI, monitoring_server_ids: list, instance: dict = None):
+        """Yield the hosts of each monitoring server, fetched concurrently, once per host id."""
+        def fetch(monitoring_server_id):
+            return list(iter_host_configurations(api, params=self._search_params([monitoring_server_id], instance)))
+
+        seen = set()
+        with ThreadPoolExecutor(max_workers=max(1, self.get_option('poller_concurrency'))) as executor:
+            for hosts in executor.map(fetch, monitoring_server_ids):
+                for host in hosts:
+                    if host['id'] not in seen:
+                        seen.add(host['id'])
+                        yield host
+
+    def _get_data(self, monitoring_server_ids: list = None, instance: dict = None):
+        """Yield the host configurations, only those of the given monitoring servers when set."""
         try:
-            api = CentreonAPI(hostname=hostname,
-                              token=token,
-                              username=username,
-                              password=password,
-                              validate_certs=validate_certs,
-                              timeout=timeout)
-
-            result = find_all_host_configurations(api, params=filter_criteria)
-            if len(result) >= 1:
-                return result
-            else:
-                raise AnsibleError(f"No result found with search value: {filter_criteria}")
+            with self._build_api(instance) as api:
+                shard = self.get_option('shard_by_poller')
+                if monitoring_server_ids is None and (shard or self.get_option('pollers')):
+                    monitoring_server_ids = [
+                        poller['id'] for poller in iter_monitoring_server_configurations(api)
+                        if self._is_selected_poller(poller)
+                    ]
+                if shard and monitoring_server_ids is not None:
+                    yield from self._iter_sharded(api, monitoring_server_ids, instance)
+                else:
+                    yield from iter_host_configurations(api, params=self._search_params(monitoring_server_ids, instance))
         except Exception as e:
             raise AnsibleError(f"Error fetching hosts from Centreon API: {str(e)}")
 
+    def _get_poller_markers(self) -> dict:
+        """Return the last restart and pending changes flag of each selected monitoring server, by id."""
+        try:
+            with self._build_api() as api:
+                return {
+                    str(poller['id']): [poller.get('last_restart'), poller.get('is_updated')]
+                    for poller in iter_monitoring_server_configurations(api)
+                    if self._is_selected_poller(poller)
+                }
+        except Exception as e:
+            raise AnsibleError(f"Error fetching monitoring servers from Centreon API: {str(e)}")
+
+    def _get_statuses(self, instance: dict = None) -> dict:
+        """Return the real-time status of every host, by instance name and host id."""
+        instance_name = instance['name'] if instance else None
+        try:
+            with self._build_api(instance) as api:
+                return {
+                    (instance_name, host['id']): {
+                        'code': (host.get('status') or {}).get('code'),
+                        'name': (host.get('status') or {}).get('name'),
+                        'in_downtime': host.get('in_downtime', False),
+                        'acknowledged': host.get('acknowledged', False),
+                    }
+                    for host in iter_host_monitoring(api)
+                }
+        except Exception as e:
+            raise AnsibleError(f"Error fetching host statuses from Centreon API: {str(e)}")
+
+    def _get_all_statuses(self) -> dict:
+        """Return the real-time status of the hosts of every instance."""
+        instances = self.get_option('instances') or [None]
+        statuses = {}
+        with ThreadPoolExecutor(max_workers=len(instances)) as executor:
+            for instance_statuses in executor.map(self._get_statuses, instances):
+                statuses.update(instance_statuses)
+        return statuses
+
+    def _join_statuses(self, data, statuses):
+        """Yield copies of the hosts with their status, once both listings are done."""
+        # The configuration is listed here while the statuses are listed by the other thread.
+        hosts = list(data)
+        statuses = statuses.result()
+        for host in hosts:
+            yield dict(host, status=statuses.get((host.get('instance'), host['id'])))
+
+    def _check_instances(self):
+        """Raise an error when the instances option is not usable."""
+        instances = self.get_option('instances')
+        if not instances:
+            return
+        names = [instance.get('name') for instance in instances]
+        if not all(names) or not all(instance.get('hostname') for instance in instances):
+            raise AnsibleError("Each of the instances must have a name and a hostname")
+        duplicates = sorted(set(name for name in names if names.count(name) > 1))
+        if duplicates:
+            raise AnsibleError(f"Instance names must be unique: {', '.join(duplicates)}")
+        if self.get_option('cache') and self.get_option('cache_invalidation') == 'pollers':
+            raise AnsibleError("cache_invalidation: pollers cannot be used with instances")
+
+    def _get_instances_data(self) -> list:
+        """Return the hosts of all the instances fetched concurrently, tagged with their instance."""
+        instances = self.get_option('instances')
+
+        def fetch(instance):
+            return [dict(host, instance=instance['name']) for host in self._get_data(instance=instance)]
+
+        with ThreadPoolExecutor(max_workers=len(instances)) as executor:
+            results = list(executor.map(fetch, instances))
+
+        data = []
+        seen = {}
+        conflict = self.get_option('instance_conflict')
+        for instance, hosts in zip(instances, results):
+            for host in hosts:
+                if host['name'] not in seen:
+                    seen[host['name']] = instance['name']
+                    data.append(host)
+                elif conflict == 'error':
+                    raise AnsibleError(
+                        f"Host {host['name']} exists in instances {seen[host['name']]} and {instance['name']}"
+                    )
+        return data
+
+    def _fetch_hosts(self):
+        """Return the hosts of the instances when set, or stream those of the configured server."""
+        if self.get_option('instances'):
+            return self._get_instances_data()
+        return self._get_data()
+
     def verify_file(self, path):
         if super().verify_file(path):
             if path.endswith(('centreon.yml', 'centreon.yaml')):
                 return True
         return False
 
+    def _load_stale_cache_plugin(self):
+        """Load the cache plugin keeping entries up to max_staleness, freshness is then checked by parse."""
+        cache_options = {'_timeout': self.get_option('max_staleness')}
+        if self.get_option('cache_connection') is not None:
+            cache_options['_uri'] = self.get_option('cache_connection')
+        if self.get_option('cache_prefix') is not None:
+            cache_options['_prefix'] = self.get_option('cache_prefix')
+        self._cache = get_cache_plugin(self.get_option('cache_plugin'), **cache_options)
+
+    def _cache_entry(self, data: list, pollers: dict = None) -> dict:
+        entry = {'updated': time.time(), 'hosts': data}
+        if pollers is not None:
+            entry['pollers'] = pollers
+        return entry
+
+    def _refresh_changed_pollers(self, entry: dict):
+        """Return the cached hosts with those of the changed monitoring servers fetched again.
+
+        A monitoring server changed when its last restart differs from the cached one, or
+        while it has changes waiting to be exported. Returns None when nothing changed.
+        """
+        pollers = self._get_poller_markers()
+        cached_pollers = entry['pollers']
+        changed = [
+            poller_id for poller_id, markers in pollers.items()
+            if markers != cached_pollers.get(poller_id) or markers[1]
+        ]
+        stale = set(changed) | (set(cached_pollers) - set(pollers))
+        if not stale:
+            return None
+
+        data = [
+            host for host in entry['hosts']
+            if str((host.get('monitoring_server') or {}).get('id')) not in stale
+        ]
+        if changed:
+            data.extend(self._get_data([int(poller_id) for poller_id in changed]))
+        return self._cache_entry(data, pollers)
+
+    def _refresh_paths(self, cache_key: str) -> tuple:
+        """Return the lock file of the background refresh of a cache key, and the file of its last error.
+
+        They are kept with the cache entries when cache_connection is a directory, as for the file
+        based cache plugins, else in REFRESH_LOCK_DIR. Their names start with a dot so that these
+        cache plugins do not list them as cache entries.
+        """
+        refresh_dir = os.path.expanduser(self.get_option('cache_connection') or '')
+        if not os.path.isdir(refresh_dir):
+            refresh_dir = os.path.expanduser(REFRESH_LOCK_DIR)
+            os.makedirs(refresh_dir, mode=0o700, exist_ok=True)
+        path = os.path.join(refresh_dir, f".{cache_key}.refresh")
+        return f"{path}.lock", f"{path}.error"
+
+    def _refresh_in_background(self, cache_key: str):
+        """Fetch the hosts in a detached process which stores them in the cache, unless one already runs.
+
+        The refresher has no terminal, so its failure is written to a file and reported as a warning
+        by the next run refreshing the same cache key.
+        """
+        lock_path, error_path = self._refresh_paths(cache_key)
+        lock_file = open(lock_path, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return
+
+        try:
+            with open(error_path) as error_file:
+                display.warning(f"The background refresh of the Centreon inventory cache failed: {error_file.read()}")
+            os.remove(error_path)
+        except FileNotFoundError:
+            pass
+
+        pid = os.fork()
+        if pid:
+            # The refresher keeps the lock through its own copy of the file.
+            lock_file.close()
+            os.waitpid(pid, 0)
+            return
+
+        try:
+            os.setsid()
+            if os.fork():
+                os._exit(0)
+            devnull = os.open(os.devnull, os.O_RDWR)
+            for fd in (0, 1, 2):
+                os.dup2(devnull, fd)
+            try:
+                self._cache[cache_key] = self._cache_entry(list(self._fetch_hosts()))
+                # The cache plugins replace the stored entry atomically.
+                self.set_cache_plugin()
+            except Exception as e:
+                with open(error_path, 'w') as error_file:
+                    error_file.write(f"{type(e).__name__}: {e}")
+        finally:
+            os._exit(0)
+
     def parse(self, inventory, loader, path, cache=True):
         super(InventoryModule, self).parse(inventory, loader, path, cache)
         self.config = self._read_config_data(path)
-        data = self._get_data()
-        self._populate(data)
+        self._check_instances()
+
+        cache_key = self.get_cache_key(path)
+        # cache is False when the inventory is refreshed, e.g. with meta: refresh_inventory.
+        user_cache_setting = self.get_option('cache')
+        attempt_to_read_cache = user_cache_setting and cache
+        cache_needs_update = user_cache_setting and not cache
+        by_pollers = user_cache_setting and self.get_option('cache_invalidation') == 'pollers'
+        background = user_cache_setting and not by_pollers and self.get_option('refresh_mode') == 'background'
+
+        if background:
+            self._load_stale_cache_plugin()
+
+        data = None
+        if attempt_to_read_cache:
+            entry = self._cache.get(cache_key)
+            if by_pollers and isinstance(entry, dict) and 'pollers' in entry:
+                refreshed = self._refresh_changed_pollers(entry)
+                if refreshed is not None:
+                    self._cache[cache_key] = refreshed
+                    entry = refreshed
+                data = entry['hosts']
+            elif not by_pollers and isinstance(entry, dict) and 'hosts' in entry:
+                age = time.time() - entry['updated']
+                if age <= self.get_option('cache_timeout'):
+                    data = entry['hosts']
+                elif background and age <= self.get_option('max_staleness'):
+                    data = entry['hosts']
+                    self._refresh_in_background(cache_key)
+            if data is None:
+                cache_needs_update = True
+
+        statuses = None
+        if self.get_option('realtime'):
+            executor = ThreadPoolExecutor(max_workers=1)
+            statuses = executor.submit(self._get_all_statuses)
+            executor.shutdown(wait=False)
+
+        if data is None:
+            # Markers are read before the hosts, a change during the listing is seen on the next run.
+            pollers = self._get_poller_markers() if by_pollers and cache_needs_update else None
+            data = self._fetch_hosts()
+            if cache_needs_update:
+                data = list(data)
+                self._cache[cache_key] = self._cache_entry(data, pollers)
+
+        if statuses is not None:
+            data = self._join_statuses(data, statuses)
+
+        if self._populate(data) == 0:
+            raise AnsibleError(f"No result found with search value: {self.get_option('search')}")
+
+    @classmethod
+    def _share(cls, shared: dict, value):
+        """Return the copy of an entity shared by all the hosts, with interned strings.
+
+        Lists get a new list of shared entities. Other values are returned as they are.
+        """
+        if isinstance(value, list):
+            return [cls._share(shared, item) for item in value]
+        if not isinstance(value, dict):
+            return value
+        key = tuple(sorted(value.items()))
+        try:
+            entity = shared.get(key)
+        except TypeError:
+            # Nested values cannot be compared cheaply, they are not shared.
+            return value
+        if entity is None:
+            entity = shared[key] = {k: sys.intern(v) if isinstance(v, str) else v for k, v in value.items()}
+        return entity
+
+    @staticmethod
+    def _status_groups(status: dict) -> list:
+        """Return the status groups of a host, none when it is not monitored yet."""
+        if not status:
+            return []
+        groups = []
+        if status['name']:
+            groups.append(f"status_{status['name'].lower()}")
+        if status['in_downtime']:
+            groups.append('status_in_downtime')
+        if status['acknowledged']:
+            groups.append('status_acknowledged')
+        return groups
 
     def _populate(self, data):
-        attributes = self.get_option('attributes') or []
+        """Add hosts from an iterable of host configurations and return how many were added."""
+        attributes = set(self.get_option('attributes') or [])
+        variables = HOST_VARIABLES + tuple(
+            (key, name) for key, name in OPTIONAL_HOST_VARIABLES if not attributes or key in attributes
+        )
+        parents = ('groups',) + tuple(key for key in GROUPING_ATTRIBUTES if not attributes or key in attributes)
+
+        # Hosts of each group by parent group, so that every group and parent link is created once.
+        memberships = {parent: {} for parent in parents + ('status', 'instances')}
+        namespace = self.get_option('instance_groups') == 'namespace'
+        # One object for each distinct entity, referenced by all its hosts.
+        shared = {}
+        count = 0
         for host in data:
-            self.inventory.add_host(host['name'])
-
-            for group in host['groups']:
-                self.inventory.add_group('groups')
-                self.inventory.add_group(group['name'])
-                self.inventory.add_child('groups', group['name'])
-                self.inventory.add_child(group['name'], host['name'])
-
-            if 'templates' in attributes or len(attributes) == 0:
-                for template in host['templates']:
-                    self.inventory.add_group('templates')
-                    self.inventory.add_group(template['name'])
-                    self.inventory.add_child('templates', template['name'])
-                    self.inventory.add_child(template['name'], host['name'])
-
-            if 'categories' in attributes or len(attributes) == 0:
-                for categorie in host['categories']:
-                    self.inventory.add_group('categories')
-                    self.inventory.add_group(categorie['name'])
-                    self.inventory.add_child('categories', categorie['name'])
-                    self.inventory.add_child(categorie['name'], host['name'])
-
-            self.inventory.set_variable(host['name'], "id", host['id'])
-            self.inventory.set_variable(host['name'], "alias", host['alias'])
-            self.inventory.set_variable(host['name'], "address", host['address'])
-            self.inventory.set_variable(host['name'], "monitoring_server", host['monitoring_server'])
-
-            if 'templates' in attributes or len(attributes) == 0:
-                self.inventory.set_variable(host['name'], "list_templates", host['templates'])
-            if 'normal_check_interval' in attributes or len(attributes) == 0:
-                self.inventory.set_variable(host['name'], "normal_check_interval", host['normal_check_interval'])
-            if 'retry_check_interval' in attributes or len(attributes) == 0:
-                self.inventory.set_variable(host['name'], "retry_check_interval", host['retry_check_interval'])
-            if 'check_timeperiod' in attributes or len(attributes) == 0:
-                self.inventory.set_variable(host['name'], "check_timeperiod", host['check_timeperiod'])
-            if 'severity' in attributes or len(attributes) == 0:
-                self.inventory.set_variable(host['name'], "severity", host['severity'])
-            if 'categories' in attributes or len(attributes) == 0:
-                self.inventory.set_variable(host['name'], "list_categories", host['categories'])
-            self.inventory.set_variable(host['name'], "list_groups", host['groups'])
-            if 'is_activated' in attributes or len(attributes) == 0:
-                self.inventory.set_variable(host['name'], "is_activated", host['is_activated'])
+            count += 1
+            host_name = self.inventory.add_host(host['name'])
+            for key, name in variables:
+                self.inventory.set_variable(host_name, name, self._share(shared, host[key]))
+            instance = host.get('instance')
+            prefix = f"{instance}_" if instance and namespace else ''
+            for parent in parents:
+                for item in host[parent]:
+                    memberships[parent].setdefault(prefix + item['name'], []).append(host_name)
+            if instance:
+                self.inventory.set_variable(host_name, 'instance', instance)
+                memberships['instances'].setdefault(f"instance_{instance}", []).append(host_name)
+            if 'status' in host:
+                self.inventory.set_variable(host_name, 'status', self._share(shared, host['status']))
+                for group_name in self._status_groups(host['status']):
+                    memberships['status'].setdefault(group_name, []).append(host_name)
+
+        # Groups are linked to their parent before they get hosts, so that the
+        # ancestors of each host are computed once when it is added.
+        members = {}
+        for parent, groups in memberships.items():
+            if not groups:
+                continue
+            parent_group = self.inventory.add_group(parent)
+            for group_name, host_names in groups.items():
+                group = self.inventory.add_group(group_name)
+                self.inventory.add_child(parent_group, group)
+                members.setdefault(group, []).extend(host_names)
+
+        for group, host_names in members.items():
+            for host_name in host_names:
+                self.inventory.add_child(group, host_name)
+
+        return count
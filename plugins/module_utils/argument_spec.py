@@ -49,4 +49,142 @@ def base_argument_spec():
             default=30,
             fallback=(env_fallback, ['CENTREON_TIMEOUT'])
         ),
+        pool_maxsize=dict(
+            type='int',
+            required=False,
+            default=10,
+            fallback=(env_fallback, ['CENTREON_POOL_MAXSIZE'])
+        ),
+        keep_alive=dict(
+            type='bool',
+            required=False,
+            default=True,
+            fallback=(env_fallback, ['CENTREON_KEEP_ALIVE'])
+        ),
+        max_concurrency=dict(
+            type='int',
+            required=False,
+            default=1,
+            fallback=(env_fallback, ['CENTREON_MAX_CONCURRENCY'])
+        ),
+        page_size=dict(
+            type='int',
+            required=False,
+            default=100,
+            fallback=(env_fallback, ['CENTREON_PAGE_SIZE'])
+        ),
+        adaptive_page_size=dict(
+            type='bool',
+            required=False,
+            default=False,
+            fallback=(env_fallback, ['CENTREON_ADAPTIVE_PAGE_SIZE'])
+        ),
+        pagination=dict(
+            type='str',
+            required=False,
+            default='offset',
+            choices=['offset', 'keyset'],
+            fallback=(env_fallback, ['CENTREON_PAGINATION'])
+        ),
+        token_cache=dict(
+            type='bool',
+            required=False,
+            default=False,
+            fallback=(env_fallback, ['CENTREON_TOKEN_CACHE'])
+        ),
+        token_cache_path=dict(
+            type='path',
+            required=False,
+            default='~/.ansible/tmp/centreon_token_cache.json',
+            fallback=(env_fallback, ['CENTREON_TOKEN_CACHE_PATH'])
+        ),
+        token_cache_ttl=dict(
+            type='int',
+            required=False,
+            default=3600,
+            fallback=(env_fallback, ['CENTREON_TOKEN_CACHE_TTL'])
+        ),
+        retries=dict(
+            type='int',
+            required=False,
+            default=3,
+            fallback=(env_fallback, ['CENTREON_RETRIES'])
+        ),
+        retry_backoff=dict(
+            type='float',
+            required=False,
+            default=0.5,
+            fallback=(env_fallback, ['CENTREON_RETRY_BACKOFF'])
+        ),
+        retry_non_idempotent=dict(
+            type='bool',
+            required=False,
+            default=False,
+            fallback=(env_fallback, ['CENTREON_RETRY_NON_IDEMPOTENT'])
+        ),
+        rate_limit=dict(
+            type='float',
+            required=False,
+            fallback=(env_fallback, ['CENTREON_RATE_LIMIT'])
+        ),
+        rate_limit_burst=dict(
+            type='int',
+            required=False,
+            fallback=(env_fallback, ['CENTREON_RATE_LIMIT_BURST'])
+        ),
+        rate_limit_path=dict(
+            type='path',
+            required=False,
+            default='~/.ansible/tmp/centreon_rate_limit.json',
+            fallback=(env_fallback, ['CENTREON_RATE_LIMIT_PATH'])
+        ),
+    )
+
+
+def host_argument_spec():
+    """Return the fields of a host configuration, shared by the host modules."""
+    return dict(
+        monitoring_server_id=dict(type='int'),
+        address=dict(type='str', default=None),
+        alias=dict(type='str', default=None),
+        snmp_community=dict(type='str', default=None),
+        snmp_version=dict(type='str', choices=['1', '2c', '3'], default=None),
+        geo_coords=dict(type='str', default=None),
+        timezone_id=dict(type='int', default=None),
+        severity_id=dict(type='int', default=None),
+        check_command_id=dict(type='int', default=None),
+        check_command_args=dict(type='dict', default=None),
+        check_timeperiod_id=dict(type='int', default=None),
+        max_check_attempts=dict(type='int', default=None),
+        normal_check_interval=dict(type='int', default=None),
+        retry_check_interval=dict(type='int', default=None),
+        active_check_enabled=dict(type='int', choices=[0, 1, 2], default=None),
+        passive_check_enabled=dict(type='int', choices=[0, 1, 2], default=None),
+        notifications_enabled=dict(type='int', choices=[0, 1, 2], default=None),
+        notification_options=dict(type='int', choices=[0, 1, 2, 4, 8, 16], default=None),
+        notification_interval=dict(type='int', default=None),
+        notification_timeperiod_id=dict(type='int', default=None),
+        add_inherited_contact_group=dict(type='bool', default=None),
+        add_inherited_contact=dict(type='bool', default=None),
+        first_notification_delay=dict(type='int', default=None),
+        recovery_notification_delay=dict(type='int', default=None),
+        acknowledgement_timeout=dict(type='int', default=None),
+        freshness_threshold=dict(type='int', default=None),
+        flap_detection_enabled=dict(type='int', choices=[0, 1, 2], default=None),
+        low_flap_threshold=dict(type='int', default=None),
+        high_flap_threshold=dict(type='int', default=None),
+        event_handler_enabled=dict(type='int', choices=[0, 1, 2], default=None),
+        event_handler_command_id=dict(type='int', default=None),
+        event_handler_command_args=dict(type='dict', default=None),
+        note_url=dict(type='str', default=None),
+        note=dict(type='str', default=None),
+        action_url=dict(type='str', default=None),
+        icon_id=dict(type='int', default=None),
+        icon_alternative=dict(type='str', default=None),
+        comment=dict(type='str', default=None),
+        is_activated=dict(type='bool', default=None),
+        categories=dict(type='list', elements='int', default=None),
+        groups=dict(type='list', elements='raw', default=None),
+        templates=dict(type='list', elements='raw', default=None),
+        macros=dict(type='list', elements='dict', default=None),
     )
@@ -20,29 +20,115 @@ description:
 '''
 
 import json
+import math
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
 except ImportError as imp_exc:
     ANOTHER_LIBRARY_IMPORT_ERROR = imp_exc
 else:
     ANOTHER_LIBRARY_IMPORT_ERROR = None
 
+from ansible.module_utils.connection import Connection
+from ansible_collections.parnoud.centreon.plugins.module_utils.rate_limiter import RateLimiter
+from ansible_collections.parnoud.centreon.plugins.module_utils.token_cache import TokenCache
+
+# Options of the client given by each task, sent with its requests over an httpapi connection.
+CLIENT_OPTIONS = (
+    'timeout',
+    'token_cache',
+    'token_cache_path',
+    'token_cache_ttl',
+    'retries',
+    'retry_backoff',
+    'retry_non_idempotent',
+    'rate_limit',
+    'rate_limit_burst',
+    'rate_limit_path',
+)
+
 
 class CentreonAPI:
     """CLass to interact with Centreon API v2."""
 
+    # Bounds used when the page size adapts to the measured response time and payload size.
+    ADAPTIVE_MIN_PAGE_SIZE = 10
+    ADAPTIVE_MAX_PAGE_SIZE = 5000
+    ADAPTIVE_TARGET_SECONDS = 2.0
+    ADAPTIVE_MAX_PAGE_BYTES = 8 * 1024 * 1024
+
+    # Transient failures retried with exponential backoff. DELETE is not retried by default,
+    # since the retry of a deletion done before the failure answers 404.
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT'])
+    RETRY_STATUS_CODES = frozenset([429, 502, 503, 504])
+    RETRY_MAX_DELAY = 60.0
+
     def __init__(self,
                  hostname: str = None,
                  token: str = None,
                  username: str = None,
                  password: str = None,
                  validate_certs: bool = False,
-                 timeout: int = 30):
+                 timeout: int = 30,
+                 pool_maxsize: int = 10,
+                 keep_alive: bool = True,
+                 max_concurrency: int = 1,
+                 page_size: int = 100,
+                 adaptive_page_size: bool = False,
+                 pagination: str = 'offset',
+                 token_cache: bool = False,
+                 token_cache_path: str = None,
+                 token_cache_ttl: int = 3600,
+                 retries: int = 3,
+                 retry_backoff: float = 0.5,
+                 retry_non_idempotent: bool = False,
+                 rate_limit: float = None,
+                 rate_limit_burst: int = None,
+                 rate_limit_path: str = None,
+                 connection=None,
+                 connection_options: dict = None):
         self.hostname = hostname
         self.token = token
+        self.username = username
+        self._password = password
+        self._auth_lock = threading.Lock()
         self.validate_certs = validate_certs
-        self.timeout = timeout
+        self.max_concurrency = max_concurrency or 1
+        self.page_size = page_size or 100
+        self.adaptive_page_size = adaptive_page_size
+        self.pagination = pagination or 'offset'
+        self.configure(timeout=timeout,
+                       token_cache=token_cache,
+                       token_cache_path=token_cache_path,
+                       token_cache_ttl=token_cache_ttl,
+                       retries=retries,
+                       retry_backoff=retry_backoff,
+                       retry_non_idempotent=retry_non_idempotent,
+                       rate_limit=rate_limit,
+                       rate_limit_burst=rate_limit_burst,
+                       rate_limit_path=rate_limit_path)
+        self.retry_count = 0
+        self._retry_lock = threading.Lock()
+        # Requests are sent through the httpapi connection, with the options of CLIENT_OPTIONS
+        # applied by the client it holds.
+        self.connection = connection
+        self.connection_options = connection_options or {}
+        self.session = None
+        self._finalizer = None
+
+        if self.connection is not None:
+            # Authentication and connection reuse are handled by the persistent httpapi connection.
+            return
 
         if ANOTHER_LIBRARY_IMPORT_ERROR:
             raise ValueError('another_library must be installed to use this plugin') from ANOTHER_LIBRARY_IMPORT_ERROR
@@ -50,70 +136,411 @@ class CentreonAPI:
         if hostname is None:
             raise ValueError('Hostname is required')
 
+        self.session = self._build_session(pool_maxsize=pool_maxsize, keep_alive=keep_alive)
+        # Release pooled connections when the client is garbage collected or the interpreter exits.
+        self._finalizer = weakref.finalize(self, self.session.close)
+
         if self.token:
-            self.headers = {
-                'ContentType' : 'application/json',
-                'X-AUTH-TOKEN' : self.token
-            }
+            self._use_token(self.token)
+        elif username and password and self.token_cache:
+            cached_token = self.token_cache.get(self.hostname, username)
+            if cached_token:
+                self._use_token(cached_token)
+            else:
+                self._login_with_cache()
         elif username and password:
             self.login(username=username, password=password)
         else:
             raise ValueError("Either token or username and password must be provided for authentication.")
 
+    def configure(self,
+                  timeout: int = 30,
+                  token_cache: bool = False,
+                  token_cache_path: str = None,
+                  token_cache_ttl: int = 3600,
+                  retries: int = 3,
+                  retry_backoff: float = 0.5,
+                  retry_non_idempotent: bool = False,
+                  rate_limit: float = None,
+                  rate_limit_burst: int = None,
+                  rate_limit_path: str = None):
+        """Set the options of CLIENT_OPTIONS, which may change between the tasks sharing a client."""
+        self.timeout = timeout
+        self.token_cache = TokenCache(path=token_cache_path, ttl=token_cache_ttl) if token_cache else None
+        self.retries = retries or 0
+        self.retry_backoff = retry_backoff if retry_backoff is not None else 0.5
+        self.retry_non_idempotent = retry_non_idempotent
+        # The bucket is kept in the rate limit file, so a new limiter goes on with it.
+        self.rate_limiter = RateLimiter(key=self.hostname, rate=rate_limit, burst=rate_limit_burst, path=rate_limit_path) if rate_limit else None
+
     def _request(self,
                  method: str,
                  endpoint: str,
                  data: dict = None,
                  params: dict = None) -> tuple[int, bytes]:
         """Request to centreon API v2 endpoint with given method, data and query parameters."""
+        if self.connection is not None:
+            code, data, retries = self.connection.send_request(method, endpoint, data=data, params=params,
+                                                               options=self.connection_options)
+            if retries:
+                with self._retry_lock:
+                    self.retry_count += retries
+            return code, data
+
         url = f"{self.hostname}/{endpoint}"
 
-        response = requests.request(method=method, url=url, headers=self.headers, json=data, params=params, verify=self.validate_certs, timeout=self.timeout)
+        response, token = self._send(method=method, url=url, data=data, params=params)
+        if response.status_code == 401 and endpoint != 'login' and self.username and self._password:
+            # The token expired or was revoked: log in again once and replay the request.
+            # Only the token this request was sent with is reported, another thread may have replaced it already.
+            self._reauthenticate(rejected_token=token)
+            response, token = self._send(method=method, url=url, data=data, params=params)
         return response.status_code, response.content
 
-    def _get_all_paginated(self,
-                           method: str,
-                           endpoint: str,
-                           params=None) -> dict:
-        """Return all data from a paginated endpoint."""
-        all_results = []
-        page = 1
-        query_parameters = {}
+    def _send(self,
+              method: str,
+              url: str,
+              data: dict = None,
+              params: dict = None):
+        """Send a request, retrying transient failures with exponential backoff and jitter.
 
+        Connection errors and 502/503/504 responses are only retried for GET and PUT requests,
+        unless retry_non_idempotent is set. 429 responses mean the request was not processed
+        and are retried for every method. Return the response and the token it was sent with.
+        """
+        idempotent = method.upper() in self.IDEMPOTENT_METHODS or self.retry_non_idempotent
+        attempt = 0
         while True:
-            pages = {
-                'page': page
-            }
-            limites = {
-                'limit': 100
-            }
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            headers = self.headers
+            try:
+                response = self.session.request(method=method,
+                                                url=url,
+                                                headers=headers,
+                                                json=data,
+                                                params=params,
+                                                verify=self.validate_certs,
+                                                timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt >= self.retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+            else:
+                retryable = response.status_code == 429 or (idempotent and response.status_code in self.RETRY_STATUS_CODES)
+                if not retryable or attempt >= self.retries:
+                    return response, headers.get('X-AUTH-TOKEN')
+                delay = self._retry_after_delay(response)
+                if delay is None:
+                    delay = self._backoff_delay(attempt)
+
+            attempt += 1
+            with self._retry_lock:
+                self.retry_count += 1
+            time.sleep(delay)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Return a delay drawn with full jitter from an exponentially growing window."""
+        return random.uniform(0, min(self.RETRY_MAX_DELAY, self.retry_backoff * (2 ** attempt)))
+
+    def _retry_after_delay(self, response):
+        """Return the delay requested by the Retry-After header of a response, if any."""
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return None
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                return None
+        return min(self.RETRY_MAX_DELAY, max(0.0, delay))
+
+    def _use_token(self, token: str):
+        """Authenticate the next requests with the given token."""
+        self.token = token
+        self.headers = {
+            'ContentType' : 'application/json',
+            'X-AUTH-TOKEN' : self.token
+        }
+
+    def _login_with_cache(self, rejected_token: str = None):
+        """Reuse the token cached by another process, or log in and cache a new one."""
+        with self.token_cache.locked():
+            cached_token = self.token_cache.get(self.hostname, self.username)
+            if cached_token and cached_token != rejected_token:
+                self._use_token(cached_token)
+                return
+            self.login(username=self.username, password=self._password)
+            self.token_cache.set(self.hostname, self.username, self.token)
+
+    def _reauthenticate(self, rejected_token: str = None):
+        """Replace a token rejected by the server, once across concurrent callers."""
+        with self._auth_lock:
+            if self.token != rejected_token:
+                return
+            if self.token_cache:
+                self._login_with_cache(rejected_token=rejected_token)
+            else:
+                self.login(username=self.username, password=self._password)
+
+    @staticmethod
+    def _build_session(pool_maxsize: int = 10,
+                       keep_alive: bool = True):
+        """Return a requests session with a pooled adapter for HTTP and HTTPS."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize or 1)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _request_page(self,
+                      method: str,
+                      endpoint: str,
+                      page: int,
+                      limit: int,
+                      params=None) -> bytes:
+        """Return the raw body of one page from a paginated endpoint."""
+        query_parameters = {
+            'page': page,
+            'limit': limit
+        }
+
+        if params:
+            query_parameters.update(params)
+
+        code, data = self._request(
+            method=method,
+            endpoint=endpoint,
+            params=query_parameters
+        )
 
-            query_parameters.update(pages)
-            query_parameters.update(limites)
+        if code == 403:
+            raise Exception(f"Forbidden: {json.loads(data)['message']}")
+        elif code != 200:
+            raise Exception(f"Failed to get paginated data: {json.loads(data)['message']}")
 
-            if params:
-                query_parameters.update(params)
+        return data
 
-            code, data = self._request(
-                method=method,
-                endpoint=endpoint,
-                params=query_parameters
-            )
+    def _get_page(self,
+                  method: str,
+                  endpoint: str,
+                  page: int,
+                  params=None,
+                  limit: int = None) -> dict:
+        """Return one decoded page from a paginated endpoint."""
+        return json.loads(self._request_page(method, endpoint, page, limit or self.page_size, params=params))
 
-            if code == 403:
-                raise Exception(f"Forbidden: {json.loads(data)['message']}")
-            elif code != 200:
-                raise Exception(f"Failed to get paginated data: {json.loads(data)['message']}")
+    def _adapt_page_size(self,
+                         limit: int,
+                         offset: int,
+                         elapsed: float,
+                         size: int,
+                         max_limit: int = None) -> int:
+        """Return the page size to use for the next page given the cost of the previous one.
 
+        The page size is halved when a page is slow or large and doubled when it is fast
+        and small, without going over max_limit, the largest page size served so far. A new
+        size is only accepted when the rows already read fall on a page boundary for it, so
+        the next page number still starts exactly at offset.
+        """
+        if elapsed > self.ADAPTIVE_TARGET_SECONDS or size > self.ADAPTIVE_MAX_PAGE_BYTES:
+            new_limit = max(self.ADAPTIVE_MIN_PAGE_SIZE, limit // 2)
+        elif elapsed < self.ADAPTIVE_TARGET_SECONDS / 4 and size < self.ADAPTIVE_MAX_PAGE_BYTES / 4:
+            new_limit = min(self.ADAPTIVE_MAX_PAGE_SIZE, limit * 2)
+        else:
+            return limit
+
+        if max_limit:
+            new_limit = min(new_limit, max_limit)
+        if offset % new_limit:
+            return limit
+        return new_limit
+
+    def _iter_pages_concurrently(self,
+                                 method: str,
+                                 endpoint: str,
+                                 pages: range,
+                                 params=None,
+                                 limit: int = None):
+        """Fetch pages over a bounded worker pool and yield their records in page order.
+
+        At most max_concurrency pages are in flight or buffered at any time, and the
+        first failing page aborts the iteration and cancels the pending ones.
+        """
+        pages = iter(pages)
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        try:
+            for page in islice(pages, self.max_concurrency):
+                pending.append(executor.submit(self._get_page, method, endpoint, page, params, limit))
+
+            while pending:
+                for future in pending:
+                    if future.done() and future.exception() is not None:
+                        raise future.exception()
+
+                head = pending[0]
+                if not head.done():
+                    wait([future for future in pending if not future.done()], return_when=FIRST_COMPLETED)
+                    continue
+
+                pending.popleft()
+                page = next(pages, None)
+                if page is not None:
+                    pending.append(executor.submit(self._get_page, method, endpoint, page, params, limit))
+                yield from head.result()['result']
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_keyset(self,
+                     method: str,
+                     endpoint: str,
+                     params=None,
+                     page_size: int = None):
+        """Yield all records of an endpoint in id order, each page starting after the last id seen.
+
+        Every request asks for the first page of the rows above the cursor, so its cost does not
+        grow with the depth of the scan, and rows created or deleted meanwhile do not shift the
+        following pages. The cursor condition is merged with the search given in params.
+        """
+        params = dict(params or {})
+        search = json.loads(params['search']) if params.get('search') else None
+        params['sort_by'] = json.dumps({'id': 'ASC'})
+        limit = page_size or self.page_size
+        max_limit = None
+        last_id = None
+        while True:
+            if last_id is not None:
+                cursor = {'id': {'$gt': last_id}}
+                params['search'] = json.dumps({'$and': [search, cursor]} if search else cursor)
+
+            start = time.monotonic()
+            data = self._request_page(method, endpoint, 1, limit, params=params)
+            elapsed = time.monotonic() - start
+            response = json.loads(data)
+            yield from response['result']
+
+            if not response['result'] or len(response['result']) >= response['meta']['total']:
+                break
+            last_id = response['result'][-1]['id']
+            served_limit = response['meta'].get('limit') or limit
+            if served_limit < limit:
+                max_limit = served_limit
+            limit = served_limit
+            if self.adaptive_page_size:
+                # Keyset pages always start at the cursor, there is no page boundary to keep.
+                limit = self._adapt_page_size(limit, 0, elapsed, len(data), max_limit=max_limit)
+
+    def _iter_offset(self,
+                     method: str,
+                     endpoint: str,
+                     params=None,
+                     page_size: int = None,
+                     max_results: int = None):
+        """Yield all records of an endpoint, requesting the pages by number."""
+        page_size = page_size or self.page_size
+        start = time.monotonic()
+        data = self._request_page(method, endpoint, 1, page_size, params=params)
+        elapsed = time.monotonic() - start
+        response = json.loads(data)
+        yield from response['result']
+
+        total = response['meta']['total']
+        limit = response['meta'].get('limit') or page_size
+        fetched = len(response['result'])
+        if not response['result'] or fetched >= total or total <= limit:
+            return
+
+        if self.max_concurrency > 1:
+            if max_results is not None:
+                total = min(total, max_results)
+            last_page = math.ceil(total / limit)
+            yield from self._iter_pages_concurrently(method, endpoint, range(2, last_page + 1), params=params, limit=limit)
+            return
+
+        max_limit = limit if limit < page_size else None
+        offset = limit
+        while True:
+            if self.adaptive_page_size:
+                limit = self._adapt_page_size(limit, offset, elapsed, len(data), max_limit=max_limit)
+
+            start = time.monotonic()
+            data = self._request_page(method, endpoint, offset // limit + 1, limit, params=params)
+            elapsed = time.monotonic() - start
             response = json.loads(data)
+            served_limit = response['meta'].get('limit') or limit
+            if served_limit < limit:
+                # The server capped the page size, so this page number does not start at offset.
+                # Drop it and request it again with the largest size it serves falling on offset.
+                max_limit = served_limit
+                limit = math.gcd(offset, served_limit)
+                continue
+            yield from response['result']
 
-            all_results.extend(response['result'])
-            if not response['result'] or len(all_results) >= response['meta']['total'] or response['meta']['total'] <= 100:
+            offset += limit
+            fetched += len(response['result'])
+            if not response['result'] or fetched >= response['meta']['total']:
                 break
 
-            page += 1
+    def iter_paginated(self,
+                       method: str,
+                       endpoint: str,
+                       params=None,
+                       max_results: int = None):
+        """Yield all records from a paginated endpoint, one page at a time.
+
+        With max_results, at most that many records are yielded and no page is requested
+        once they are collected. The first page is then no larger than max_results.
+        """
+        page_size = self.page_size
+        if max_results is not None:
+            if max_results <= 0:
+                return
+            page_size = min(page_size, max_results)
+
+        if self.pagination == 'keyset' and endpoint.startswith('configuration/'):
+            records = self._iter_keyset(method, endpoint, params=params, page_size=page_size)
+        else:
+            records = self._iter_offset(method, endpoint, params=params, page_size=page_size, max_results=max_results)
+        yield from islice(records, max_results)
+
+    def count(self,
+              method: str,
+              endpoint: str,
+              params=None) -> int:
+        """Return the number of records of a paginated endpoint, with a single one row request."""
+        data = self._request_page(method, endpoint, 1, 1, params=params)
+        return json.loads(data)['meta']['total']
 
-        return all_results
+    def _get_all_paginated(self,
+                           method: str,
+                           endpoint: str,
+                           params=None,
+                           count_only: bool = False,
+                           max_results: int = None):
+        """Return all data from a paginated endpoint.
+
+        With count_only, return the number of matching records instead of the records.
+        With max_results, return at most that many records.
+        """
+        if count_only:
+            return self.count(method, endpoint, params=params)
+        return list(self.iter_paginated(method, endpoint, params=params, max_results=max_results))
 
     def login(self,
               username: str,
@@ -134,11 +561,7 @@ class CentreonAPI:
         code, data = self._request(method='POST', endpoint='login', data=data)
         if code == 200:
             response = json.loads(data)
-            self.token = response['security']['token']
-            self.headers = {
-                'ContentType' : 'application/json',
-                'X-AUTH-TOKEN' : self.token
-            }
+            self._use_token(response['security']['token'])
         elif code == 400:
             raise Exception(f"Server cannot or will not process the request : {json.loads(data)['message']}")
         elif code == 401:
@@ -150,8 +573,51 @@ class CentreonAPI:
         """Entry point to delete an existing authentication token."""
         code, data = self._request(method='GET', endpoint='logout')
         if code == 200:
+            if self.token_cache and self.username:
+                with self.token_cache.locked():
+                    self.token_cache.delete(self.hostname, self.username)
             return json.loads(data)
         elif code == 403:
             raise Exception(f"Forbidden : {json.loads(data)['message']}")
         else:
             raise Exception(f"Failed: {json.loads(data)['message']}")
+
+
+def centreon_api_from_module(module) -> CentreonAPI:
+    """Build a CentreonAPI client from the common module parameters.
+
+    When the task runs over the parnoud.centreon.centreon httpapi connection, requests are
+    routed through its persistent, already authenticated session instead, the options of
+    CLIENT_OPTIONS being applied by its client. The client is kept as module.centreon_api so
+    the module result can report its retry counter.
+    """
+    if getattr(module, 'centreon_api', None) is not None:
+        # Reuse the client already built for this module, or handed over by an action plugin.
+        return module.centreon_api
+    client_options = {key: module.params.get(key) for key in CLIENT_OPTIONS}
+    if module._socket_path:
+        api = CentreonAPI(
+            connection=Connection(module._socket_path),
+            connection_options=client_options,
+            max_concurrency=module.params.get('max_concurrency'),
+            page_size=module.params.get('page_size'),
+            adaptive_page_size=module.params.get('adaptive_page_size'),
+            pagination=module.params.get('pagination'),
+        )
+    else:
+        api = CentreonAPI(
+            hostname=module.params.get('hostname'),
+            token=module.params.get('token'),
+            username=module.params.get('username'),
+            password=module.params.get('password'),
+            validate_certs=module.params.get('validate_certs'),
+            pool_maxsize=module.params.get('pool_maxsize'),
+            keep_alive=module.params.get('keep_alive'),
+            max_concurrency=module.params.get('max_concurrency'),
+            page_size=module.params.get('page_size'),
+            adaptive_page_size=module.params.get('adaptive_page_size'),
+            pagination=module.params.get('pagination'),
+            **client_options
+        )
+    module.centreon_api = api
+    return api
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from ansible.module_utils.basic import AnsibleModule
+
+
+class CentreonModule(AnsibleModule):
+    """AnsibleModule reporting the retries done by its Centreon API client in the result."""
+
+    def __init__(self, *args, **kwargs):
+        super(CentreonModule, self).__init__(*args, **kwargs)
+        self.centreon_api = None
+
+    def _add_api_statistics(self, kwargs: dict):
+        if self.centreon_api is not None:
+            kwargs.setdefault('api_retries', self.centreon_api.retry_count)
+
+    def exit_json(self, **kwargs):
+        self._add_api_statistics(kwargs)
+        super(CentreonModule, self).exit_json(**kwargs)
+
+    def fail_json(self, msg, **kwargs):
+        self._add_api_statistics(kwargs)
+        super(CentreonModule, self).fail_json(msg, **kwargs)
@@ -11,6 +11,12 @@
 import json
 from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
 
+# Relations compared without regard to their order.
+HOST_RELATION_FIELDS = ('categories', 'groups', 'templates')
+
+# Objects of the listing endpoint written back as <name>_id.
+HOST_REFERENCE_FIELDS = ('monitoring_server', 'check_timeperiod', 'notification_timeperiod', 'severity')
+
 # CONFIGURATION #
 
 
@@ -44,9 +50,77 @@ def partially_update_host_configuration(api: CentreonAPI, host_id: int, host_dat
         raise Exception(f"Failed to partially update host: {json.loads(data)['message']}")
 
 
-def find_all_host_configurations(api: CentreonAPI, params=None):
+def find_all_host_configurations(api: CentreonAPI, params=None, count_only=False, max_results=None):
     """Return all host configurations."""
-    return api._get_all_paginated('GET', 'configuration/hosts', params=params)
+    return api._get_all_paginated('GET', 'configuration/hosts', params=params,
+                                  count_only=count_only, max_results=max_results)
+
+
+def iter_host_configurations(api: CentreonAPI, params=None):
+    """Yield host configurations page by page."""
+    return api.iter_paginated('GET', 'configuration/hosts', params=params)
+
+
+def normalize_host_configuration(host: dict) -> dict:
+    """Return a host from the listing endpoint with the field names and shapes of the write payloads."""
+    normalized = {}
+    for key, value in host.items():
+        if key == 'id':
+            continue
+        elif key in HOST_REFERENCE_FIELDS:
+            normalized[f'{key}_id'] = value['id'] if value else None
+        elif key in HOST_RELATION_FIELDS:
+            normalized[key] = [item['id'] if isinstance(item, dict) else item for item in value or []]
+        else:
+            normalized[key] = value
+    return normalized
+
+
+def complete_host_configuration(api: CentreonAPI, host: dict, fields) -> dict:
+    """Return a host of the listing, completed by its details when some of the fields are not listed."""
+    listed = normalize_host_configuration(host)
+    if all(key in listed for key in fields):
+        return host
+    return dict(host, **get_host_monitoring(api, host['id']))
+
+
+def _comparable_host_value(key: str, value):
+    """Return a value comparable regardless of the order of relations and macros."""
+    if key in HOST_RELATION_FIELDS:
+        return sorted(set(value or []))
+    if key == 'macros':
+        return sorted(json.dumps(macro, sort_keys=True) for macro in value or [])
+    return value
+
+
+def merge_host_relations(desired: dict, current: dict):
+    """Add the current ids to the relations of desired, since a PATCH replaces whole lists.
+
+    Relations adding nothing to the current ones are removed from desired.
+    """
+    for key in HOST_RELATION_FIELDS:
+        if desired.get(key):
+            current_ids = current.get(key, [])
+            added = set(desired[key]) - set(current_ids)
+            if added:
+                desired[key] = current_ids + sorted(added)
+            else:
+                desired.pop(key)
+
+
+def diff_host_configuration(desired: dict, current: dict) -> tuple:
+    """Return the before and after values of the desired fields that differ from the current host.
+
+    current is a normalized host. Fields missing from it are unknown and always reported as changed.
+    """
+    before = {}
+    after = {}
+    for key, value in desired.items():
+        if key in current and _comparable_host_value(key, value) == _comparable_host_value(key, current[key]):
+            continue
+        before[key] = current.get(key)
+        after[key] = value
+    return before, after
 
 
 def create_host_configuration(api: CentreonAPI, host_data: dict):
@@ -81,6 +155,11 @@ def list_all_host_monitoring(api: CentreonAPI, params: dict = None):
         raise Exception(f"Failed: {json.loads(data)['message']}")
 
 
+def iter_host_monitoring(api: CentreonAPI, params: dict = None):
+    """Yield the hosts in real-time monitoring page by page."""
+    return api.iter_paginated('GET', 'monitoring/hosts', params=params)
+
+
 def get_host_monitoring(api: CentreonAPI, host_id: int):
     """Get host configuration by ID."""
     code, data = api._request('GET', f'configuration/hosts/{host_id}')
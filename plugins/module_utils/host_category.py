@@ -14,9 +14,15 @@ import json
 # CONFIGURATION
 
 
-def list_host_caterogies(CentreonAPI_obj, params=None):
+def list_host_caterogies(CentreonAPI_obj, params=None, count_only=False, max_results=None):
     """List of host category configurations"""
-    return CentreonAPI_obj._get_all_paginated('GET', 'configuration/hosts/categories', params=params)
+    return CentreonAPI_obj._get_all_paginated('GET', 'configuration/hosts/categories', params=params,
+                                              count_only=count_only, max_results=max_results)
+
+
+def iter_host_categories(CentreonAPI_obj, params=None):
+    """Yield host category configurations page by page."""
+    return CentreonAPI_obj.iter_paginated('GET', 'configuration/hosts/categories', params=params)
 
 
 def create_host_category(CentreonAPI_obj, hostcategory_data):
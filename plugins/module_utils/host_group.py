@@ -14,9 +14,15 @@ import json
 # CONFIGURATION
 
 
-def list_all_host_groups(CentreonAPI_obj, params=None):
+def list_all_host_groups(CentreonAPI_obj, params=None, count_only=False, max_results=None):
     """Return all host group configurations."""
-    return CentreonAPI_obj._get_all_paginated('GET', 'configuration/hosts/groups', params=params)
+    return CentreonAPI_obj._get_all_paginated('GET', 'configuration/hosts/groups', params=params,
+                                              count_only=count_only, max_results=max_results)
+
+
+def iter_host_groups(CentreonAPI_obj, params=None):
+    """Yield host group configurations page by page."""
+    return CentreonAPI_obj.iter_paginated('GET', 'configuration/hosts/groups', params=params)
 
 
 def add_host_group(CentreonAPI_obj, hostgroup_data):
@@ -81,9 +87,9 @@ def update_host_group(CentreonAPI_obj, hostgroup_id: int, hostgroup_data):
 
 
 def delete_multiple_host_groups(CentreonAPI_obj, hostgroup_ids: list):
-    """Delete multiple host groups by their IDs."""
-    code, data = CentreonAPI_obj._request('POST', 'configuration/hosts/groups/_delete', hostgroup_ids)
-    if code == 200:
+    """Delete multiple host groups by their IDs, returning the status of each deletion."""
+    code, data = CentreonAPI_obj._request('POST', 'configuration/hosts/groups/_delete', {'ids': hostgroup_ids})
+    if code in (200, 207):
         return json.loads(data)
     elif code == 401:
         raise Exception(f"Unauthorized: {json.loads(data)['message']}")
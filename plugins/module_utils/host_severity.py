@@ -14,9 +14,15 @@ import json
 # CONFIGURATION
 
 
-def list_all_host_severities(CentreonAPI_obj, params=None):
+def list_all_host_severities(CentreonAPI_obj, params=None, count_only=False, max_results=None):
     """List of all host severity configurations."""
-    return CentreonAPI_obj._get_all_paginated('GET', 'configuration/hosts/severities', params=params)
+    return CentreonAPI_obj._get_all_paginated('GET', 'configuration/hosts/severities', params=params,
+                                              count_only=count_only, max_results=max_results)
+
+
+def iter_host_severities(CentreonAPI_obj, params=None):
+    """Yield host severity configurations page by page."""
+    return CentreonAPI_obj.iter_paginated('GET', 'configuration/hosts/severities', params=params)
 
 
 def create_host_severity(CentreonAPI_obj, hostseverity_data):
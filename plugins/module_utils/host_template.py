@@ -9,6 +9,12 @@
 #
 
 
-def find_all_host_template_configurations(CentreonAPI_obj, params=None):
+def find_all_host_template_configurations(CentreonAPI_obj, params=None, count_only=False, max_results=None):
     """Return all host template configurations."""
-    return CentreonAPI_obj._get_all_paginated('GET', 'configuration/hosts/templates', params=params)
+    return CentreonAPI_obj._get_all_paginated('GET', 'configuration/hosts/templates', params=params,
+                                              count_only=count_only, max_results=max_results)
+
+
+def iter_host_template_configurations(CentreonAPI_obj, params=None):
+    """Yield host template configurations page by page."""
+    return CentreonAPI_obj.iter_paginated('GET', 'configuration/hosts/templates', params=params)
@@ -12,9 +12,15 @@ import json
 from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
 
 
-def list_all_monitoring_server_configurations(api: CentreonAPI, params=None):
+def list_all_monitoring_server_configurations(api: CentreonAPI, params=None, count_only=False, max_results=None):
     """List all monitoring servers configurations."""
-    return api._get_all_paginated('GET', 'configuration/monitoring-servers', params=params)
+    return api._get_all_paginated('GET', 'configuration/monitoring-servers', params=params,
+                                  count_only=count_only, max_results=max_results)
+
+
+def iter_monitoring_server_configurations(api: CentreonAPI, params=None):
+    """Yield monitoring servers configurations page by page."""
+    return api.iter_paginated('GET', 'configuration/monitoring-servers', params=params)
 
 
 def generate_configuration_monitoring_server(api: CentreonAPI, monitoring_server_id: int) -> bool:
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import json
+from urllib.parse import quote
+
+
+# Keep the encoded search parameter well below the usual 8KB request line limits.
+MAX_SEARCH_LENGTH = 2000
+
+
+def chunk_names_for_search(names: list, max_length: int = MAX_SEARCH_LENGTH) -> list:
+    """Split names so that the URL encoded $in search of each chunk stays under max_length."""
+    chunks = []
+    chunk = []
+    length = len(quote(json.dumps({'name': {'$in': []}})))
+    base_length = length
+    for name in names:
+        name_length = len(quote(json.dumps(name))) + len(quote(', '))
+        if chunk and length + name_length > max_length:
+            chunks.append(chunk)
+            chunk = []
+            length = base_length
+        chunk.append(name)
+        length += name_length
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def find_ids_by_name(list_function, api, names: list) -> dict:
+    """Return the ids matching each name, using one $in search per chunk of names."""
+    matches = {name: [] for name in names}
+    # The server may compare names case insensitively, map those results back too.
+    folded_names = {name.casefold(): name for name in names}
+    for chunk in chunk_names_for_search(list(matches)):
+        filter_criteria = {}
+        filter_criteria['search'] = json.dumps({'name': {'$in': chunk}})
+        for item in list_function(api, params=filter_criteria):
+            name = item['name'] if item['name'] in matches else folded_names.get(item['name'].casefold())
+            if name is not None:
+                matches[name].append(item['id'])
+    return matches
+
+
+def ids_from_matches(matches: dict, values: list, label: str) -> tuple:
+    """Replace the names in values by their ids found in matches, and return them with the errors."""
+    names = list(dict.fromkeys(value for value in values if isinstance(value, str)))
+    missing = [name for name in names if not matches.get(name)]
+    ambiguous = [name for name in names if len(matches.get(name, [])) > 1]
+
+    errors = []
+    if missing:
+        errors.append(f"{label} not found: {', '.join(missing)}")
+    if ambiguous:
+        errors.append(f"{label} with multiple matches: {', '.join(ambiguous)}")
+    if errors:
+        return None, errors
+
+    return [matches[value][0] if isinstance(value, str) else value for value in values], []
+
+
+def resolve_ids_by_name(list_function, api, values: list, label: str) -> tuple:
+    """Replace the names in values by their ids and return them with the resolution errors.
+
+    Ids are kept as they are. All the names of one kind are resolved with the same
+    searches, and every missing or ambiguous name is reported in the returned errors.
+    """
+    names = list(dict.fromkeys(value for value in values if isinstance(value, str)))
+    if not names:
+        return list(values), []
+
+    return ids_from_matches(find_ids_by_name(list_function, api, names), values, label)
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import fcntl
+import hashlib
+import json
+import os
+import time
+
+
+DEFAULT_RATE_LIMIT_PATH = '~/.ansible/tmp/centreon_rate_limit.json'
+
+
+class RateLimiter:
+    """Token bucket shared by every process of the controller through a locked file.
+
+    Each call to acquire() reserves the next free slot of the bucket under an exclusive
+    lock, then sleeps until that slot outside of the lock. The bucket may go negative,
+    which queues the callers fairly without holding the lock while they wait.
+    """
+
+    def __init__(self,
+                 key: str,
+                 rate: float,
+                 burst: int = None,
+                 path: str = DEFAULT_RATE_LIMIT_PATH):
+        self.key = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        self.rate = float(rate)
+        self.burst = max(1, burst or int(self.rate) or 1)
+        self.path = os.path.expanduser(path or DEFAULT_RATE_LIMIT_PATH)
+
+    def _reserve(self) -> float:
+        """Take one token from the shared bucket and return how long to wait before using it."""
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, 'r+') as state_file:
+            fcntl.flock(state_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    buckets = json.load(state_file)
+                except ValueError:
+                    buckets = {}
+
+                now = time.time()
+                bucket = buckets.get(self.key) or {'tokens': self.burst, 'updated': now}
+                tokens = min(self.burst, bucket['tokens'] + (now - bucket['updated']) * self.rate)
+                tokens -= 1
+                buckets[self.key] = {'tokens': tokens, 'updated': now}
+
+                state_file.seek(0)
+                state_file.truncate()
+                json.dump(buckets, state_file)
+                state_file.flush()
+            finally:
+                fcntl.flock(state_file, fcntl.LOCK_UN)
+
+        return 0.0 if tokens >= 0 else -tokens / self.rate
+
+    def acquire(self):
+        """Block until the caller is allowed to send one request."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+
+DEFAULT_TOKEN_CACHE_PATH = '~/.ansible/tmp/centreon_token_cache.json'
+
+
+class TokenCache:
+    """Authentication tokens shared between processes through a JSON file.
+
+    The cache file is always replaced atomically, so it can be read without a lock.
+    Writers must hold locked() so that concurrent forks do not lose each other's updates.
+    """
+
+    def __init__(self,
+                 path: str = DEFAULT_TOKEN_CACHE_PATH,
+                 ttl: int = 3600):
+        self.path = os.path.expanduser(path or DEFAULT_TOKEN_CACHE_PATH)
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(hostname: str, username: str) -> str:
+        """Return the cache key of a hostname and username pair."""
+        return hashlib.sha256(f"{hostname}\0{username}".encode('utf-8')).hexdigest()
+
+    @contextmanager
+    def locked(self):
+        """Hold an exclusive lock on the cache across processes."""
+        os.makedirs(os.path.dirname(self.path), mode=0o700, exist_ok=True)
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self) -> dict:
+        """Return the unexpired cache entries, ignoring a missing or corrupted file."""
+        try:
+            with open(self.path) as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        now = time.time()
+        return {k: v for k, v in entries.items() if isinstance(v, dict) and v.get('expires', 0) > now}
+
+    def _write(self, entries: dict):
+        """Atomically replace the cache file with the given entries."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix='.centreon_token_cache')
+        try:
+            with os.fdopen(fd, 'w') as cache_file:
+                json.dump(entries, cache_file)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get(self, hostname: str, username: str):
+        """Return the cached token for hostname and username, or None when missing or expired."""
+        entry = self._read().get(self._key(hostname, username))
+        return entry['token'] if entry else None
+
+    def set(self, hostname: str, username: str, token: str):
+        """Store a token for hostname and username. Must be called while holding locked()."""
+        entries = self._read()
+        entries[self._key(hostname, username)] = {
+            'token': token,
+            'expires': time.time() + self.ttl
+        }
+        self._write(entries)
+
+    def delete(self, hostname: str, username: str):
+        """Forget the token of hostname and username. Must be called while holding locked()."""
+        entries = self._read()
+        if entries.pop(self._key(hostname, username), None) is not None:
+            self._write(entries)
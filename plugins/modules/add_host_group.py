@@ -87,8 +87,8 @@ result:
         }
 '''
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 from ansible_collections.parnoud.centreon.plugins.module_utils.host_group import add_host_group
 
@@ -96,14 +96,7 @@ from ansible_collections.parnoud.centreon.plugins.module_utils.host_group import
 def add_host_group_with_parameters(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
     hostgroup_data = {
         'name': module.params.get('name'),
         'alias': module.params.get('alias'),
@@ -129,7 +122,7 @@ def main():
         comment=dict(type='str', default=None),
         hosts=dict(type='list', elements='int', default=[]),
     )
-    module = AnsibleModule(
+    module = CentreonModule(
         argument_spec=argument_spec,
         supports_check_mode=True
     )
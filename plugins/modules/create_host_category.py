@@ -64,8 +64,8 @@ result:
         }
 '''
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 from ansible_collections.parnoud.centreon.plugins.module_utils.host_category import create_host_category
 
@@ -73,14 +73,7 @@ from ansible_collections.parnoud.centreon.plugins.module_utils.host_category imp
 def create_host_category_with_parameters(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
     hostcategory_data = {
         'name': module.params.get('name'),
         'alias': module.params.get('alias'),
@@ -102,7 +95,7 @@ def main():
         is_activated=dict(type='bool', default=True),
         comment=dict(type='str', default=None),
     )
-    module = AnsibleModule(
+    module = CentreonModule(
         argument_spec=argument_spec,
         supports_check_mode=True
     )
@@ -343,8 +343,8 @@ result:
         }
 '''
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 from ansible_collections.parnoud.centreon.plugins.module_utils.host import create_host_configuration
 
@@ -352,14 +352,7 @@ from ansible_collections.parnoud.centreon.plugins.module_utils.host import creat
 def create_host_configuration_with_parameters(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
     host_data = {
         'monitoring_server_id': module.params.get('monitoring_server_id'),
         'name': module.params.get('name'),
@@ -461,7 +454,7 @@ def main():
         templates=dict(type='list', elements='int', default=None),
         macros=dict(type='list', elements='dict', default=None)
     )
-    module = AnsibleModule(
+    module = CentreonModule(
         argument_spec=argument_spec,
         supports_check_mode=True
     )
@@ -60,8 +60,8 @@ result:
     sample :
 '''
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 from ansible_collections.parnoud.centreon.plugins.module_utils.host_severity import create_host_severity
 
@@ -69,14 +69,7 @@ from ansible_collections.parnoud.centreon.plugins.module_utils.host_severity imp
 def create_host_severity_with_parameters(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
     hostseverity_data = {
         'name': module.params.get('name'),
         'alias': module.params.get('alias'),
@@ -98,7 +91,7 @@ def main():
         level=dict(type='int', required=True),
         icon_id=dict(type='int', required=True),
     )
-    module = AnsibleModule(
+    module = CentreonModule(
         argument_spec=argument_spec,
         supports_check_mode=True
     )
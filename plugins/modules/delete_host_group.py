@@ -44,8 +44,8 @@ result:
     sample : 0
 '''
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 from ansible_collections.parnoud.centreon.plugins.module_utils.host_group import delete_host_group
 
@@ -53,14 +53,7 @@ from ansible_collections.parnoud.centreon.plugins.module_utils.host_group import
 def delete_host_group_by_id(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
 
     if delete_host_group(api, hostgroup_id=module.params.get('hostgroup_id')):
         return True, 0
@@ -73,7 +66,7 @@ def main():
     argument_spec.update(
         hostgroup_id=dict(type='int', required=True),
     )
-    module = AnsibleModule(
+    module = CentreonModule(
         argument_spec=argument_spec,
         supports_check_mode=True
     )
@@ -22,6 +22,19 @@ options:
         type: raw
         required: false
         default: null
+    count_only:
+        description:
+            - Only count the matching rows with a single one row request, and return that number in RV(total).
+            - RV(result) is then an empty list.
+        type: bool
+        required: false
+        default: false
+    max_results:
+        description:
+            - Return at most this number of rows. No further page is requested once they are collected.
+            - All the matching rows are returned when not set.
+        type: int
+        required: false
 extends_documentation_fragment:
     - parnoud.centreon.base_options
 '''
@@ -54,6 +67,20 @@ EXAMPLES = r'''
                 "$rg": "^serveur"
             - "name":
                 "$rg": "^my"
+
+- name: Count the hosts
+  parnoud.centreon.find_all_host_configurations:
+        hostname: centreon.com/centreon/api/latest
+        username: user
+        password: pass
+        count_only: true
+
+- name: Return the first 10 hosts
+  parnoud.centreon.find_all_host_configurations:
+        hostname: centreon.com/centreon/api/latest
+        username: user
+        password: pass
+        max_results: 10
 '''
 
 RETURN = r'''
@@ -108,12 +135,18 @@ result:
             "is_activated": true
             }
         ]
+total:
+    description:
+        - Number of matching rows when O(count_only) is set, otherwise number of rows in RV(result).
+    returned: success
+    type: int
+    sample: 42
 '''
 
 import json
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 from ansible_collections.parnoud.centreon.plugins.module_utils.host import find_all_host_configurations
 
@@ -121,39 +154,47 @@ from ansible_collections.parnoud.centreon.plugins.module_utils.host import find_
 def find_all_host_configurations_with_search(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
     search_criteria = module.params.get('search') or None
     filter_criteria = None
     if search_criteria:
         filter_criteria = {}
         filter_criteria['search'] = json.dumps(search_criteria)
 
-    result = find_all_host_configurations(api, params=filter_criteria)
+    if module.params.get('count_only'):
+        return find_all_host_configurations(api, params=filter_criteria, count_only=True), []
+
+    result = find_all_host_configurations(api, params=filter_criteria, max_results=module.params.get('max_results'))
     return len(result), result
 
 
-def main():
+def module_argument_spec():
+    """Return the argument spec of the module."""
     argument_spec = base_argument_spec()
     argument_spec.update(
         search=dict(type='raw', default=None),
+        count_only=dict(type='bool', default=False),
+        max_results=dict(type='int', default=None),
     )
-    module = AnsibleModule(
-        argument_spec=argument_spec,
-        supports_check_mode=True
-    )
+    return argument_spec
+
+
+def run_module(module):
+    """Run the module and exit with its result."""
     status, result = find_all_host_configurations_with_search(module)
     if status >= 0:
-        module.exit_json(skipped=True, result=result)
+        module.exit_json(skipped=True, result=result, total=status)
     else:
         module.fail_json(result=0)
 
 
+def main():
+    module = CentreonModule(
+        argument_spec=module_argument_spec(),
+        supports_check_mode=True
+    )
+    run_module(module)
+
+
 if __name__ == '__main__':
     main()
@@ -45,8 +45,8 @@ result:
 '''
 
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 from ansible_collections.parnoud.centreon.plugins.module_utils.monitoring_server import generate_configuration_monitoring_server
 
@@ -54,14 +54,7 @@ from ansible_collections.parnoud.centreon.plugins.module_utils.monitoring_server
 def generate_configuration_monitoring_server_by_id(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
 
     if generate_configuration_monitoring_server(api, monitoring_server_id=module.params.get('monitoring_server_id')):
         return True, 'OK'
@@ -74,7 +67,7 @@ def main():
     argument_spec.update(
         monitoring_server_id=dict(type='int', required=True),
     )
-    module = AnsibleModule(
+    module = CentreonModule(
         argument_spec=argument_spec,
         supports_check_mode=True
     )
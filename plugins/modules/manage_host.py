@@ -18,6 +18,12 @@ description:
     - Update a host in Centreon.
     - Replace a host in Centreon
     - Delete a host in Centreon.
+    - With O(state=update) or O(state=replace), the given fields are compared with the current host and
+      no request is sent when they already match. Relations and macros are compared regardless of their order.
+    - Only the fields that differ from the current host are sent.
+    - When fields that the host listing does not return are given, such as O(macros), the details of the host
+      are read to compare them.
+    - Supports check mode and diff mode.
 author: "Pierre ARNOUD (@parnoud)"
 options:
     state:
@@ -206,15 +212,19 @@ options:
         type: list
         elements: int
     groups:
-        description: Groups associated with the host.
+        description:
+            - Groups associated with the host, given by id or by name.
+            - All the names are resolved together, missing and ambiguous names are reported in one error.
         required: false
         type: list
-        elements: int
+        elements: raw
     templates:
-        description: Templates associated with the host.
+        description:
+            - Templates associated with the host, given by id or by name.
+            - All the names are resolved together, missing and ambiguous names are reported in one error.
         required: false
         type: list
-        elements: int
+        elements: raw
     macros:
         description: Macros associated with the host.
         required: false
@@ -458,30 +468,60 @@ delete:
 
 import json
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.host import (
+    complete_host_configuration,
     delete_host_configuration,
+    diff_host_configuration,
+    merge_host_relations,
+    normalize_host_configuration,
     partially_update_host_configuration,
     find_all_host_configurations,
     create_host_configuration
 )
 from ansible_collections.parnoud.centreon.plugins.module_utils.host_group import list_all_host_groups
 from ansible_collections.parnoud.centreon.plugins.module_utils.host_template import find_all_host_template_configurations
-from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
+from ansible_collections.parnoud.centreon.plugins.module_utils.name_resolver import resolve_ids_by_name
+from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec, host_argument_spec
+
+
+def find_host_by_id(api, host_id: int) -> list:
+    """Return the listing of the host with the given id."""
+    filter_criteria = {}
+    filter_criteria['search'] = json.dumps({'id': host_id})
+    return find_all_host_configurations(api, params=filter_criteria)
+
+
+def find_current_host(module, api) -> tuple:
+    """Return the host targeted by host_id or name, and an error when it cannot be told apart.
+
+    A missing host only returns an error for the update and replace states.
+    """
+    if module.params['host_id']:
+        hosts = find_host_by_id(api, module.params['host_id'])
+        label = f"ID {module.params['host_id']}"
+    elif module.params['name']:
+        filter_criteria = {}
+        filter_criteria['search'] = json.dumps({'name': module.params['name']})
+        hosts = find_all_host_configurations(api, params=filter_criteria)
+        label = module.params['name']
+    else:
+        return None, f"Host ID or name must be provided for {module.params['state']} operation."
+
+    if len(hosts) > 1:
+        return None, f"Host {label} multiple for {module.params['state']}. {len(hosts)}"
+    if not hosts:
+        if module.params['state'] == 'delete':
+            return None, None
+        return None, f"Host {label} not found for {module.params['state']}."
+    return hosts[0], None
 
 
 def manage_host(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
 
     host_data = {
         'monitoring_server_id': module.params.get('monitoring_server_id'),
@@ -532,206 +572,110 @@ def manage_host(module):
 
     host_data = {k: v for k, v in host_data.items() if v is not None}
 
+    errors = []
     if host_data.get('groups'):
-        new_groups = []
-        for val in host_data['groups']:
-            if isinstance(val, str):
-                filter_criteria = {}
-                filter_criteria['search'] = json.dumps({'name': val})
-                host_groups = list_all_host_groups(api, params=filter_criteria)
-                if len(host_groups) != 1:
-                    return False, f"Host group {val} multiple or not found for update."
-                host_group_id = host_groups[0]['id']
-                new_groups.append(host_group_id)
-            else:
-                new_groups.append(val)
-        host_data['groups'] = new_groups
+        host_data['groups'], group_errors = resolve_ids_by_name(list_all_host_groups, api, host_data['groups'], 'Host groups')
+        errors.extend(group_errors)
 
     if host_data.get('templates'):
-        new_templates = []
-        for val in host_data['templates']:
-            if isinstance(val, str):
-                filter_criteria = {}
-                filter_criteria['search'] = json.dumps({'name': val})
-                hosts_templates = find_all_host_template_configurations(api, params=filter_criteria)
-                if len(hosts_templates) != 1:
-                    return False, f"Host template {val} multiple or not found for update."
-                host_template_id = hosts_templates[0]['id']
-                new_templates.append(host_template_id)
-            else:
-                new_templates.append(val)
-        host_data['templates'] = new_templates
+        host_data['templates'], template_errors = resolve_ids_by_name(find_all_host_template_configurations, api, host_data['templates'], 'Host templates')
+        errors.extend(template_errors)
+
+    if errors:
+        return False, '. '.join(errors), False, None
 
     if module.params['state'] == 'create':
 
+        if module.check_mode:
+            return True, host_data, True, {'before': {}, 'after': host_data}
+
         result = create_host_configuration(api, host_data=host_data)
-        return True, result
+        return True, result, True, {'before': {}, 'after': host_data}
 
     elif module.params['state'] == 'replace':
 
-        host_id = None
-
         if module.params['new_name']:
             host_data['name'] = module.params['new_name']
         else:
             host_data.pop('name', None)
 
-        if module.params['host_id']:
-            host_id = module.params['host_id']
-
-        elif module.params['name']:
-            filter_criteria = {}
-            filter_criteria['search'] = json.dumps({'name': module.params['name']})
-            hosts = find_all_host_configurations(api, params=filter_criteria)
-            if len(hosts) != 1:
-                return False, f"Host {module.params['name']} multiple or not found for update. {filter_criteria}"
-            host_id = hosts[0]['id']
-
-        if host_id:
-            if partially_update_host_configuration(api, host_id, host_data):
-                filter_criteria = {}
-                filter_criteria['search'] = json.dumps({'id': host_id})
-                return True, find_all_host_configurations(api, params=filter_criteria)
-        else:
-            return False, "Host ID or name must be provided for update operation."
+        current_host, error = find_current_host(module, api)
+        if error:
+            return False, error, False, None
+        current_host = complete_host_configuration(api, current_host, host_data)
 
-    elif module.params['state'] == 'update':
+        before, after = diff_host_configuration(host_data, normalize_host_configuration(current_host))
+        if not after:
+            return True, [current_host], False, None
 
-        host_id = None
-        current_host_data = None
+        if module.check_mode or partially_update_host_configuration(api, current_host['id'], after):
+            return True, find_host_by_id(api, current_host['id']), True, {'before': before, 'after': after}
+
+    elif module.params['state'] == 'update':
 
         if module.params['new_name']:
             host_data['name'] = module.params['new_name']
 
-        if module.params['host_id']:
-            host_id = module.params['host_id']
-
-        elif module.params['name']:
-            filter_criteria = {}
-            filter_criteria['search'] = json.dumps({'name': module.params['name']})
-            hosts = find_all_host_configurations(api, params=filter_criteria)
-            if len(hosts) != 1:
-                return False, f"Host {module.params['name']} multiple or not found for update. {filter_criteria}"
-            host_id = hosts[0]['id']
-            current_host_data = hosts[0]
-
-        current_host_data.pop('id', None)
-        current_host_data.pop('monitoring_server', None)
-
-        current_host_data.pop('notification_timeperiod', None)
-        current_host_data.pop('check_timeperiod', None)
-        current_host_data.pop('severity', None)
-
-        current_host_data["categories"] = [item["id"] for item in current_host_data["categories"]]
-        if host_data.get('categories'):
-            current_host_data["categories"] += list(host_data['categories'])
-            host_data.pop('categories')
-
-        current_host_data["groups"] = [item["id"] for item in current_host_data["groups"]]
-        if host_data.get('groups'):
-            current_host_data["groups"] += list(host_data['groups'])
-            host_data.pop('groups')
-
-        current_host_data["templates"] = [item["id"] for item in current_host_data["templates"]]
-        if host_data.get('templates'):
-            current_host_data["templates"] += list(host_data['templates'])
-            host_data.pop('templates')
-
-        current_host_data.update(host_data)
-
-        if host_id:
-            if partially_update_host_configuration(api, host_id, current_host_data):
-                filter_criteria = {}
-                filter_criteria['search'] = json.dumps({'id': host_id})
-                return True, find_all_host_configurations(api, params=filter_criteria)
-        else:
-            return False, "Host ID or name must be provided for update operation."
+        current_host, error = find_current_host(module, api)
+        if error:
+            return False, error, False, None
+        current_host = complete_host_configuration(api, current_host, host_data)
 
-    elif module.params['state'] == 'delete':
-        host_id = None
+        current_host_data = normalize_host_configuration(current_host)
 
-        if module.params['host_id']:
-            host_id = module.params['host_id']
-        elif module.params['name']:
-            filter_criteria = {}
-            filter_criteria['search'] = json.dumps({'name': module.params['name']})
+        merge_host_relations(host_data, current_host_data)
 
-            hosts = find_all_host_configurations(api, params=filter_criteria)
-            if len(hosts) == 0:
-                return True, hosts
-            elif len(hosts) >= 2:
-                return False, f"Host {module.params['name']} multiple for update. {len(hosts)}"
+        before, after = diff_host_configuration(host_data, current_host_data)
+        if not after:
+            return True, [current_host], False, None
 
-            host_id = hosts[0]['id']
+        # Only the changed fields are sent.
+        if module.check_mode or partially_update_host_configuration(api, current_host['id'], after):
+            return True, find_host_by_id(api, current_host['id']), True, {'before': before, 'after': after}
 
-        if host_id:
-            if delete_host_configuration(api, host_id):
-                return True, hosts[0]
-        else:
-            return False, "Host ID or name must be provided for delete operation."
+    elif module.params['state'] == 'delete':
 
+        current_host, error = find_current_host(module, api)
+        if current_host is None and error is None:
+            return True, [], False, None
+        if error:
+            return False, error, False, None
 
-def main():
+        if module.check_mode or delete_host_configuration(api, current_host['id']):
+            return True, current_host, True, {'before': normalize_host_configuration(current_host), 'after': {}}
+
+
+def module_argument_spec():
+    """Return the argument spec of the module."""
     argument_spec = base_argument_spec()
     argument_spec.update(
         state=dict(type='str', choices=['create', 'delete', 'update', 'replace'], default='create'),
-        monitoring_server_id=dict(type='int'),
         host_id=dict(type='int', default=None),
         name=dict(type='str', default=None),
         new_name=dict(type='str', default=None),
-        address=dict(type='str', default=None),
-        alias=dict(type='str', default=None),
-        snmp_community=dict(type='str', default=None),
-        snmp_version=dict(type='str', choices=['1', '2c', '3'], default=None),
-        geo_coords=dict(type='str', default=None),
-        timezone_id=dict(type='int', default=None),
-        severity_id=dict(type='int', default=None),
-        check_command_id=dict(type='int', default=None),
-        check_command_args=dict(type='dict', default=None),
-        check_timeperiod_id=dict(type='int', default=None),
-        max_check_attempts=dict(type='int', default=None),
-        normal_check_interval=dict(type='int', default=None),
-        retry_check_interval=dict(type='int', default=None),
-        active_check_enabled=dict(type='int', choices=[0, 1, 2], default=None),
-        passive_check_enabled=dict(type='int', choices=[0, 1, 2], default=None),
-        notifications_enabled=dict(type='int', choices=[0, 1, 2], default=None),
-        notification_options=dict(type='int', choices=[0, 1, 2, 4, 8, 16], default=None),
-        notification_interval=dict(type='int', default=None),
-        notification_timeperiod_id=dict(type='int', default=None),
-        add_inherited_contact_group=dict(type='bool', default=None),
-        add_inherited_contact=dict(type='bool', default=None),
-        first_notification_delay=dict(type='int', default=None),
-        recovery_notification_delay=dict(type='int', default=None),
-        acknowledgement_timeout=dict(type='int', default=None),
-        freshness_threshold=dict(type='int', default=None),
-        flap_detection_enabled=dict(type='int', choices=[0, 1, 2], default=None),
-        low_flap_threshold=dict(type='int', default=None),
-        high_flap_threshold=dict(type='int', default=None),
-        event_handler_enabled=dict(type='int', choices=[0, 1, 2], default=None),
-        event_handler_command_id=dict(type='int', default=None),
-        event_handler_command_args=dict(type='dict', default=None),
-        note_url=dict(type='str', default=None),
-        note=dict(type='str', default=None),
-        action_url=dict(type='str', default=None),
-        icon_id=dict(type='int', default=None),
-        icon_alternative=dict(type='str', default=None),
-        comment=dict(type='str', default=None),
-        is_activated=dict(type='bool', default=None),
-        categories=dict(type='list', elements='int', default=None),
-        groups=dict(type='list', elements='int', default=None),
-        templates=dict(type='list', elements='int', default=None),
-        macros=dict(type='list', elements='dict', default=None),
-    )
-    module = AnsibleModule(
-        argument_spec=argument_spec,
-        supports_check_mode=True
     )
-    return_type, data = manage_host(module)
+    argument_spec.update(host_argument_spec())
+    return argument_spec
+
+
+def run_module(module):
+    """Run the module and exit with its result."""
+    return_type, data, changed, diff = manage_host(module)
     if return_type:
-        module.exit_json(changed=False, data=data)
+        if diff is not None and module._diff:
+            module.exit_json(changed=changed, data=data, diff=diff)
+        module.exit_json(changed=changed, data=data)
     else:
         module.fail_json(msg=data)
 
 
+def main():
+    module = CentreonModule(
+        argument_spec=module_argument_spec(),
+        supports_check_mode=True
+    )
+    run_module(module)
+
+
 if __name__ == '__main__':
     main()
@@ -17,11 +17,12 @@ description:
     - Create a host group in Centreon.
     - Update a host group in Centreon.
     - Delete a host group in Centreon.
+    - Synchronize all the host groups of Centreon with a desired set of groups and members.
 author: "Pierre ARNOUD (@parnoud)"
 options:
     state:
         description: Desired state of the host.
-        choices: ['create', 'delete', 'update', 'replace', 'duplicate']
+        choices: ['create', 'delete', 'update', 'replace', 'duplicate', 'synced']
         default: 'create'
         type: str
         required: False
@@ -67,40 +68,188 @@ options:
         description: Number of duplicates to create.
         required: False
         type: int
+    groups:
+        description:
+            - Full set of host groups for O(state=synced).
+            - The host groups and their members are read once, then only the groups that differ are
+              created or replaced, and the host groups missing from this list are deleted in one request.
+            - B(All) the host groups which are not listed are deleted.
+        required: False
+        type: list
+        elements: dict
+        suboptions:
+            name:
+                description: Name of the host group.
+                required: True
+                type: str
+            alias:
+                description: Alias of the host group, kept as it is when not given.
+                type: str
+            icon_id:
+                description: Icon ID of the host group, kept as it is when not given.
+                type: int
+            geo_coords:
+                description: Geographical coordinates of the host group, kept as it is when not given.
+                type: str
+            comment:
+                description: Comment for the host group, kept as it is when not given.
+                type: str
+            hosts:
+                description:
+                    - Exact members of the host group, given by id or by name.
+                    - The members are kept as they are when not given.
+                type: list
+                elements: raw
 extends_documentation_fragment:
     - parnoud.centreon.base_options
 '''
 
 EXAMPLES = r'''
-
+---
+- name: Synchronize the host groups
+  parnoud.centreon.manage_host_groups:
+    state: synced
+    hostname: centreon.com/centreon/api/latest
+    username: user
+    password: pass
+    groups:
+      - name: web
+        alias: Web servers
+        hosts:
+          - web-01
+          - web-02
+      - name: db
+        hosts: []
 '''
 
 import json
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
+from ansible_collections.parnoud.centreon.plugins.module_utils.host import find_all_host_configurations, iter_host_configurations
 from ansible_collections.parnoud.centreon.plugins.module_utils.host_group import (
     delete_host_group,
+    delete_multiple_host_groups,
     update_host_group,
     list_all_host_groups,
     add_host_group,
     duplicate_multiple_host_groups,
     get_host_group
 )
+from ansible_collections.parnoud.centreon.plugins.module_utils.name_resolver import find_ids_by_name, ids_from_matches
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 
+# Fields of a host group sent with PUT, besides its name and hosts.
+HOSTGROUP_FIELDS = ('alias', 'comment', 'geo_coords', 'icon_id')
+
+
+def sync_host_groups(module):
+    """Bring the host groups to the groups option, returning the status, the changes and whether anything changed."""
+
+    api = centreon_api_from_module(module)
+    desired = module.params['groups']
+    if desired is None:
+        return False, "groups must be provided for synced operation.", False
+
+    names = [group['name'] for group in desired]
+    duplicates = [name for name in dict.fromkeys(names) if names.count(name) > 1]
+    if duplicates:
+        return False, f"Host groups listed more than once: {', '.join(duplicates)}", False
+
+    current = {}
+    for group in list_all_host_groups(api):
+        current[group['name']] = dict(
+            {key: group.get(key) for key in HOSTGROUP_FIELDS},
+            id=group['id'],
+            icon_id=(group.get('icon') or {}).get('id'),
+            hosts=set()
+        )
+
+    host_names = list(dict.fromkeys(
+        value for group in desired for value in group['hosts'] or [] if isinstance(value, str)
+    ))
+
+    # The group listing does not return members, they are read from the host listing,
+    # which then also resolves the host names. A PUT replaces the members of a group, so they
+    # are needed for every existing group that is sent, even when its hosts are not given.
+    if any(
+        group['name'] in current and (
+            group['hosts'] is not None
+            or any(group[key] is not None and group[key] != current[group['name']][key] for key in HOSTGROUP_FIELDS)
+        )
+        for group in desired
+    ):
+        groups_by_id = {group['id']: group for group in current.values()}
+        matches = {name: [] for name in host_names}
+        for host in iter_host_configurations(api):
+            if host['name'] in matches:
+                matches[host['name']].append(host['id'])
+            for host_group in host.get('groups') or []:
+                if host_group['id'] in groups_by_id:
+                    groups_by_id[host_group['id']]['hosts'].add(host['id'])
+    else:
+        matches = find_ids_by_name(find_all_host_configurations, api, host_names) if host_names else {}
+
+    errors = []
+    for group in desired:
+        if group['hosts'] is not None:
+            group['hosts'], host_errors = ids_from_matches(matches, group['hosts'], f"Hosts of {group['name']}")
+            errors.extend(host_errors)
+    if errors:
+        return False, '. '.join(errors), False
+
+    changes = {'created': [], 'updated': [], 'deleted': []}
+    before = {}
+    after = {}
+    for group in desired:
+        hostgroup_data = {key: group[key] for key in HOSTGROUP_FIELDS if group[key] is not None}
+        hostgroup_data['name'] = group['name']
+        if group['hosts'] is not None:
+            hostgroup_data['hosts'] = sorted(set(group['hosts']))
+
+        current_group = current.get(group['name'])
+        if current_group is None:
+            changes['created'].append(group['name'])
+            after[group['name']] = hostgroup_data
+            if not module.check_mode:
+                add_host_group(api, hostgroup_data=hostgroup_data)
+            continue
+
+        current_data = {key: current_group[key] for key in HOSTGROUP_FIELDS}
+        current_data['name'] = group['name']
+        current_data['hosts'] = sorted(current_group['hosts'])
+        if group['hosts'] is None:
+            hostgroup_data['hosts'] = current_data['hosts']
+        if all(current_data[key] == value for key, value in hostgroup_data.items()):
+            continue
+
+        changes['updated'].append(group['name'])
+        before[group['name']] = current_data
+        after[group['name']] = dict(current_data, **hostgroup_data)
+        if not module.check_mode:
+            update_host_group(api, current_group['id'], {k: v for k, v in after[group['name']].items() if v is not None})
+
+    desired_names = set(names)
+    extra_groups = [name for name in current if name not in desired_names]
+    if extra_groups:
+        changes['deleted'] = extra_groups
+        before.update((name, {'name': name}) for name in extra_groups)
+        if not module.check_mode:
+            response = delete_multiple_host_groups(api, [current[name]['id'] for name in extra_groups])
+            failures = [item for item in (response or {}).get('results', []) if item.get('status') != 204]
+            if failures:
+                return False, f"Failed to delete host groups: {failures}", True
+
+    changed = any(changes.values())
+    if changed and module._diff:
+        changes['diff'] = {'before': before, 'after': after}
+    return True, changes, changed
+
 
 def manage_host_groups(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
 
     hostgroup_data = {
         'hostgroup_id': module.params.get('hostgroup_id'),
@@ -212,10 +361,11 @@ def manage_host_groups(module):
         return True, result
 
 
-def main():
+def module_argument_spec():
+    """Return the argument spec of the module."""
     argument_spec = base_argument_spec()
     argument_spec.update(
-        state=dict(type='str', choices=['create', 'delete', 'update', 'replace', 'duplicate'], default='create'),
+        state=dict(type='str', choices=['create', 'delete', 'update', 'replace', 'duplicate', 'synced'], default='create'),
         hostgroup_id=dict(type='int'),
         name=dict(type='str'),
         new_name=dict(type='str'),
@@ -225,12 +375,34 @@ def main():
         comment=dict(type='str', default=None),
         hosts=dict(type='list', elements='int', default=[]),
         ids=dict(type='list', elements='int'),
-        nb_duplicates=dict(type='int')
-    )
-    module = AnsibleModule(
-        argument_spec=argument_spec,
-        supports_check_mode=True
+        nb_duplicates=dict(type='int'),
+        groups=dict(
+            type='list',
+            elements='dict',
+            options=dict(
+                name=dict(type='str', required=True),
+                alias=dict(type='str'),
+                icon_id=dict(type='int'),
+                geo_coords=dict(type='str'),
+                comment=dict(type='str'),
+                hosts=dict(type='list', elements='raw'),
+            )
+        )
     )
+    return argument_spec
+
+
+def run_module(module):
+    """Run the module and exit with its result."""
+    if module.params['state'] == 'synced':
+        return_type, data, changed = sync_host_groups(module)
+        if return_type:
+            diff = data.pop('diff', None)
+            if diff is not None:
+                module.exit_json(changed=changed, data=data, diff=diff)
+            module.exit_json(changed=changed, data=data)
+        module.fail_json(msg=data, changed=changed)
+
     return_type, data = manage_host_groups(module)
     if return_type:
         module.exit_json(changed=False, data=data)
@@ -238,5 +410,13 @@ def main():
         module.fail_json(msg=data)
 
 
+def main():
+    module = CentreonModule(
+        argument_spec=module_argument_spec(),
+        supports_check_mode=True
+    )
+    run_module(module)
+
+
 if __name__ == '__main__':
     main()
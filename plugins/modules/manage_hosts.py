@@ -0,0 +1,540 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+
+DOCUMENTATION = r'''
+---
+module: manage_hosts
+short_description: Manage many hosts in Centreon via API v2
+description:
+    - Create, update, replace or delete a list of hosts in Centreon in one task.
+    - The existing hosts are listed once and indexed by name, and all the group and template
+      names of the list are resolved together.
+    - The create, update and delete requests are then sent by a bounded pool of workers.
+    - Hosts are handled as with M(parnoud.centreon.manage_host), except that O(hosts[].state=create)
+      leaves an existing host untouched, and only the changed fields of a host are sent.
+    - A failing host does not stop the others, the result of each host is returned in RV(results).
+    - Supports check mode and diff mode.
+author: "Pierre ARNOUD (@parnoud)"
+options:
+    state:
+        description: Desired state of the hosts which do not set O(hosts[].state).
+        choices: ['create', 'delete', 'update', 'replace']
+        default: 'create'
+        type: str
+    max_workers:
+        description:
+            - Maximum number of host requests sent at the same time.
+            - Keep it lower than or equal to O(pool_maxsize) so that connections are reused.
+        type: int
+        default: 4
+    hosts:
+        description: Hosts to manage.
+        required: true
+        type: list
+        elements: dict
+        suboptions:
+            state:
+                description: Desired state of the host, defaults to O(state).
+                choices: ['create', 'delete', 'update', 'replace']
+                type: str
+            name:
+                description: Host name.
+                required: true
+                type: str
+            new_name:
+                description: New host name for update and replace operations.
+                type: str
+            monitoring_server_id:
+                description: ID of the monitoring server where the host will be created.
+                required: false
+                type: int
+            address:
+                description: Host address.
+                required: false
+                type: str
+            alias:
+                description: Host alias.
+                required: false
+                type: str
+            snmp_community:
+                description: SNMP community string.
+                required: false
+                type: str
+            snmp_version:
+                description: SNMP version.
+                required: false
+                type: str
+                choices: ['1', '2c', '3']
+            geo_coords:
+                description: Geographical coordinates of the host.
+                required: false
+                type: str
+            timezone_id:
+                description: Timezone ID for the host.
+                required: false
+                type: int
+            severity_id:
+                description: Severity ID for the host.
+                required: false
+                type: int
+            check_command_id:
+                description: Check command ID for the host.
+                required: false
+                type: int
+            check_command_args:
+                description: Arguments for the check command.
+                required: false
+                type: dict
+            check_timeperiod_id:
+                description: Check time period ID for the host.
+                required: false
+                type: int
+            max_check_attempts:
+                description: Maximum number of check attempts.
+                required: false
+                type: int
+            normal_check_interval:
+                description: Normal check interval.
+                required: false
+                type: int
+            retry_check_interval:
+                description: Retry check interval.
+                required: false
+                type: int
+            active_check_enabled:
+                description: Whether active checks are enabled.
+                required: false
+                type: int
+                choices: [0, 1, 2]
+            passive_check_enabled:
+                description: Whether passive checks are enabled.
+                required: false
+                type: int
+                choices: [0, 1, 2]
+            notifications_enabled:
+                description: Whether notifications are enabled.
+                required: false
+                type: int
+                choices: [0, 1, 2]
+            notification_options:
+                description: Notification options.
+                required: false
+                type: int
+                choices: [0, 1, 2, 4, 8, 16]
+            notification_interval:
+                description: Notification interval.
+                required: false
+                type: int
+            notification_timeperiod_id:
+                description: Notification time period ID.
+                required: false
+                type: int
+            add_inherited_contact_group:
+                description: Whether to add inherited contact groups.
+                required: false
+                type: bool
+            add_inherited_contact:
+                description: Whether to add inherited contacts.
+                required: false
+                type: bool
+            first_notification_delay:
+                description: First notification delay.
+                required: false
+                type: int
+            recovery_notification_delay:
+                description: Recovery notification delay.
+                required: false
+                type: int
+            acknowledgement_timeout:
+                description: Acknowledgement timeout.
+                required: false
+                type: int
+            freshness_threshold:
+                description: Freshness threshold.
+                required: false
+                type: int
+            flap_detection_enabled:
+                description: Whether flap detection is enabled.
+                required: false
+                type: int
+                choices: [0, 1, 2]
+            low_flap_threshold:
+                description: Low flap threshold.
+                required: false
+                type: int
+            high_flap_threshold:
+                description: High flap threshold.
+                required: false
+                type: int
+            event_handler_enabled:
+                description: Whether event handler is enabled.
+                required: false
+                type: int
+                choices: [0, 1, 2]
+            event_handler_command_id:
+                description: Event handler command ID.
+                required: false
+                type: int
+            event_handler_command_args:
+                description: Arguments for the event handler command.
+                required: false
+                type: dict
+            note_url:
+                description: Note URL for the host.
+                required: false
+                type: str
+            note:
+                description: Note for the host.
+                required: false
+                type: str
+            action_url:
+                description: Action URL for the host.
+                required: false
+                type: str
+            icon_id:
+                description: Icon ID for the host.
+                required: false
+                type: int
+            icon_alternative:
+                description: Icon alternative text for the host.
+                required: false
+                type: str
+            comment:
+                description: Comment for the host.
+                required: false
+                type: str
+            is_activated:
+                description: Whether the host is activated.
+                required: false
+                type: bool
+            categories:
+                description: Categories associated with the host.
+                required: false
+                type: list
+                elements: int
+            groups:
+                description:
+                    - Groups associated with the host, given by id or by name.
+                    - All the names are resolved together, missing and ambiguous names are reported in one error.
+                required: false
+                type: list
+                elements: raw
+            templates:
+                description:
+                    - Templates associated with the host, given by id or by name.
+                    - All the names are resolved together, missing and ambiguous names are reported in one error.
+                required: false
+                type: list
+                elements: raw
+            macros:
+                description: Macros associated with the host.
+                required: false
+                type: list
+                elements: dict
+extends_documentation_fragment:
+    - parnoud.centreon.base_options
+'''
+
+EXAMPLES = r'''
+---
+- name: Onboard hosts
+  parnoud.centreon.manage_hosts:
+    hostname: centreon.com/centreon/api/latest
+    username: user
+    password: pass
+    max_workers: 8
+    hosts:
+      - name: web-01
+        monitoring_server_id: 1
+        address: 10.0.0.1
+        templates:
+          - generic-active-host-custom
+        groups:
+          - web
+      - name: web-02
+        monitoring_server_id: 1
+        address: 10.0.0.2
+        templates:
+          - generic-active-host-custom
+        groups:
+          - web
+      - name: old-web
+        state: delete
+
+- name: Add the hosts to a group
+  parnoud.centreon.manage_hosts:
+    state: update
+    hostname: centreon.com/centreon/api/latest
+    username: user
+    password: pass
+    hosts:
+      - name: web-01
+        groups:
+          - linux
+      - name: web-02
+        groups:
+          - linux
+'''
+
+RETURN = r'''
+---
+results:
+    description: Result of each host, in the order of O(hosts).
+    returned: always
+    type: list
+    elements: dict
+    contains:
+        name:
+            description: Host name.
+            type: str
+        state:
+            description: State applied to the host.
+            type: str
+        id:
+            description: Host id, missing when the host does not exist.
+            type: int
+        changed:
+            description: Whether the host was changed.
+            type: bool
+        failed:
+            description: Whether the host could not be managed.
+            type: bool
+        msg:
+            description: Error of a failed host.
+            type: str
+        diff:
+            description: Changed fields of the host, in diff mode.
+            type: dict
+    sample:
+        [
+            {
+                "name": "web-01",
+                "state": "create",
+                "id": 12,
+                "changed": true,
+                "failed": false
+            },
+            {
+                "name": "old-web",
+                "state": "delete",
+                "changed": false,
+                "failed": false
+            }
+        ]
+'''
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
+from ansible_collections.parnoud.centreon.plugins.module_utils.host import (
+    complete_host_configuration,
+    create_host_configuration,
+    delete_host_configuration,
+    diff_host_configuration,
+    iter_host_configurations,
+    merge_host_relations,
+    normalize_host_configuration,
+    partially_update_host_configuration
+)
+from ansible_collections.parnoud.centreon.plugins.module_utils.host_group import list_all_host_groups
+from ansible_collections.parnoud.centreon.plugins.module_utils.host_template import find_all_host_template_configurations
+from ansible_collections.parnoud.centreon.plugins.module_utils.name_resolver import find_ids_by_name, ids_from_matches
+from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec, host_argument_spec
+
+STATES = ['create', 'delete', 'update', 'replace']
+
+# Relations given by name, with the function listing them and the label of their errors.
+NAMED_RELATIONS = {
+    'groups': (list_all_host_groups, 'Host groups'),
+    'templates': (find_all_host_template_configurations, 'Host templates'),
+}
+
+
+def find_relation_ids(api, hosts: list) -> dict:
+    """Return the ids matching the group and template names of all the hosts, searched once per kind."""
+    matches = {}
+    for key, (list_function, label) in NAMED_RELATIONS.items():
+        names = list(dict.fromkeys(
+            value for host in hosts for value in host.get(key) or [] if isinstance(value, str)
+        ))
+        matches[key] = find_ids_by_name(list_function, api, names) if names else {}
+    return matches
+
+
+def build_host_data(host: dict, matches: dict) -> tuple:
+    """Return the payload of a host with its names replaced by ids, and the resolution errors."""
+    host_data = {key: host[key] for key in host_argument_spec() if host.get(key) is not None}
+    host_data['name'] = host['name']
+
+    errors = []
+    for key, (list_function, label) in NAMED_RELATIONS.items():
+        if host_data.get(key):
+            host_data[key], relation_errors = ids_from_matches(matches[key], host_data[key], label)
+            errors.extend(relation_errors)
+    return host_data, errors
+
+
+def complete_host(api, host: dict, current: dict) -> dict:
+    """Return the listed host, with its details when the given fields are not all listed."""
+    fields = [key for key in host_argument_spec() if host.get(key) is not None]
+    return complete_host_configuration(api, current, fields)
+
+
+def plan_host(host: dict, current: dict, host_data: dict) -> tuple:
+    """Return the result of a host and the request bringing it to its state, or None when there is nothing to send."""
+    state = host['state']
+    result = {'name': host['name'], 'state': state, 'changed': False, 'failed': False}
+    if current is not None:
+        result['id'] = current['id']
+
+    if state == 'create':
+        if current is not None:
+            return result, None
+        result.update(changed=True, diff={'before': {}, 'after': host_data})
+        return result, ('create', host_data)
+
+    if state == 'delete':
+        if current is None:
+            return result, None
+        result.update(changed=True, diff={'before': normalize_host_configuration(current), 'after': {}})
+        return result, ('delete', None)
+
+    if current is None:
+        result.update(failed=True, msg=f"Host {host['name']} not found for {state}.")
+        return result, None
+
+    host_data.pop('name')
+    if host.get('new_name'):
+        host_data['name'] = host['new_name']
+
+    current_host_data = normalize_host_configuration(current)
+    if state == 'update':
+        merge_host_relations(host_data, current_host_data)
+
+    before, after = diff_host_configuration(host_data, current_host_data)
+    if not after:
+        return result, None
+    result.update(changed=True, diff={'before': before, 'after': after})
+    return result, ('patch', after)
+
+
+def send_host_request(api, result: dict, request: tuple) -> dict:
+    """Send the request of one host and record its outcome in its result."""
+    action, host_data = request
+    try:
+        if action == 'create':
+            result['id'] = create_host_configuration(api, host_data=host_data).get('id')
+        elif action == 'patch':
+            partially_update_host_configuration(api, result['id'], host_data)
+        else:
+            delete_host_configuration(api, result['id'])
+    except Exception as e:
+        result.pop('diff', None)
+        result.update(changed=False, failed=True, msg=str(e))
+    return result
+
+
+def manage_hosts(module):
+    """entry point for module execution"""
+
+    api = centreon_api_from_module(module)
+
+    hosts = [dict(host, state=host['state'] or module.params['state']) for host in module.params['hosts']]
+
+    seen = set()
+    duplicates = []
+    for host in hosts:
+        if host['name'] in seen:
+            duplicates.append(host['name'])
+        seen.add(host['name'])
+    if duplicates:
+        return False, f"Hosts listed more than once: {', '.join(dict.fromkeys(duplicates))}"
+
+    existing = {}
+    for current in iter_host_configurations(api):
+        if current['name'] in seen:
+            existing[current['name']] = current
+
+    matches = find_relation_ids(api, [host for host in hosts if host['state'] != 'delete'])
+
+    # The hosts updated with fields that the listing does not return are read one by one.
+    updated = [host for host in hosts if host['state'] in ('update', 'replace') and host['name'] in existing]
+    if updated:
+        with ThreadPoolExecutor(max_workers=module.params['max_workers']) as executor:
+            for host, current in zip(updated, executor.map(lambda host: complete_host(api, host, existing[host['name']]), updated)):
+                existing[host['name']] = current
+
+    results = []
+    requests = []
+    for host in hosts:
+        host_data, errors = build_host_data(host, matches)
+        if errors and host['state'] != 'delete':
+            results.append({'name': host['name'], 'state': host['state'], 'changed': False, 'failed': True, 'msg': '. '.join(errors)})
+            continue
+
+        result, request = plan_host(host, existing.get(host['name']), host_data)
+        results.append(result)
+        if request is not None:
+            requests.append((result, request))
+
+    if requests and not module.check_mode:
+        with ThreadPoolExecutor(max_workers=module.params['max_workers']) as executor:
+            list(executor.map(lambda item: send_host_request(api, *item), requests))
+
+    return True, results
+
+
+def module_argument_spec():
+    """Return the argument spec of the module."""
+    host_options = dict(
+        state=dict(type='str', choices=STATES, default=None),
+        name=dict(type='str', required=True),
+        new_name=dict(type='str', default=None),
+    )
+    host_options.update(host_argument_spec())
+
+    argument_spec = base_argument_spec()
+    argument_spec.update(
+        state=dict(type='str', choices=STATES, default='create'),
+        max_workers=dict(type='int', default=4),
+        hosts=dict(type='list', elements='dict', required=True, options=host_options),
+    )
+    return argument_spec
+
+
+def run_module(module):
+    """Run the module and exit with its result."""
+    return_type, data = manage_hosts(module)
+    if not return_type:
+        module.fail_json(msg=data)
+
+    if not module._diff:
+        for result in data:
+            result.pop('diff', None)
+
+    changed = any(result['changed'] for result in data)
+    failed = [result for result in data if result['failed']]
+    if failed:
+        module.fail_json(msg=f"{len(failed)} of {len(data)} hosts failed", changed=changed, results=data)
+    module.exit_json(changed=changed, results=data)
+
+
+def main():
+    module = CentreonModule(
+        argument_spec=module_argument_spec(),
+        supports_check_mode=True
+    )
+    run_module(module)
+
+
+if __name__ == '__main__':
+    main()
@@ -39,8 +39,8 @@ result:
 '''
 
 
-from ansible.module_utils.basic import AnsibleModule
-from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import centreon_api_from_module
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_module import CentreonModule
 from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
 from ansible_collections.parnoud.centreon.plugins.module_utils.monitoring_server import reload_configuration_all_monitoring_server
 
@@ -48,14 +48,7 @@ from ansible_collections.parnoud.centreon.plugins.module_utils.monitoring_server
 def _reload_configuration_all_monitoring_server(module):
     """entry point for module execution"""
 
-    api = CentreonAPI(
-        hostname=module.params.get('hostname'),
-        token=module.params.get('token'),
-        username=module.params.get('username'),
-        password=module.params.get('password'),
-        validate_certs=module.params.get('validate_certs'),
-        timeout=module.params.get('timeout'),
-    )
+    api = centreon_api_from_module(module)
 
     if reload_configuration_all_monitoring_server(api):
         return True, 'OK'
@@ -65,7 +58,7 @@ def _reload_configuration_all_monitoring_server(module):
 
 def main():
     argument_spec = base_argument_spec()
-    module = AnsibleModule(
+    module = CentreonModule(
         argument_spec=argument_spec,
         supports_check_mode=True
     )
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import hashlib
+import traceback
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.module_utils.common.parameters import remove_values
+from ansible.plugins.action import ActionBase
+from ansible_collections.parnoud.centreon.plugins.module_utils.argument_spec import base_argument_spec
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import (
+    ANOTHER_LIBRARY_IMPORT_ERROR,
+    centreon_api_from_module
+)
+
+LOCAL_CONNECTIONS = ('local', 'ansible.builtin.local', 'ansible.legacy.local')
+
+# Clients kept by the worker process, so the items of a looped task share one login and connection pool.
+_CLIENTS = {}
+
+
+class ControllerModuleExit(Exception):
+    """Raised by ControllerModule.exit_json and fail_json to stop the module with its result."""
+
+    def __init__(self, result: dict):
+        super(ControllerModuleExit, self).__init__()
+        self.result = result
+
+
+class ControllerModule:
+    """Subset of AnsibleModule used by the modules of this collection, run on the controller."""
+
+    def __init__(self, params: dict, check_mode: bool = False, diff: bool = False):
+        self.params = params
+        self.check_mode = check_mode
+        self._diff = diff
+        self.centreon_api = None
+        self._socket_path = None
+        self._warnings = []
+        self._retries_before = 0
+
+    def use_api(self, api):
+        """Hand over a client, only counting the retries it does from now on."""
+        self.centreon_api = api
+        self._retries_before = api.retry_count
+
+    def warn(self, warning: str):
+        self._warnings.append(warning)
+
+    def exit_json(self, **kwargs):
+        kwargs.setdefault('changed', False)
+        if self.centreon_api is not None:
+            kwargs.setdefault('api_retries', self.centreon_api.retry_count - self._retries_before)
+        if self._warnings:
+            kwargs['warnings'] = self._warnings
+        raise ControllerModuleExit(kwargs)
+
+    def fail_json(self, msg: str = None, **kwargs):
+        kwargs['failed'] = True
+        if msg is not None:
+            kwargs['msg'] = msg
+        self.exit_json(**kwargs)
+
+
+class CentreonActionBase(ActionBase):
+    """Run an API only module of this collection inside the controller process.
+
+    Modules of this collection only talk HTTP to Centreon, so when the task runs on the
+    controller there is no need to package them with AnsiballZ and start a new interpreter.
+    Subclasses set MODULE to the module to run. Tasks that cannot run in process fall back
+    to the regular module execution.
+    """
+
+    MODULE = None
+
+    # Async tasks fall back to the regular module execution, which wraps them.
+    _supports_async = True
+
+    def _runs_in_process(self) -> bool:
+        """Return whether the module can run in the controller process."""
+        return (
+            ANOTHER_LIBRARY_IMPORT_ERROR is None
+            and self._connection.transport in LOCAL_CONNECTIONS
+            and not any(self._task.environment or [])
+            and not self._task.async_val
+        )
+
+    @staticmethod
+    def _client_key(params: dict) -> tuple:
+        """Return the key identifying a client built from the connection parameters."""
+        key = []
+        for name in sorted(base_argument_spec()):
+            value = params.get(name)
+            if name in ('password', 'token') and value is not None:
+                value = hashlib.sha256(str(value).encode('utf-8')).hexdigest()
+            key.append((name, value))
+        return tuple(key)
+
+    def _cached_client(self, module: ControllerModule):
+        """Return the client for the module parameters, reusing the one built by a previous item."""
+        key = self._client_key(module.params)
+        if key not in _CLIENTS:
+            _CLIENTS[key] = centreon_api_from_module(module)
+        return _CLIENTS[key]
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(CentreonActionBase, self).run(tmp, task_vars)
+
+        if not self._runs_in_process():
+            wrap_async = self._task.async_val and not self._connection.has_native_async
+            result.update(self._execute_module(task_vars=task_vars, wrap_async=wrap_async))
+            if not wrap_async:
+                self._remove_tmp_path(self._connection._shell.tmpdir)
+            return result
+
+        argument_spec = self.MODULE.module_argument_spec()
+        validation = ArgumentSpecValidator(argument_spec).validate(self._task.args)
+        params = validation.validated_parameters
+        no_log_values = set(
+            str(params[name]) for name, spec in argument_spec.items()
+            if spec.get('no_log') and params.get(name) is not None
+        )
+
+        if validation.error_messages:
+            result.update(failed=True, msg=remove_values(', '.join(validation.error_messages), no_log_values))
+            return result
+
+        module = ControllerModule(params, check_mode=self._task.check_mode, diff=self._task.diff)
+        try:
+            module.use_api(self._cached_client(module))
+            self.MODULE.run_module(module)
+            module.fail_json(msg=f"{self._task.action} did not return a result")
+        except ControllerModuleExit as exit_result:
+            result.update(exit_result.result)
+        except Exception as e:
+            result.update(failed=True, msg=str(e), exception=traceback.format_exc())
+
+        return remove_values(result, no_log_values)
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.plugins.loader import init_plugin_loader
+
+from .support.fake_centreon import FakeCentreon
+
+FAKE_CENTREON_SCRIPT = os.path.join(os.path.dirname(__file__), 'support', 'fake_centreon.py')
+
+
+def pytest_configure(config):
+    """Load the plugins of the collection from the ansible_collections tree found in the Python path.
+
+    pytest-ansible already does it when it is installed, this covers a plain pytest run.
+    """
+    roots = [path for path in sys.path if os.path.isdir(os.path.join(path, 'ansible_collections', 'parnoud', 'centreon'))]
+    init_plugin_loader(roots[:1])
+
+
+@pytest.fixture
+def fake_centreon():
+    """Fake Centreon API served from a thread of the test process, empty but for the central server."""
+    with FakeCentreon(seed=0) as server:
+        yield server
+
+
+@pytest.fixture
+def fake_centreon_factory():
+    """Start more fake Centreon API servers in threads, for tests talking to several centrals.
+
+    The fixture is a function taking the FakeCentreon arguments and returning the started server.
+    """
+    servers = []
+
+    def start(**options) -> FakeCentreon:
+        server = FakeCentreon(**options).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.stop()
+
+
+@pytest.fixture
+def fake_centreon_process():
+    """Start fake Centreon API servers in their own processes and return their URL.
+
+    The fixture is a function taking the command line options of tests/support/fake_centreon.py,
+    the servers are stopped at the end of the test.
+    """
+    processes = []
+
+    def start(*options) -> str:
+        process = subprocess.Popen([sys.executable, FAKE_CENTREON_SCRIPT, *options],
+                                   stdout=subprocess.PIPE, text=True)
+        processes.append(process)
+        url = process.stdout.readline().strip()
+        if not url:
+            raise RuntimeError(f"The fake Centreon server exited with code {process.wait()}")
+        return url
+
+    yield start
+
+    for process in processes:
+        process.terminate()
+        process.wait()
+
+
+@pytest.fixture
+def run_module(fake_centreon):
+    """Run a module of the collection in process against fake_centreon and return its result.
+
+    The fixture is a function taking the module, its check_mode and diff flags and its
+    parameters, the connection parameters of the server being added to them.
+    """
+    # Imported once pytest_configure set up the collection loader.
+    from ansible_collections.parnoud.centreon.plugins.plugin_utils.centreon_action import ControllerModule, ControllerModuleExit
+
+    def run(module, check_mode: bool = False, diff: bool = False, **params) -> dict:
+        validation = ArgumentSpecValidator(module.module_argument_spec()).validate(fake_centreon.module_params(**params))
+        with pytest.raises(ControllerModuleExit) as exit_result:
+            module.run_module(ControllerModule(validation.validated_parameters, check_mode=check_mode, diff=diff))
+        return exit_result.value.result
+
+    return run
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+"""Measure the time taken by the inventory plugin to add the hosts of the API to an inventory.
+
+The hosts are generated as the configuration/hosts listing returns them, decoded from JSON
+pages of 1000 hosts, then given all at once to InventoryModule._populate with an empty
+InventoryData, so that only the population is timed::
+
+    PYTHONPATH=/path/to/collections python -m tests.perf.bench_inventory --hosts 100000
+
+With --tracemalloc, the pages are decoded while the inventory is populated, as they are
+when read from the API, and the memory still allocated once the pages are released is
+reported with the peak.
+
+where /path/to/collections contains ansible_collections/parnoud/centreon. Running it on two
+checkouts compares their timings.
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from ansible.inventory.data import InventoryData
+from ansible.plugins.loader import init_plugin_loader, inventory_loader
+
+PAGE_SIZE = 1000
+
+
+def iter_hosts(hosts: int, templates: int, groups: int, categories: int, seed: int = 0):
+    """Yield hosts as listed by configuration/hosts, each page being decoded from JSON."""
+    generator = random.Random(seed)
+    for start in range(0, hosts, PAGE_SIZE):
+        page = []
+        for index in range(start, min(hosts, start + PAGE_SIZE)):
+            page.append({
+                'id': index + 1,
+                'name': f'host-{index:06d}',
+                'alias': f'Host {index}',
+                'address': f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}',
+                'monitoring_server': {'id': index % 20 + 1, 'name': f'poller-{index % 20:02d}'},
+                'templates': [{'id': item, 'name': f'template-{item:02d}'} for item in generator.sample(range(50), templates)],
+                'groups': [{'id': item, 'name': f'hostgroup-{item:03d}'} for item in generator.sample(range(500), groups)],
+                'categories': [{'id': item, 'name': f'category-{item:02d}'} for item in generator.sample(range(30), categories)],
+                'normal_check_interval': 5,
+                'retry_check_interval': 1,
+                'check_timeperiod': {'id': 1, 'name': '24x7'},
+                'severity': {'id': 1, 'name': 'critical'},
+                'is_activated': True,
+            })
+        yield from json.loads(json.dumps(page))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the population of the inventory with generated hosts.')
+    parser.add_argument('--hosts', type=int, default=10000, help='number of hosts to generate')
+    parser.add_argument('--templates', type=int, default=3, help='templates of each host')
+    parser.add_argument('--groups', type=int, default=5, help='host groups of each host')
+    parser.add_argument('--categories', type=int, default=2, help='categories of each host')
+    parser.add_argument('--tracemalloc', action='store_true', help='report the memory of the inventory')
+    args = parser.parse_args()
+
+    init_plugin_loader()
+    plugin = inventory_loader.get('parnoud.centreon.centreon_inventory_host')
+    plugin.set_options()
+    hosts = iter_hosts(args.hosts, args.templates, args.groups, args.categories)
+    if not args.tracemalloc:
+        hosts = list(hosts)
+
+    gc.collect()
+    if args.tracemalloc:
+        tracemalloc.start()
+    plugin.inventory = InventoryData()
+    start = time.perf_counter()
+    count = plugin._populate(hosts)
+    elapsed = time.perf_counter() - start
+
+    if args.tracemalloc:
+        # The time is not reported, tracemalloc slowing the population down several times.
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        print(f'{count} hosts, {len(plugin.inventory.groups)} groups: current {current / 2 ** 20:.0f} MiB, peak {peak / 2 ** 20:.0f} MiB')
+    else:
+        print(f'{count} hosts, {len(plugin.inventory.groups)} groups: {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,998 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+"""In memory Centreon API v2 server to exercise the collection offline.
+
+The server implements the endpoints used by the modules and the inventory plugin, the
+search and sort_by query parameters, the pagination meta and the token authentication.
+Latency, server errors and throttling can be injected to measure the client behaviour.
+
+It runs in a thread of the current process::
+
+    with FakeCentreon() as server:
+        server.populate(hosts=10000)
+        api = CentreonAPI(hostname=server.url, username='admin', password='centreon')
+
+or as a separate process, printing its URL on the first line of its output::
+
+    python tests/support/fake_centreon.py --hosts 10000 --latency 0.02
+
+The faults of a running server can be changed with a POST of a JSON object on
+/_fake/faults, its request counters are returned by /_fake/stats.
+"""
+
+import argparse
+import bisect
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+DEFAULT_API_PATH = '/centreon/api/latest'
+
+HOST_REFERENCES = {
+    'monitoring_server': 'monitoring_servers',
+    'check_timeperiod': 'timeperiods',
+    'notification_timeperiod': 'timeperiods',
+    'severity': 'host_severities',
+}
+HOST_RELATIONS = {
+    'templates': 'host_templates',
+    'categories': 'host_categories',
+    'groups': 'host_groups',
+}
+
+# Search parameter names accepted by Centreon on top of the fields of the listings.
+SEARCH_ALIASES = {
+    'poller.id': 'monitoring_server.id',
+    'poller.name': 'monitoring_server.name',
+    'group.id': 'groups.id',
+    'group.name': 'groups.name',
+    'category.id': 'categories.id',
+    'category.name': 'categories.name',
+    'template.id': 'templates.id',
+    'template.name': 'templates.name',
+}
+
+HOST_STATUSES = {0: 'UP', 1: 'DOWN', 2: 'UNREACHABLE', 4: 'PENDING'}
+HOST_STATUS_SEVERITIES = {0: 5, 1: 1, 2: 2, 4: 4}
+
+
+class ApiError(Exception):
+    """Raised by the handlers to answer with an error status and message."""
+
+    def __init__(self, code: int, message: str):
+        super(ApiError, self).__init__(message)
+        self.code = code
+        self.message = message
+
+
+# SEARCH
+
+def _like_pattern(value) -> re.Pattern:
+    """Return the regular expression of a SQL LIKE pattern."""
+    pattern = ''.join('.*' if char == '%' else '.' if char == '_' else re.escape(char) for char in str(value))
+    return re.compile(f'^{pattern}$', re.IGNORECASE | re.DOTALL)
+
+
+def _folded(value):
+    """Return a value compared like MySQL does with its case insensitive collations."""
+    return value.casefold() if isinstance(value, str) else value
+
+
+def _compare(value, operator: str, operand) -> bool:
+    """Return whether one value of a field matches a positive search operator."""
+    if operator == '$eq':
+        return _folded(value) == _folded(operand)
+    if operator == '$in':
+        return _folded(value) in [_folded(item) for item in operand]
+    if operator == '$lk':
+        return value is not None and bool(_like_pattern(operand).match(str(value)))
+    if operator == '$rg':
+        return value is not None and re.search(operand, str(value), re.IGNORECASE) is not None
+    if value is None or operand is None:
+        return False
+    try:
+        if operator == '$lt':
+            return value < operand
+        if operator == '$le':
+            return value <= operand
+        if operator == '$gt':
+            return value > operand
+        if operator == '$ge':
+            return value >= operand
+    except TypeError:
+        raise ApiError(400, f"Value {json.dumps(operand)} cannot be compared with {operator}")
+    raise ApiError(400, f"Unknown search operator {operator}")
+
+
+NEGATED_OPERATORS = {'$neq': '$eq', '$ni': '$in', '$nk': '$lk'}
+
+
+def _matches_field(values: list, condition) -> bool:
+    """Return whether the values of a field match a condition, any value matching for a relation."""
+    if not isinstance(condition, dict):
+        condition = {'$eq': condition}
+    for operator, operand in condition.items():
+        if operator in ('$in', '$ni') and not isinstance(operand, list):
+            raise ApiError(400, f"The value of {operator} must be an array")
+        if operator in NEGATED_OPERATORS:
+            matched = not any(_compare(value, NEGATED_OPERATORS[operator], operand) for value in values)
+        else:
+            matched = any(_compare(value, operator, operand) for value in values)
+        if not matched:
+            return False
+    return True
+
+
+def matches_search(fields: dict, search) -> bool:
+    """Return whether a record, given as its flattened fields, matches a Centreon search expression.
+
+    A list or an object with several keys requires all of its conditions, $and and $or
+    combine the expressions of their list.
+    """
+    if isinstance(search, list):
+        return all(matches_search(fields, item) for item in search)
+    if not isinstance(search, dict):
+        raise ApiError(400, 'The search parameter must be an object or an array')
+    for key, value in search.items():
+        if key in ('$and', '$or'):
+            if not isinstance(value, list):
+                raise ApiError(400, f"The value of {key} must be an array")
+            results = (matches_search(fields, item) for item in value)
+            if not (all(results) if key == '$and' else any(results)):
+                return False
+            continue
+        # A field missing from a record, such as groups.id for a host without group, has no value.
+        if not _matches_field(fields.get(SEARCH_ALIASES.get(key, key), []), value):
+            return False
+    return True
+
+
+def flatten_record(record: dict) -> dict:
+    """Return the searchable fields of a listed record, each one as the list of its values.
+
+    Objects give dotted names, such as monitoring_server.id, and lists of objects give the
+    values of all their items, such as groups.name.
+    """
+    fields = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                fields[f'{key}.{sub_key}'] = [sub_value]
+        elif isinstance(value, list):
+            for item in value:
+                for sub_key, sub_value in (item.items() if isinstance(item, dict) else ()):
+                    fields.setdefault(f'{key}.{sub_key}', []).append(sub_value)
+            fields[key] = value
+        else:
+            fields[key] = [value]
+    return fields
+
+
+def id_lower_bound(search):
+    """Return the id all the matching records are above, from an id $gt condition required by search.
+
+    This lets a listing skip the records before a keyset cursor like an index on id does.
+    """
+    conditions = search if isinstance(search, list) else [search]
+    bounds = []
+    for condition in conditions:
+        if not isinstance(condition, dict):
+            continue
+        if isinstance(condition.get('$and'), list):
+            bounds.append(id_lower_bound(condition['$and']))
+        if isinstance(condition.get('id'), dict) and isinstance(condition['id'].get('$gt'), int):
+            bounds.append(condition['id']['$gt'])
+    return max((bound for bound in bounds if bound is not None), default=None)
+
+
+def sort_records(records: list, sort_by: dict) -> list:
+    """Return the records ordered by the fields of a sort_by object, the first field first."""
+    records = list(records)
+    for key, direction in reversed(list(sort_by.items())):
+        if str(direction).upper() not in ('ASC', 'DESC'):
+            raise ApiError(400, f"Unknown sort direction {direction}")
+        name = SEARCH_ALIASES.get(key, key)
+
+        def sort_key(item, name=name):
+            values = item[0].get(name)
+            value = _folded(values[0]) if values else None
+            return (value is not None, value)
+
+        records.sort(key=sort_key, reverse=str(direction).upper() == 'DESC')
+    return records
+
+
+# SERVER
+
+class FakeCentreon:
+    """Centreon API v2 server holding its configuration in memory.
+
+    username and password are the only valid credentials. latency is the delay added to every
+    API request, in seconds, or a (min, max) tuple for a random delay. error_rate and
+    throttle_rate are the fractions of the authenticated requests answered with a 503 or a
+    429 carrying a Retry-After of retry_after seconds. max_limit caps the page size like a
+    server refusing large pages does.
+    """
+
+    def __init__(self,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 api_path: str = DEFAULT_API_PATH,
+                 username: str = 'admin',
+                 password: str = 'centreon',
+                 latency=0.0,
+                 error_rate: float = 0.0,
+                 throttle_rate: float = 0.0,
+                 retry_after: int = 1,
+                 max_limit: int = None,
+                 seed: int = None):
+        self.host = host
+        self.port = port
+        self.api_path = api_path.rstrip('/')
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.max_limit = max_limit
+        self.random = random.Random(seed)
+        self.lock = threading.RLock()
+        self.tokens = set()
+        self.stats = Counter()
+        self._version = 0
+        self._listings = {}
+        self._failures = []
+        self._server = None
+        self._thread = None
+        self.reset()
+
+    # Data
+
+    def reset(self):
+        """Remove all the configuration but the central monitoring server and the default timeperiods."""
+        with self.lock:
+            self.data = {
+                'hosts': {},
+                'host_groups': {},
+                'host_categories': {},
+                'host_severities': {},
+                'host_templates': {},
+                'service_categories': {},
+                'monitoring_servers': {},
+                'timeperiods': {},
+            }
+            self.statuses = {}
+            self._ids = Counter()
+            self.changed()
+            self.add('monitoring_servers', name='Central', address='127.0.0.1', is_localhost=True, is_default=True)
+            for name in ('24x7', 'none', 'nonworkhours', 'workhours'):
+                self.add('timeperiods', name=name, alias=name)
+
+    def changed(self):
+        """Forget the listings built before a change of the data."""
+        with self.lock:
+            self._version += 1
+            self._listings.clear()
+
+    def count(self, key: str):
+        """Increment a request counter of the stats."""
+        with self.lock:
+            self.stats[key] += 1
+
+    def add(self, collection: str, **fields) -> dict:
+        """Store a record in a collection with the next id and return it."""
+        with self.lock:
+            self.changed()
+            self._ids[collection] += 1
+            record = dict({'id': self._ids[collection]}, **DEFAULTS.get(collection, {}))
+            record.update({key: value for key, value in fields.items() if key != 'id'})
+            self.data[collection][record['id']] = record
+            return record
+
+    def add_host(self, **fields) -> dict:
+        """Store a host, by default on the central server, and give it an UP real-time status."""
+        fields.setdefault('monitoring_server_id', 1)
+        fields.setdefault('alias', fields.get('name'))
+        for key in HOST_RELATIONS:
+            fields[key] = list(fields.get(key) or [])
+        host = self.add('hosts', **fields)
+        self.set_host_status(host['id'], 0)
+        self._mark_updated(host)
+        return host
+
+    def set_host_status(self, host_id: int, code: int, in_downtime: bool = False, acknowledged: bool = False):
+        """Set the real-time status of a host returned by monitoring/hosts."""
+        with self.lock:
+            self.changed()
+            self.statuses[host_id] = {
+                'code': code,
+                'in_downtime': in_downtime,
+                'acknowledged': acknowledged,
+                'last_check': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            }
+
+    def populate(self,
+                 hosts: int = 1000,
+                 monitoring_servers: int = 3,
+                 host_groups: int = 50,
+                 host_categories: int = 10,
+                 host_severities: int = 4,
+                 host_templates: int = 10):
+        """Add a realistic configuration, each host having a template, groups and maybe a category or severity."""
+        with self.lock:
+            pollers = list(self.data['monitoring_servers'])
+            for index in range(monitoring_servers - len(pollers)):
+                pollers.append(self.add('monitoring_servers', name=f'poller-{index + 1:02d}',
+                                        address=f'10.0.{index}.1')['id'])
+            groups = [self.add('host_groups', name=f'hostgroup-{index:03d}', alias=f'Host group {index}')['id']
+                      for index in range(host_groups)]
+            categories = [self.add('host_categories', name=f'category-{index:02d}', alias=f'Category {index}')['id']
+                          for index in range(host_categories)]
+            severities = [self.add('host_severities', name=f'severity-{index}', alias=f'Severity {index}', level=index + 1)['id']
+                          for index in range(host_severities)]
+            templates = [self.add('host_templates', name=f'template-{index:02d}', alias=f'Template {index}')['id']
+                         for index in range(host_templates)]
+
+            start = len(self.data['hosts'])
+            for index in range(start, start + hosts):
+                host = self.add_host(
+                    name=f'host-{index:06d}',
+                    alias=f'Host {index}',
+                    address=f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}',
+                    monitoring_server_id=pollers[index % len(pollers)],
+                    check_timeperiod_id=1,
+                    severity_id=severities[index % len(severities)] if severities and index % 3 == 0 else None,
+                    normal_check_interval=5,
+                    retry_check_interval=1,
+                    templates=templates[index % len(templates):index % len(templates) + 1],
+                    groups=self.random.sample(groups, min(len(groups), 2)),
+                    categories=categories[index % len(categories):index % len(categories) + 1] if categories and index % 2 else [],
+                    is_activated=index % 50 != 0,
+                )
+                code = self.random.choices(list(HOST_STATUSES), weights=(90, 6, 2, 2))[0]
+                self.set_host_status(host['id'], code, in_downtime=code != 0 and self.random.random() < 0.2)
+            for poller_id in pollers:
+                self.data['monitoring_servers'][poller_id]['is_updated'] = False
+
+    def _mark_updated(self, host: dict):
+        """Flag the monitoring server of a host as having configuration changes to export."""
+        poller = self.data['monitoring_servers'].get(host.get('monitoring_server_id'))
+        if poller is not None:
+            poller['is_updated'] = True
+
+    # Faults
+
+    def fail_next(self, code: int, count: int = 1):
+        """Answer the next count authenticated requests with the given status code."""
+        with self.lock:
+            self._failures.extend([code] * count)
+
+    def expire_tokens(self):
+        """Revoke every token, as when the sessions expire on the server."""
+        with self.lock:
+            self.tokens.clear()
+
+    def _injected_failure(self):
+        """Return the status code of a failure to inject in the current request, if any."""
+        with self.lock:
+            if self._failures:
+                return self._failures.pop(0)
+            if self.throttle_rate and self.random.random() < self.throttle_rate:
+                return 429
+            if self.error_rate and self.random.random() < self.error_rate:
+                return 503
+        return None
+
+    def _delay(self) -> float:
+        """Return the latency of the current request."""
+        if isinstance(self.latency, (list, tuple)):
+            return self.random.uniform(*self.latency)
+        return self.latency or 0.0
+
+    # Lifecycle
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the API, to use as hostname of the modules and plugins."""
+        return f"http://{self.host}:{self.port}{self.api_path}"
+
+    def start(self):
+        """Serve the API from a background thread."""
+        handler = type('FakeCentreonHandler', (FakeCentreonHandler,), {'fake': self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05},
+                                        name='fake-centreon', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the listening socket."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def module_params(self, **params) -> dict:
+        """Return the connection parameters of a module talking to this server."""
+        return dict(hostname=self.url, username=self.username, password=self.password, **params)
+
+    # Rendering
+
+    def _reference(self, collection: str, record_id):
+        """Return the id and name of a referenced record, or None."""
+        record = self.data[collection].get(record_id)
+        return {'id': record['id'], 'name': record['name']} if record else None
+
+    def render_host(self, host: dict) -> dict:
+        """Return a host as listed by configuration/hosts."""
+        rendered = {
+            'id': host['id'],
+            'name': host['name'],
+            'alias': host.get('alias'),
+            'address': host.get('address'),
+        }
+        for key, collection in HOST_REFERENCES.items():
+            rendered[key] = self._reference(collection, host.get(f'{key}_id'))
+        rendered['normal_check_interval'] = host.get('normal_check_interval')
+        rendered['retry_check_interval'] = host.get('retry_check_interval')
+        for key, collection in HOST_RELATIONS.items():
+            rendered[key] = [self._reference(collection, item) for item in host.get(key, [])
+                             if item in self.data[collection]]
+        rendered['is_activated'] = host.get('is_activated', True)
+        return rendered
+
+    def render_host_detail(self, host: dict) -> dict:
+        """Return a host as returned by configuration/hosts/{id}, with all its fields."""
+        rendered = {key: value for key, value in host.items() if key not in HOST_RELATIONS}
+        for key, collection in HOST_RELATIONS.items():
+            rendered[key] = [self._reference(collection, item) for item in host.get(key, [])
+                             if item in self.data[collection]]
+        return rendered
+
+    def host_group_counts(self) -> dict:
+        """Return the number of enabled and disabled hosts of each host group, by group id."""
+        counts = {}
+        for host in self.data['hosts'].values():
+            for group_id in host['groups']:
+                counts.setdefault(group_id, [0, 0])[0 if host.get('is_activated', True) else 1] += 1
+        return counts
+
+    def render_host_group(self, group: dict, counts: dict = None) -> dict:
+        """Return a host group with its icon and the number of its enabled and disabled hosts."""
+        enabled, disabled = (counts if counts is not None else self.host_group_counts()).get(group['id'], (0, 0))
+        rendered = {key: value for key, value in group.items() if key != 'icon_id'}
+        rendered['icon'] = {'id': group['icon_id'], 'name': f"icon-{group['icon_id']}", 'url': None} if group.get('icon_id') else None
+        rendered['enabled_hosts_count'] = enabled
+        rendered['disabled_hosts_count'] = disabled
+        return rendered
+
+    def render_host_monitoring(self, host: dict) -> dict:
+        """Return the real-time status of a host as listed by monitoring/hosts."""
+        status = self.statuses.get(host['id']) or {'code': 4, 'in_downtime': False, 'acknowledged': False, 'last_check': None}
+        poller = self.data['monitoring_servers'].get(host.get('monitoring_server_id')) or {}
+        return {
+            'id': host['id'],
+            'type': 'host',
+            'name': host['name'],
+            'alias': host.get('alias'),
+            'fqdn': host.get('address'),
+            'monitoring_server_name': poller.get('name'),
+            'status': {
+                'code': status['code'],
+                'name': HOST_STATUSES.get(status['code']),
+                'severity_code': HOST_STATUS_SEVERITIES.get(status['code']),
+            },
+            'in_downtime': status['in_downtime'],
+            'acknowledged': status['acknowledged'],
+            'last_check': status['last_check'],
+            'groups': [self._reference('host_groups', item) for item in host['groups'] if item in self.data['host_groups']],
+        }
+
+    # Listing
+
+    def listing(self, name: str, records, query: dict) -> dict:
+        """Return the paginated listing of records, filtered by search and ordered by sort_by.
+
+        records is called to render the records of the listing name, which are kept with their
+        searchable fields until the data changes, so that every page does not render them again.
+        """
+        try:
+            page = int(query.get('page', 1))
+            limit = int(query.get('limit', 10))
+            search = json.loads(query['search']) if query.get('search') else {}
+            sort_by = json.loads(query['sort_by']) if query.get('sort_by') else {}
+        except ValueError as e:
+            raise ApiError(400, f"Invalid query parameter: {e}")
+        if page < 1 or limit < 1:
+            raise ApiError(400, 'page and limit must be positive')
+        if not isinstance(sort_by, dict):
+            raise ApiError(400, 'The sort_by parameter must be an object')
+        if self.max_limit:
+            limit = min(limit, self.max_limit)
+
+        if name not in self._listings:
+            indexed = sorted(((flatten_record(record), record) for record in records()), key=lambda item: item[1]['id'])
+            self._listings[name] = (indexed, [record['id'] for fields, record in indexed])
+        indexed, ids = self._listings[name]
+        lower_bound = id_lower_bound(search)
+        if lower_bound is not None:
+            indexed = indexed[bisect.bisect_right(ids, lower_bound):]
+        if search:
+            indexed = [item for item in indexed if matches_search(item[0], search)]
+        if sort_by and {key: str(value).upper() for key, value in sort_by.items()} != {'id': 'ASC'}:
+            indexed = sort_records(indexed, sort_by)
+
+        return {
+            'result': [record for fields, record in indexed[(page - 1) * limit:page * limit]],
+            'meta': {
+                'page': page,
+                'limit': limit,
+                'search': search,
+                'sort_by': sort_by,
+                'total': len(indexed),
+            },
+        }
+
+
+DEFAULTS = {
+    'hosts': {
+        'address': None,
+        'alias': None,
+        'check_timeperiod_id': None,
+        'notification_timeperiod_id': None,
+        'severity_id': None,
+        'normal_check_interval': None,
+        'retry_check_interval': None,
+        'macros': [],
+        'is_activated': True,
+    },
+    'host_groups': {'alias': None, 'icon_id': None, 'geo_coords': None, 'comment': None, 'is_activated': True},
+    'host_categories': {'alias': None, 'comment': None, 'is_activated': True},
+    'host_severities': {'alias': None, 'level': 1, 'icon_id': 1, 'is_activated': True},
+    'host_templates': {'alias': None, 'is_locked': False},
+    'service_categories': {'alias': None, 'is_activated': True},
+    'monitoring_servers': {
+        'address': None,
+        'is_localhost': False,
+        'is_default': False,
+        'ssh_port': 22,
+        'last_restart': None,
+        'engine_start_command': 'systemctl start centengine',
+        'engine_stop_command': 'systemctl stop centengine',
+        'engine_restart_command': 'systemctl restart centengine',
+        'engine_reload_command': 'systemctl reload centengine',
+        'nagios_bin': '/usr/sbin/centengine',
+        'nagiostats_bin': '/usr/sbin/centenginestats',
+        'broker_reload_command': 'systemctl reload cbd',
+        'centreonbroker_cfg_path': '/etc/centreon-broker',
+        'centreonbroker_module_path': '/usr/share/centreon/lib/centreon-broker',
+        'centreonconnector_path': '/usr/lib64/centreon-connector',
+        'is_updated': False,
+        'is_activated': True,
+    },
+    'timeperiods': {'alias': None},
+}
+
+
+# HANDLERS
+
+class FakeCentreonHandler(BaseHTTPRequestHandler):
+    """HTTP handler routing the requests of the API to the FakeCentreon bound as fake."""
+
+    fake = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, code: int, body=None, headers: dict = None):
+        """Send a JSON response, or an empty one for 204."""
+        payload = b'' if code == 204 or body is None else json.dumps(body).encode('utf-8')
+        self.send_response(code)
+        if payload:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, str(value))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _body(self):
+        """Return the decoded JSON body of the request."""
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError:
+            raise ApiError(400, 'The request body is not valid JSON')
+
+    def _handle(self, method: str):
+        url = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            body = self._body()
+            if url.path.startswith('/_fake/'):
+                return self._send(*self._control(method, url.path[len('/_fake/'):], body))
+            if not url.path.startswith(self.fake.api_path + '/'):
+                raise ApiError(404, 'Not found')
+            endpoint = url.path[len(self.fake.api_path) + 1:].strip('/')
+            self.fake.count('requests')
+            self.fake.count(f'{method} {ROUTE_ID.sub("{id}", endpoint)}')
+
+            delay = self.fake._delay()
+            if delay:
+                time.sleep(delay)
+
+            if endpoint == 'login' and method == 'POST':
+                return self._send(*self._login(body))
+            token = self.headers.get('X-AUTH-TOKEN')
+            if token not in self.fake.tokens:
+                raise ApiError(401, 'Invalid credentials')
+
+            failure = self.fake._injected_failure()
+            if failure == 429:
+                self.fake.count('throttled')
+                return self._send(429, {'code': 429, 'message': 'Too many requests'}, {'Retry-After': self.fake.retry_after})
+            if failure is not None:
+                self.fake.count('failures')
+                return self._send(failure, {'code': failure, 'message': 'Injected failure'})
+
+            if endpoint == 'logout' and method == 'GET':
+                with self.fake.lock:
+                    self.fake.tokens.discard(token)
+                return self._send(200, {'message': 'Successful logout'})
+
+            for pattern, methods in ROUTES:
+                match = pattern.fullmatch(endpoint)
+                if match is None:
+                    continue
+                if method not in methods:
+                    raise ApiError(405, f"Method {method} not allowed")
+                arguments = [int(value) for value in match.groups()]
+                with self.fake.lock:
+                    response = methods[method](self.fake, query, body, *arguments)
+                    if method != 'GET':
+                        self.fake.changed()
+                return self._send(*response)
+            raise ApiError(404, f"No route found for {method} {endpoint}")
+        except ApiError as e:
+            self._send(e.code, {'code': e.code, 'message': e.message})
+
+    def _login(self, body):
+        credentials = ((body or {}).get('security') or {}).get('credentials') or {}
+        if credentials.get('login') != self.fake.username or credentials.get('password') != self.fake.password:
+            raise ApiError(401, 'Authentication failed')
+        token = uuid.uuid4().hex
+        with self.fake.lock:
+            self.fake.tokens.add(token)
+        self.fake.count('logins')
+        return 200, {
+            'contact': {'id': 1, 'name': self.fake.username, 'alias': self.fake.username, 'is_admin': True},
+            'security': {'token': token},
+        }
+
+    def _control(self, method: str, action: str, body):
+        """Answer the requests of the tests and benchmarks driving the server."""
+        if action == 'stats' and method == 'GET':
+            with self.fake.lock:
+                return 200, dict(self.fake.stats)
+        if action == 'stats' and method == 'DELETE':
+            with self.fake.lock:
+                self.fake.stats.clear()
+            return 204, None
+        if action == 'faults' and method == 'POST':
+            for key in ('latency', 'error_rate', 'throttle_rate', 'retry_after', 'max_limit'):
+                if key in (body or {}):
+                    setattr(self.fake, key, body[key])
+            if (body or {}).get('fail_next'):
+                self.fake.fail_next(**body['fail_next'])
+            return 204, None
+        if action == 'populate' and method == 'POST':
+            self.fake.populate(**(body or {}))
+            return 204, None
+        if action == 'expire-tokens' and method == 'POST':
+            self.fake.expire_tokens()
+            return 204, None
+        raise ApiError(404, f"Unknown control {method} {action}")
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_PATCH(self):
+        self._handle('PATCH')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+ROUTE_ID = re.compile(r'(?<=/)\d+(?=/|$)')
+
+
+def _get_record(fake: FakeCentreon, collection: str, record_id: int) -> dict:
+    record = fake.data[collection].get(record_id)
+    if record is None:
+        raise ApiError(404, f"No {collection.replace('_', ' ')} with id {record_id}")
+    return record
+
+
+def _check_name(fake: FakeCentreon, collection: str, body: dict, record_id: int = None):
+    """Reject a body without a name, or with the name of another record of the collection."""
+    if not isinstance(body, dict) or not body.get('name'):
+        raise ApiError(400, 'The property name is required')
+    for record in fake.data[collection].values():
+        if record['id'] != record_id and record['name'].casefold() == body['name'].casefold():
+            raise ApiError(409, f"The name '{body['name']}' already exists")
+
+
+def _check_references(fake: FakeCentreon, body: dict):
+    """Reject a host body referring to a missing monitoring server, timeperiod, severity or relation."""
+    for key, collection in HOST_REFERENCES.items():
+        value = body.get(f'{key}_id')
+        if value is not None and value not in fake.data[collection]:
+            raise ApiError(409, f"The {key} with id {value} does not exist")
+    for key, collection in HOST_RELATIONS.items():
+        missing = [value for value in body.get(key) or [] if value not in fake.data[collection]]
+        if missing:
+            raise ApiError(409, f"The {key} with ids {missing} do not exist")
+
+
+def list_collection(collection: str, render=None):
+    def handler(fake, query, body):
+        render_record = getattr(fake, render) if render else dict
+        return 200, fake.listing(collection, lambda: [render_record(record) for record in fake.data[collection].values()], query)
+    return handler
+
+
+def list_host_groups(fake, query, body):
+    def records():
+        counts = fake.host_group_counts()
+        return [fake.render_host_group(group, counts) for group in fake.data['host_groups'].values()]
+    return 200, fake.listing('host_groups', records, query)
+
+
+def get_record(collection: str, render=None):
+    def handler(fake, query, body, record_id):
+        record = _get_record(fake, collection, record_id)
+        return 200, getattr(fake, render)(record) if render else dict(record)
+    return handler
+
+
+def create_record(collection: str, render=None):
+    def handler(fake, query, body):
+        _check_name(fake, collection, body)
+        record = fake.add(collection, **body)
+        return 201, getattr(fake, render)(record) if render else dict(record)
+    return handler
+
+
+def update_record(collection: str):
+    def handler(fake, query, body, record_id):
+        record = _get_record(fake, collection, record_id)
+        _check_name(fake, collection, body, record_id)
+        record.clear()
+        record.update(dict(DEFAULTS.get(collection, {}), **body), id=record_id)
+        return 204, None
+    return handler
+
+
+def delete_record(collection: str):
+    def handler(fake, query, body, record_id):
+        _get_record(fake, collection, record_id)
+        del fake.data[collection][record_id]
+        return 204, None
+    return handler
+
+
+def create_host(fake, query, body):
+    _check_name(fake, 'hosts', body)
+    if body.get('monitoring_server_id') is None:
+        raise ApiError(400, 'The property monitoring_server_id is required')
+    _check_references(fake, body)
+    return 201, fake.render_host_detail(fake.add_host(**body))
+
+
+def patch_host(fake, query, body, host_id):
+    host = _get_record(fake, 'hosts', host_id)
+    if not isinstance(body, dict):
+        raise ApiError(400, 'The request body must be an object')
+    if 'name' in body:
+        _check_name(fake, 'hosts', body, host_id)
+    _check_references(fake, body)
+    fake._mark_updated(host)
+    host.update({key: value for key, value in body.items() if key != 'id'})
+    fake._mark_updated(host)
+    return 204, None
+
+
+def delete_host(fake, query, body, host_id):
+    fake._mark_updated(_get_record(fake, 'hosts', host_id))
+    del fake.data['hosts'][host_id]
+    fake.statuses.pop(host_id, None)
+    return 204, None
+
+
+def _set_group_members(fake, group_id: int, host_ids):
+    """Make host_ids the members of a host group, when the body gives them."""
+    if host_ids is None:
+        return
+    missing = [host_id for host_id in host_ids if host_id not in fake.data['hosts']]
+    if missing:
+        raise ApiError(409, f"The hosts with ids {missing} do not exist")
+    for host in fake.data['hosts'].values():
+        member = host['id'] in host_ids
+        if member != (group_id in host['groups']):
+            host['groups'] = host['groups'] + [group_id] if member else [item for item in host['groups'] if item != group_id]
+
+
+def create_host_group(fake, query, body):
+    _check_name(fake, 'host_groups', body)
+    body = dict(body)
+    host_ids = body.pop('hosts', None)
+    group = fake.add('host_groups', **body)
+    _set_group_members(fake, group['id'], host_ids)
+    return 201, fake.render_host_group(group)
+
+
+def update_host_group(fake, query, body, group_id):
+    group = _get_record(fake, 'host_groups', group_id)
+    _check_name(fake, 'host_groups', body, group_id)
+    body = dict(body)
+    host_ids = body.pop('hosts', None)
+    group.clear()
+    group.update(dict(DEFAULTS['host_groups'], **body), id=group_id)
+    _set_group_members(fake, group_id, host_ids)
+    return 204, None
+
+
+def delete_host_group(fake, query, body, group_id):
+    _get_record(fake, 'host_groups', group_id)
+    del fake.data['host_groups'][group_id]
+    for host in fake.data['hosts'].values():
+        if group_id in host['groups']:
+            host['groups'] = [item for item in host['groups'] if item != group_id]
+    return 204, None
+
+
+def delete_host_groups(fake, query, body):
+    results = []
+    for group_id in (body or {}).get('ids') or []:
+        href = f"{fake.api_path}/configuration/hosts/groups/{group_id}"
+        if group_id in fake.data['host_groups']:
+            delete_host_group(fake, query, None, group_id)
+            results.append({'href': href, 'status': 204, 'message': None})
+        else:
+            results.append({'href': href, 'status': 404, 'message': 'Host group not found'})
+    return 207, {'results': results}
+
+
+def duplicate_host_groups(fake, query, body):
+    body = body or {}
+    for group_id in body.get('ids') or []:
+        group = _get_record(fake, 'host_groups', group_id)
+        for index in range(1, (body.get('nb_duplicates') or 1) + 1):
+            copy = {key: value for key, value in group.items() if key != 'id'}
+            copy['name'] = f"{group['name']}_{index}"
+            duplicate = fake.add('host_groups', **copy)
+            members = [host['id'] for host in fake.data['hosts'].values() if group_id in host['groups']]
+            _set_group_members(fake, duplicate['id'], members)
+    return 204, None
+
+
+def list_host_monitoring(fake, query, body):
+    def records():
+        return [fake.render_host_monitoring(host) for host in fake.data['hosts'].values() if host.get('is_activated', True)]
+    return 200, fake.listing('monitoring_hosts', records, query)
+
+
+def export_configuration(restart: bool):
+    def handler(fake, query, body, poller_id=None):
+        pollers = [_get_record(fake, 'monitoring_servers', poller_id)] if poller_id else fake.data['monitoring_servers'].values()
+        for poller in pollers:
+            if restart:
+                poller['last_restart'] = datetime.now(timezone.utc).isoformat()
+                poller['is_updated'] = False
+        # These routes are GET requests, which do not invalidate the listings by themselves.
+        fake.changed()
+        return 204, None
+    return handler
+
+
+ROUTES = [(re.compile(pattern), methods) for pattern, methods in (
+    (r'configuration/hosts', {'GET': list_collection('hosts', 'render_host'), 'POST': create_host}),
+    (r'configuration/hosts/(\d+)', {'GET': get_record('hosts', 'render_host_detail'), 'PATCH': patch_host, 'DELETE': delete_host}),
+    (r'configuration/hosts/groups', {'GET': list_host_groups, 'POST': create_host_group}),
+    (r'configuration/hosts/groups/_delete', {'POST': delete_host_groups}),
+    (r'configuration/hosts/groups/_duplicate', {'POST': duplicate_host_groups}),
+    (r'configuration/hosts/groups/(\d+)', {
+        'GET': get_record('host_groups', 'render_host_group'), 'PUT': update_host_group, 'DELETE': delete_host_group,
+    }),
+    (r'configuration/hosts/categories', {'GET': list_collection('host_categories'), 'POST': create_record('host_categories')}),
+    (r'configuration/hosts/categories/(\d+)', {
+        'GET': get_record('host_categories'), 'PUT': update_record('host_categories'), 'DELETE': delete_record('host_categories'),
+    }),
+    (r'configuration/hosts/severities', {'GET': list_collection('host_severities'), 'POST': create_record('host_severities')}),
+    (r'configuration/hosts/severities/(\d+)', {
+        'GET': get_record('host_severities'), 'PUT': update_record('host_severities'), 'DELETE': delete_record('host_severities'),
+    }),
+    (r'configuration/hosts/templates', {'GET': list_collection('host_templates')}),
+    (r'configuration/services/categories', {'GET': list_collection('service_categories'), 'POST': create_record('service_categories')}),
+    (r'configuration/services/categories/(\d+)', {'DELETE': delete_record('service_categories')}),
+    (r'configuration/monitoring-servers', {'GET': list_collection('monitoring_servers')}),
+    (r'configuration/monitoring-servers/(\d+)', {'GET': get_record('monitoring_servers')}),
+    (r'configuration/monitoring-servers/generate', {'GET': export_configuration(restart=False)}),
+    (r'configuration/monitoring-servers/reload', {'GET': export_configuration(restart=True)}),
+    (r'configuration/monitoring-servers/generate-and-reload', {'GET': export_configuration(restart=True)}),
+    (r'configuration/monitoring-servers/(\d+)/generate', {'GET': export_configuration(restart=False)}),
+    (r'configuration/monitoring-servers/(\d+)/reload', {'GET': export_configuration(restart=True)}),
+    (r'configuration/monitoring-servers/(\d+)/generate-and-reload', {'GET': export_configuration(restart=True)}),
+    (r'monitoring/hosts', {'GET': list_host_monitoring}),
+)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve a fake Centreon API v2 until interrupted.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    parser.add_argument('--api-path', default=DEFAULT_API_PATH)
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='centreon')
+    parser.add_argument('--hosts', type=int, default=0, help='number of hosts to generate')
+    parser.add_argument('--monitoring-servers', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help='delay added to every request, in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with a 503')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of requests answered with a 429')
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--max-limit', type=int, default=None, help='largest page size served')
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakeCentreon(host=args.host, port=args.port, api_path=args.api_path,
+                        username=args.username, password=args.password,
+                        latency=args.latency, error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                        retry_after=args.retry_after, max_limit=args.max_limit, seed=args.seed)
+    if args.hosts:
+        fake.populate(hosts=args.hosts, monitoring_servers=args.monitoring_servers)
+    fake.start()
+    print(fake.url, flush=True)
+    try:
+        fake._thread.join()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == '__main__':
+    main()
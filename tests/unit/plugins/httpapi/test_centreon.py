@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import json
+import os
+import time
+
+import pytest
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible.plugins.loader import httpapi_loader
+from ansible_collections.parnoud.centreon.plugins.module_utils import centreon_api
+from ansible_collections.parnoud.centreon.plugins.modules import list_all_host_groups
+from ansible_collections.parnoud.centreon.plugins.plugin_utils.centreon_action import ControllerModule, ControllerModuleExit
+
+
+class HttpApiConnection:
+    """The parts of the ansible.netcommon.httpapi connection used by the plugin, logging in on first use."""
+
+    def __init__(self, server):
+        self._url = f"http://{server.host}:{server.port}"
+        self._auth = None
+        self.remote_user = server.username
+        self.password = server.password
+        self.httpapi = None
+        # Unlike the timeout of any request, so that it is not mistaken for one.
+        self.options = {'validate_certs': False, 'persistent_command_timeout': 1000}
+
+    def get_option(self, name):
+        return self.options[name]
+
+    def _connect(self):
+        self.httpapi.login(self.remote_user, self.password)
+
+
+class JsonRpcConnection:
+    """Connection of a module to the persistent connection, passing the arguments and results as JSON."""
+
+    def __init__(self, httpapi):
+        self.httpapi = httpapi
+
+    def send_request(self, *args, **kwargs):
+        return json.loads(json.dumps(self.httpapi.send_request(*json.loads(json.dumps(args)), **json.loads(json.dumps(kwargs)))))
+
+
+@pytest.fixture
+def connect(fake_centreon):
+    """Return a function opening a persistent connection to a server and returning its httpapi plugin."""
+
+    def open_connection(server=fake_centreon, **options):
+        connection = HttpApiConnection(server)
+        connection.httpapi = httpapi_loader.get('parnoud.centreon.centreon', connection)
+        connection.httpapi.set_options(direct=options)
+        return connection.httpapi
+
+    return open_connection
+
+
+def test_one_login_for_the_connection(fake_centreon, connect):
+    fake_centreon.add('host_groups', name='linux')
+    httpapi = connect()
+
+    for _ in range(3):
+        code, data, retries = httpapi.send_request('GET', 'configuration/hosts/groups')
+        assert code == 200
+        assert [group['name'] for group in json.loads(data)['result']] == ['linux']
+        assert retries == 0
+    assert fake_centreon.stats['logins'] == 1
+
+    httpapi.logout()
+    assert fake_centreon.tokens == set()
+
+
+def test_timeout_of_the_requests(connect):
+    httpapi = connect(centreon_timeout=7)
+
+    httpapi.send_request('GET', 'configuration/hosts/groups')
+    assert httpapi._api.timeout == 7
+    httpapi.send_request('GET', 'configuration/hosts/groups', options={'timeout': 3})
+    assert httpapi._api.timeout == 3
+    httpapi.send_request('GET', 'configuration/hosts/groups', options={'timeout': None})
+    assert httpapi._api.timeout == 7
+
+
+def test_retries_of_each_task(fake_centreon, connect):
+    httpapi = connect()
+
+    fake_centreon.fail_next(503, count=2)
+    code, data, retries = httpapi.send_request('GET', 'configuration/hosts/groups', options={'retries': 2, 'retry_backoff': 0.01})
+    assert (code, retries) == (200, 2)
+
+    fake_centreon.fail_next(503)
+    code, data, retries = httpapi.send_request('GET', 'configuration/hosts/groups', options={'retries': 0})
+    assert (code, retries) == (503, 0)
+
+
+def test_token_cache_is_shared_by_the_connections(fake_centreon, connect, tmp_path):
+    options = {'token_cache': True, 'token_cache_path': str(tmp_path / 'tokens.json')}
+
+    for _ in range(3):
+        code, data, retries = connect().send_request('GET', 'configuration/hosts/groups', options=options)
+        assert code == 200
+    assert fake_centreon.stats['logins'] == 1
+
+
+def test_rate_limit_is_shared_by_the_connections(fake_centreon, connect, tmp_path):
+    options = {'rate_limit': 20, 'rate_limit_burst': 1, 'rate_limit_path': str(tmp_path / 'rate_limit.json')}
+    processes, requests = 3, 5
+
+    # Each persistent connection runs in its own process.
+    start = time.monotonic()
+    pids = []
+    for index in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                httpapi = connect()
+                codes = [httpapi.send_request('GET', 'configuration/hosts/groups', options=options)[0] for _ in range(requests)]
+                code = 0 if codes == [200] * requests else 1
+            finally:
+                os._exit(code)
+        pids.append(pid)
+
+    assert [os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) for pid in pids] == [0] * processes
+    elapsed = time.monotonic() - start
+    # One login and the requests of each connection, at most 20 per second all together.
+    sent = fake_centreon.stats['requests']
+    assert sent == processes * (requests + 1)
+    assert elapsed >= (sent - 1) / 20
+
+
+def test_module_options_are_sent_to_the_connection(fake_centreon, connect, monkeypatch):
+    httpapi = connect()
+    monkeypatch.setattr(centreon_api, 'Connection', lambda socket_path: JsonRpcConnection(httpapi))
+    params = ArgumentSpecValidator(list_all_host_groups.module_argument_spec()).validate(
+        dict(retries=2, retry_backoff=0.01, timeout=5)
+    ).validated_parameters
+    module = ControllerModule(params)
+    module._socket_path = '/nonexistent/socket'
+    fake_centreon.fail_next(502, count=2)
+
+    with pytest.raises(ControllerModuleExit) as exit_result:
+        list_all_host_groups.run_module(module)
+    assert exit_result.value.result['api_retries'] == 2
+    assert httpapi._api.timeout == 5
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import json
+import os
+import time
+
+import pytest
+
+from ansible.errors import AnsibleError
+from ansible.inventory.data import InventoryData
+from ansible.parsing.dataloader import DataLoader
+from ansible.plugins.loader import inventory_loader
+from ansible_collections.parnoud.centreon.plugins.inventory import centreon_inventory_host
+
+
+@pytest.fixture
+def parse(tmp_path, monkeypatch):
+    """Return a function parsing an inventory configuration and returning the inventory."""
+    monkeypatch.setattr(centreon_inventory_host, 'REFRESH_LOCK_DIR', str(tmp_path / 'locks'))
+    path = tmp_path / 'inventory.centreon.yml'
+
+    def run(config: dict, cache: bool = True) -> InventoryData:
+        path.write_text(json.dumps(dict(plugin='parnoud.centreon.centreon_inventory_host', **config)))
+        inventory = InventoryData()
+        plugin = inventory_loader.get('parnoud.centreon.centreon_inventory_host')
+        plugin.parse(inventory, DataLoader(), str(path), cache=cache)
+        if plugin.get_option('cache'):
+            # As the inventory manager does once the source is parsed.
+            plugin.update_cache_if_changed()
+        return inventory
+
+    return run
+
+
+def cached_config(server, tmp_path, **options) -> dict:
+    return dict(hostname=server.url, username=server.username, password=server.password,
+                cache=True, cache_plugin='ansible.builtin.jsonfile',
+                cache_connection=str(tmp_path / 'cache'), **options)
+
+
+def host_names(inventory: InventoryData, group: str = None) -> list:
+    if group is None:
+        return sorted(inventory.hosts)
+    return sorted(host.name for host in inventory.groups[group].get_hosts())
+
+
+def test_hosts_and_groups(fake_centreon, parse):
+    fake_centreon.populate(hosts=20, host_groups=3)
+
+    inventory = parse(fake_centreon.module_params())
+    assert host_names(inventory) == [f'host-{index:06d}' for index in range(20)]
+    assert set(inventory.groups['groups'].child_groups) >= {inventory.groups['hostgroup-000']}
+    variables = inventory.get_host('host-000001').vars
+    assert variables['address'] == '10.0.0.1'
+    assert [template['name'] for template in variables['list_templates']] == ['template-01']
+
+
+def test_entities_are_shared_by_their_hosts(fake_centreon, parse):
+    fake_centreon.populate(hosts=20, monitoring_servers=2)
+
+    inventory = parse(fake_centreon.module_params())
+    first, third = inventory.get_host('host-000000').vars, inventory.get_host('host-000002').vars
+    assert first['monitoring_server'] == {'id': 1, 'name': 'Central'}
+    assert first['monitoring_server'] is third['monitoring_server']
+    assert first['check_timeperiod'] is third['check_timeperiod']
+
+
+def test_selected_attributes(fake_centreon, parse):
+    fake_centreon.populate(hosts=3, host_groups=3)
+
+    inventory = parse(fake_centreon.module_params(attributes=['templates']))
+    variables = inventory.get_host('host-000001').vars
+    assert variables['monitoring_server']['name'] == 'poller-01'
+    assert len(variables['list_groups']) == 2
+    assert 'list_templates' in variables
+    assert 'list_categories' not in variables and 'normal_check_interval' not in variables
+
+
+def test_cached_hosts_are_reused(fake_centreon, parse, tmp_path):
+    fake_centreon.populate(hosts=30)
+    config = cached_config(fake_centreon, tmp_path, cache_timeout=3600)
+
+    first = parse(config)
+    assert fake_centreon.stats['GET configuration/hosts'] == 1
+    second = parse(config)
+    assert fake_centreon.stats['GET configuration/hosts'] == 1
+    assert host_names(second) == host_names(first)
+
+    # A refresh of the inventory fetches the hosts again.
+    parse(config, cache=False)
+    assert fake_centreon.stats['GET configuration/hosts'] == 2
+
+
+def test_realtime_status(fake_centreon, parse):
+    first = fake_centreon.add_host(name='web', address='10.0.0.1')
+    second = fake_centreon.add_host(name='db', address='10.0.0.2')
+    fake_centreon.set_host_status(second['id'], 1, in_downtime=True, acknowledged=True)
+    fake_centreon.add_host(name='new', address='10.0.0.3')
+    fake_centreon.statuses.pop(3)
+
+    inventory = parse(fake_centreon.module_params(realtime=True))
+    assert inventory.get_host('web').vars['status'] == {'code': 0, 'name': 'UP', 'in_downtime': False, 'acknowledged': False}
+    assert inventory.get_host('new').vars['status']['name'] == 'PENDING'
+    assert host_names(inventory, 'status_up') == ['web']
+    assert host_names(inventory, 'status_down') == ['db']
+    assert host_names(inventory, 'status_in_downtime') == ['db']
+    assert host_names(inventory, 'status_acknowledged') == ['db']
+    assert host_names(inventory, 'status_pending') == ['new']
+    assert fake_centreon.stats['GET monitoring/hosts'] == 1
+    assert first['id'] == 1
+
+
+def test_realtime_status_is_not_cached(fake_centreon, parse, tmp_path):
+    host = fake_centreon.add_host(name='web', address='10.0.0.1')
+    config = cached_config(fake_centreon, tmp_path, realtime=True)
+
+    assert host_names(parse(config), 'status_up') == ['web']
+    fake_centreon.set_host_status(host['id'], 1)
+    assert host_names(parse(config), 'status_down') == ['web']
+    assert fake_centreon.stats['GET configuration/hosts'] == 1
+
+
+def test_shard_by_poller(fake_centreon, parse):
+    fake_centreon.populate(hosts=100, monitoring_servers=4)
+
+    unsharded = parse(fake_centreon.module_params())
+    sharded = parse(fake_centreon.module_params(shard_by_poller=True))
+    assert host_names(sharded) == host_names(unsharded)
+    assert fake_centreon.stats['GET configuration/hosts'] == 1 + 4
+
+
+def test_pollers_selected_by_name_or_id(fake_centreon, parse):
+    fake_centreon.populate(hosts=30, monitoring_servers=3)
+
+    inventory = parse(fake_centreon.module_params(pollers=['Central', 3]))
+    assert host_names(inventory) == [f'host-{index:06d}' for index in range(30) if index % 3 != 1]
+
+
+def test_cache_invalidation_by_pollers(fake_centreon, parse, tmp_path):
+    fake_centreon.populate(hosts=30, monitoring_servers=3)
+    config = cached_config(fake_centreon, tmp_path, cache_invalidation='pollers', cache_timeout=3600)
+
+    parse(config)
+    assert fake_centreon.stats['GET configuration/hosts'] == 1
+    parse(config)
+    assert fake_centreon.stats['GET configuration/hosts'] == 1
+
+    # The hosts of poller-01 are fetched again while it has changes to export.
+    with fake_centreon.lock:
+        fake_centreon.data['hosts'][2]['alias'] = 'Renamed'
+        fake_centreon._mark_updated(fake_centreon.data['hosts'][2])
+        fake_centreon.changed()
+    inventory = parse(config)
+    assert fake_centreon.stats['GET configuration/hosts'] == 2
+    assert inventory.get_host('host-000001').vars['alias'] == 'Renamed'
+    assert len(host_names(inventory)) == 30
+
+
+def test_background_refresh(fake_centreon, parse, tmp_path):
+    fake_centreon.add_host(name='web', address='10.0.0.1')
+    config = cached_config(fake_centreon, tmp_path, cache_timeout=1, refresh_mode='background')
+
+    parse(config)
+    time.sleep(1.1)
+    fake_centreon.add_host(name='db', address='10.0.0.2')
+
+    # The stale hosts are returned while a detached process refreshes them.
+    assert host_names(parse(config)) == ['web']
+    deadline = time.time() + 10
+    while fake_centreon.stats['GET configuration/hosts'] < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.5)
+    assert host_names(parse(config)) == ['db', 'web']
+    assert fake_centreon.stats['GET configuration/hosts'] == 2
+
+
+def test_background_refresh_runs_once_per_cache_key(fake_centreon, parse, tmp_path):
+    fake_centreon.add_host(name='web', address='10.0.0.1')
+    config = cached_config(fake_centreon, tmp_path, cache_timeout=1, refresh_mode='background')
+
+    parse(config)
+    time.sleep(1.1)
+    fake_centreon.latency = 1.0
+    for _ in range(3):
+        assert host_names(parse(config)) == ['web']
+    time.sleep(2)
+    assert fake_centreon.stats['GET configuration/hosts'] == 2
+    # The lock is kept with the cache entries, hidden from the cache plugin.
+    hidden = [name for name in os.listdir(tmp_path / 'cache') if name.startswith('.')]
+    assert len(hidden) == 1 and hidden[0].endswith('.refresh.lock')
+    assert not (tmp_path / 'locks').exists()
+
+
+def test_background_refresh_failure_is_reported(fake_centreon, parse, tmp_path, monkeypatch):
+    warnings = []
+    monkeypatch.setattr(centreon_inventory_host.display, 'warning', warnings.append)
+    fake_centreon.add_host(name='web', address='10.0.0.1')
+    config = cached_config(fake_centreon, tmp_path, cache_timeout=1, refresh_mode='background')
+
+    parse(config)
+    time.sleep(1.1)
+    fake_centreon.fail_next(500)
+    assert host_names(parse(config)) == ['web']
+    deadline = time.time() + 10
+    while not any(name.endswith('.refresh.error') for name in os.listdir(tmp_path / 'cache')) and time.time() < deadline:
+        time.sleep(0.05)
+    time.sleep(0.2)
+    assert warnings == []
+
+    # The next run reports the failure and refreshes the hosts again.
+    assert host_names(parse(config)) == ['web']
+    assert len(warnings) == 1
+    assert 'The background refresh of the Centreon inventory cache failed' in warnings[0]
+    assert 'Injected failure' in warnings[0]
+    time.sleep(1)
+    assert not any(name.endswith('.refresh.error') for name in os.listdir(tmp_path / 'cache'))
+
+
+def test_instances(fake_centreon_factory, parse):
+    paris, lyon = fake_centreon_factory(seed=0), fake_centreon_factory(seed=1)
+    paris.add('host_groups', name='linux')
+    lyon.add('host_groups', name='linux')
+    paris.add_host(name='paris-web', address='10.0.0.1', groups=[1])
+    lyon.add_host(name='lyon-web', address='10.1.0.1', groups=[1])
+    instances = [
+        dict(name='paris', hostname=paris.url, username=paris.username, password=paris.password),
+        dict(name='lyon', hostname=lyon.url, username=lyon.username, password=lyon.password),
+    ]
+
+    merged = parse(dict(instances=instances))
+    assert host_names(merged, 'linux') == ['lyon-web', 'paris-web']
+    assert host_names(merged, 'instance_lyon') == ['lyon-web']
+    assert merged.get_host('paris-web').vars['instance'] == 'paris'
+
+    namespaced = parse(dict(instances=instances, instance_groups='namespace'))
+    assert host_names(namespaced, 'paris_linux') == ['paris-web']
+    assert host_names(namespaced, 'lyon_linux') == ['lyon-web']
+
+
+def test_instances_with_the_same_host(fake_centreon_factory, parse):
+    paris, lyon = fake_centreon_factory(), fake_centreon_factory()
+    paris.add_host(name='web', address='10.0.0.1')
+    lyon.add_host(name='web', address='10.1.0.1')
+    instances = [
+        dict(name='paris', hostname=paris.url, username=paris.username, password=paris.password),
+        dict(name='lyon', hostname=lyon.url, username=lyon.username, password=lyon.password),
+    ]
+
+    with pytest.raises(AnsibleError, match='Host web exists in instances paris and lyon'):
+        parse(dict(instances=instances))
+    inventory = parse(dict(instances=instances, instance_conflict='first'))
+    assert inventory.get_host('web').vars['address'] == '10.0.0.1'
+
+
+def test_instance_credentials_are_not_mixed_with_a_global_token(fake_centreon_factory, parse):
+    paris, lyon = fake_centreon_factory(), fake_centreon_factory()
+    paris.add_host(name='paris-web', address='10.0.0.1')
+    lyon.add_host(name='lyon-web', address='10.1.0.1')
+    paris.tokens.add('paris-token')
+    instances = [
+        dict(name='paris', hostname=paris.url),
+        dict(name='lyon', hostname=lyon.url, username=lyon.username, password=lyon.password),
+    ]
+
+    inventory = parse(dict(instances=instances, token='paris-token'))
+    assert host_names(inventory) == ['lyon-web', 'paris-web']
+    assert paris.stats['logins'] == 0
+    # The token of paris is never sent to lyon, which logs in once.
+    assert lyon.stats['logins'] == 1
+    assert lyon.stats['GET configuration/hosts'] == 1
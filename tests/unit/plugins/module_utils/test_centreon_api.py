@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+from ansible_collections.parnoud.centreon.plugins.module_utils.centreon_api import CentreonAPI
+from ansible_collections.parnoud.centreon.plugins.modules import list_all_host_groups
+from ansible_collections.parnoud.centreon.plugins.plugin_utils.centreon_action import ControllerModule, ControllerModuleExit
+
+
+def build_api(server, **options) -> CentreonAPI:
+    return CentreonAPI(hostname=server.url, username=server.username, password=server.password, **options)
+
+
+def validate(module, params: dict) -> dict:
+    return ArgumentSpecValidator(module.module_argument_spec()).validate(params).validated_parameters
+
+
+def host_ids(api: CentreonAPI, **kwargs) -> list:
+    return [host['id'] for host in api._get_all_paginated('GET', 'configuration/hosts', **kwargs)]
+
+
+@pytest.mark.parametrize('hosts', [0, 100, 101, 1234])
+def test_concurrent_pages_match_serial_pages(fake_centreon, hosts):
+    fake_centreon.populate(hosts=hosts)
+
+    assert host_ids(build_api(fake_centreon, max_concurrency=4)) == list(range(1, hosts + 1))
+    assert fake_centreon.stats['GET configuration/hosts'] == max(1, -(-hosts // 100))
+
+
+def test_failing_page_aborts_the_concurrent_iteration(fake_centreon):
+    fake_centreon.populate(hosts=5000)
+    api = build_api(fake_centreon, max_concurrency=4, retries=0)
+
+    records = api.iter_paginated('GET', 'configuration/hosts')
+    next(records)
+    fake_centreon.fail_next(500)
+    with pytest.raises(Exception, match='Injected failure'):
+        list(records)
+    # The pages in flight when the failure is seen are the only ones requested after it.
+    assert fake_centreon.stats['GET configuration/hosts'] <= 1 + 2 * 4
+
+
+@pytest.mark.parametrize('page_size, max_limit', [(100, 100), (100, 150), (500, 100), (30, 70)])
+def test_adaptive_page_size_with_capped_pages(fake_centreon, page_size, max_limit):
+    fake_centreon.populate(hosts=1234)
+    fake_centreon.max_limit = max_limit
+
+    api = build_api(fake_centreon, page_size=page_size, adaptive_page_size=True)
+    assert host_ids(api) == list(range(1, 1235))
+
+
+def test_adaptive_page_size_grows_on_fast_pages(fake_centreon):
+    fake_centreon.populate(hosts=1000)
+
+    api = build_api(fake_centreon, page_size=100, adaptive_page_size=True)
+    assert host_ids(api) == list(range(1, 1001))
+    # 100 + 100 + 200 + 400 + 200 remaining rows, instead of 10 pages of 100.
+    assert fake_centreon.stats['GET configuration/hosts'] == 5
+
+
+@pytest.mark.parametrize('max_concurrency', [1, 4])
+def test_page_size_capped_by_the_server(fake_centreon, max_concurrency):
+    fake_centreon.populate(hosts=345)
+    fake_centreon.max_limit = 50
+
+    api = build_api(fake_centreon, page_size=200, max_concurrency=max_concurrency)
+    assert host_ids(api) == list(range(1, 346))
+    assert fake_centreon.stats['GET configuration/hosts'] == 7
+
+
+def test_token_cache_shares_one_login_across_forks(fake_centreon, tmp_path):
+    fake_centreon.populate(hosts=10)
+    token_cache_path = str(tmp_path / 'tokens.json')
+
+    pids = []
+    for index in range(16):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                api = build_api(fake_centreon, token_cache=True, token_cache_path=token_cache_path)
+                code = 0 if len(host_ids(api)) == 10 else 1
+            finally:
+                os._exit(code)
+        pids.append(pid)
+
+    assert [os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) for pid in pids] == [0] * 16
+    assert fake_centreon.stats['logins'] == 1
+
+
+def test_expired_token_is_replaced_once_across_threads(fake_centreon):
+    fake_centreon.populate(hosts=10)
+    api = build_api(fake_centreon)
+    fake_centreon.expire_tokens()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda index: host_ids(api), range(8)))
+
+    assert results == [list(range(1, 11))] * 8
+    assert fake_centreon.stats['logins'] == 2
+
+
+def test_token_replaced_by_another_thread_is_not_rejected_again(fake_centreon):
+    api = build_api(fake_centreon)
+    fake_centreon.expire_tokens()
+    send = api._send
+
+    def send_while_another_thread_logs_in(**kwargs):
+        response, token = send(**kwargs)
+        if response.status_code == 401 and api.token == token:
+            # Another request got its 401 first and already logged in again.
+            api._reauthenticate(rejected_token=token)
+        return response, token
+
+    api._send = send_while_another_thread_logs_in
+    assert host_ids(api) == []
+    assert fake_centreon.stats['logins'] == 2
+
+
+def test_retry_after_is_honoured(fake_centreon):
+    api = build_api(fake_centreon, retries=2, retry_backoff=0)
+    fake_centreon.retry_after = 1
+    fake_centreon.fail_next(429)
+
+    start = time.monotonic()
+    assert host_ids(api) == []
+    assert time.monotonic() - start >= 1
+    assert api.retry_count == 1
+
+
+def test_transient_failures_are_retried_for_idempotent_methods(fake_centreon):
+    fake_centreon.populate(hosts=5)
+    api = build_api(fake_centreon, retries=3, retry_backoff=0.01)
+
+    fake_centreon.fail_next(503, count=3)
+    assert host_ids(api) == [1, 2, 3, 4, 5]
+    assert api.retry_count == 3
+
+    fake_centreon.fail_next(503, count=4)
+    with pytest.raises(Exception, match='Injected failure'):
+        host_ids(api)
+
+
+def test_delete_is_not_retried_on_server_errors(fake_centreon):
+    category = fake_centreon.add('host_categories', name='old')
+    api = build_api(fake_centreon, retries=3, retry_backoff=0.01)
+
+    fake_centreon.fail_next(503)
+    code, data = api._request('DELETE', f"configuration/hosts/categories/{category['id']}")
+    assert code == 503
+    assert api.retry_count == 0
+
+    api = build_api(fake_centreon, retries=3, retry_backoff=0.01, retry_non_idempotent=True)
+    fake_centreon.fail_next(503)
+    code, data = api._request('DELETE', f"configuration/hosts/categories/{category['id']}")
+    assert code == 204
+    assert api.retry_count == 1
+
+
+def test_post_is_only_retried_on_429(fake_centreon):
+    api = build_api(fake_centreon, retries=3, retry_backoff=0.01)
+    fake_centreon.retry_after = 0
+
+    fake_centreon.fail_next(503)
+    code, data = api._request('POST', 'configuration/hosts/categories', data={'name': 'first'})
+    assert code == 503
+    assert api.retry_count == 0
+
+    fake_centreon.fail_next(429, count=2)
+    code, data = api._request('POST', 'configuration/hosts/categories', data={'name': 'second'})
+    assert code == 201
+    assert api.retry_count == 2
+    assert [category['name'] for category in fake_centreon.data['host_categories'].values()] == ['second']
+
+
+def test_api_retries_is_reported_in_the_module_result(fake_centreon):
+    module = ControllerModule(validate(list_all_host_groups, fake_centreon.module_params()))
+    module.use_api(build_api(fake_centreon, retries=3, retry_backoff=0.01))
+    fake_centreon.fail_next(502, count=2)
+
+    with pytest.raises(ControllerModuleExit) as exit_result:
+        list_all_host_groups.run_module(module)
+    assert exit_result.value.result['api_retries'] == 2
+    assert exit_result.value.result['result'] == []
+
+
+def test_rate_limit_is_shared_across_forks(fake_centreon, tmp_path):
+    rate_limit_path = str(tmp_path / 'rate_limit.json')
+    processes, requests = 4, 5
+
+    start = time.monotonic()
+    pids = []
+    for index in range(processes):
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                api = build_api(fake_centreon, rate_limit=20, rate_limit_burst=1, rate_limit_path=rate_limit_path)
+                code = 0 if all(host_ids(api) == [] for _ in range(requests)) else 1
+            finally:
+                os._exit(code)
+        pids.append(pid)
+
+    assert [os.waitstatus_to_exitcode(os.waitpid(pid, 0)[1]) for pid in pids] == [0] * processes
+    elapsed = time.monotonic() - start
+    # One login and the listings of each process, at most 20 per second all together.
+    sent = fake_centreon.stats['requests']
+    assert sent == processes * (requests + 1)
+    assert elapsed >= (sent - 1) / 20
+
+
+def test_keyset_scan_keeps_the_search(fake_centreon):
+    fake_centreon.populate(hosts=500)
+    params = {'search': '{"name": {"$lk": "host-0001%"}}'}
+
+    offset = host_ids(build_api(fake_centreon, page_size=30), params=params)
+    assert offset == list(range(101, 201))
+    fake_centreon.stats.clear()
+    # The cursor is merged with the search through $and, so the pages stay within the search.
+    assert host_ids(build_api(fake_centreon, page_size=30, pagination='keyset'), params=params) == offset
+    assert fake_centreon.stats['GET configuration/hosts'] == 4
+
+
+def test_keyset_scan_is_not_shifted_by_deleted_rows(fake_centreon):
+    fake_centreon.populate(hosts=100)
+    api = build_api(fake_centreon, page_size=10, pagination='keyset')
+
+    records = api.iter_paginated('GET', 'configuration/hosts')
+    seen = [next(records)['id'] for _ in range(10)]
+    with fake_centreon.lock:
+        for host_id in range(1, 6):
+            del fake_centreon.data['hosts'][host_id]
+        fake_centreon.changed()
+    seen.extend(host['id'] for host in records)
+    assert seen == list(range(1, 101))
+
+
+def test_count_only_requests_one_row(fake_centreon):
+    fake_centreon.populate(hosts=1234)
+    api = build_api(fake_centreon, max_concurrency=4)
+
+    assert api._get_all_paginated('GET', 'configuration/hosts', count_only=True) == 1234
+    assert api.count('GET', 'configuration/hosts', params={'search': '{"name": {"$lk": "host-0001%"}}'}) == 100
+    assert fake_centreon.stats['GET configuration/hosts'] == 2
+
+
+@pytest.mark.parametrize('max_concurrency, pagination', [(1, 'offset'), (4, 'offset'), (1, 'keyset')])
+@pytest.mark.parametrize('max_results, requests', [(0, 0), (30, 1), (100, 1), (250, 3)])
+def test_max_results_stops_requesting_pages(fake_centreon, max_concurrency, pagination, max_results, requests):
+    fake_centreon.populate(hosts=1234)
+    api = build_api(fake_centreon, max_concurrency=max_concurrency, pagination=pagination)
+
+    assert host_ids(api, max_results=max_results) == list(range(1, max_results + 1))
+    assert fake_centreon.stats['GET configuration/hosts'] == requests
+
+
+def test_total_is_returned_by_the_listing_modules(fake_centreon):
+    fake_centreon.populate(hosts=0, host_groups=120)
+
+    for options, total, rows in [({}, 120, 120), ({'count_only': True}, 120, 0), ({'max_results': 5}, 5, 5)]:
+        module = ControllerModule(validate(list_all_host_groups, fake_centreon.module_params(**options)))
+        with pytest.raises(ControllerModuleExit) as exit_result:
+            list_all_host_groups.run_module(module)
+        assert exit_result.value.result['total'] == total
+        assert len(exit_result.value.result['result']) == rows
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import pytest
+
+from ansible_collections.parnoud.centreon.plugins.modules import manage_host
+
+
+@pytest.fixture
+def web(fake_centreon):
+    """A host with two groups and a template, and the ids of its relations."""
+    linux = fake_centreon.add('host_groups', name='linux')
+    http = fake_centreon.add('host_groups', name='http')
+    fake_centreon.add('host_groups', name='database')
+    template = fake_centreon.add('host_templates', name='generic-host')
+    return fake_centreon.add_host(name='web', address='10.0.0.1', groups=[linux['id'], http['id']], templates=[template['id']])
+
+
+def test_create_resolves_names(run_module, fake_centreon, web):
+    result = run_module(manage_host, name='db', address='10.0.0.2', monitoring_server_id=1,
+                        groups=['database', 1], templates=['generic-host'])
+    assert result['changed'] is True
+    host = fake_centreon.data['hosts'][result['data']['id']]
+    assert host['groups'] == [3, 1]
+    assert host['templates'] == [1]
+
+
+def test_update_without_changes_sends_no_request(run_module, fake_centreon, web):
+    result = run_module(manage_host, state='update', name='web', address='10.0.0.1', groups=['http', 'linux'])
+    assert result['changed'] is False
+    assert result['data'][0]['id'] == web['id']
+    assert fake_centreon.stats['PATCH configuration/hosts/{id}'] == 0
+
+    result = run_module(manage_host, state='replace', name='web', groups=['http', 'linux'], templates=['generic-host'])
+    assert result['changed'] is False
+    assert fake_centreon.stats['PATCH configuration/hosts/{id}'] == 0
+
+
+def test_update_with_unlisted_fields_is_idempotent(run_module, fake_centreon, web):
+    macros = [dict(name='PORT', value='8080', is_password=False, description='')]
+    for changed in (True, False):
+        result = run_module(manage_host, state='update', name='web', snmp_community='public', macros=macros)
+        assert result['changed'] is changed
+    assert fake_centreon.stats['PATCH configuration/hosts/{id}'] == 1
+    # The host is only read when fields beyond the listing are given.
+    assert fake_centreon.stats['GET configuration/hosts/{id}'] == 2
+    run_module(manage_host, state='update', name='web', alias='web')
+    assert fake_centreon.stats['GET configuration/hosts/{id}'] == 2
+
+
+def test_update_only_sends_the_changed_fields(run_module, fake_centreon, web):
+    result = run_module(manage_host, diff=True, state='update', name='web', address='10.0.0.1', alias='Web server',
+                        groups=['database'])
+    assert result['changed'] is True
+    # The relations of an update are added to the current ones.
+    assert result['diff'] == {
+        'before': {'alias': 'web', 'groups': [1, 2]},
+        'after': {'alias': 'Web server', 'groups': [1, 2, 3]},
+    }
+    assert fake_centreon.stats['PATCH configuration/hosts/{id}'] == 1
+    assert fake_centreon.data['hosts'][web['id']]['groups'] == [1, 2, 3]
+
+
+def test_update_by_host_id(run_module, fake_centreon, web):
+    result = run_module(manage_host, state='update', host_id=web['id'], alias='Web server')
+    assert result['changed'] is True
+    assert result['data'][0]['alias'] == 'Web server'
+    assert fake_centreon.data['hosts'][web['id']]['name'] == 'web'
+
+
+def test_check_mode_sends_no_change(run_module, fake_centreon, web):
+    result = run_module(manage_host, check_mode=True, state='update', name='web', alias='Web server')
+    assert result['changed'] is True
+    assert fake_centreon.data['hosts'][web['id']]['alias'] == 'web'
+    assert fake_centreon.stats['PATCH configuration/hosts/{id}'] == 0
+
+
+def test_unknown_names_are_reported_together(run_module, fake_centreon, web):
+    fake_centreon.add('host_groups', name='Linux')
+    result = run_module(manage_host, state='update', name='web', groups=['missing', 'linux', 'other'], templates=['absent'])
+    assert result['failed'] is True
+    assert result['msg'] == ('Host groups not found: missing, other. Host groups with multiple matches: linux. '
+                             'Host templates not found: absent')
+    # One search for all the group names and one for the template names.
+    assert fake_centreon.stats['GET configuration/hosts/groups'] == 1
+    assert fake_centreon.stats['GET configuration/hosts/templates'] == 1
+
+
+def test_delete_missing_host_is_not_a_change(run_module, fake_centreon, web):
+    assert run_module(manage_host, state='delete', name='web')['changed'] is True
+    assert web['id'] not in fake_centreon.data['hosts']
+    assert run_module(manage_host, state='delete', name='web')['changed'] is False
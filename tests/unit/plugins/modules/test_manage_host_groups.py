@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import pytest
+
+from ansible_collections.parnoud.centreon.plugins.modules import manage_host_groups
+
+
+def members(server, name: str) -> list:
+    group_id = next(group['id'] for group in server.data['host_groups'].values() if group['name'] == name)
+    return sorted(host['name'] for host in server.data['hosts'].values() if group_id in host['groups'])
+
+
+@pytest.fixture
+def groups(fake_centreon):
+    """Three host groups, web and db having members."""
+    web = fake_centreon.add('host_groups', name='web', alias='Web')
+    db = fake_centreon.add('host_groups', name='db', alias='Databases')
+    fake_centreon.add('host_groups', name='old')
+    fake_centreon.add_host(name='web-01', groups=[web['id']])
+    fake_centreon.add_host(name='web-02', groups=[web['id']])
+    fake_centreon.add_host(name='db-01', groups=[db['id']])
+
+
+def test_synced(run_module, fake_centreon, groups):
+    result = run_module(manage_host_groups, diff=True, state='synced', groups=[
+        dict(name='web', hosts=['web-01', 'db-01']),
+        dict(name='db', alias='Databases'),
+        dict(name='mail', hosts=['web-02']),
+    ])
+    assert result['changed'] is True
+    assert result['data'] == {'created': ['mail'], 'updated': ['web'], 'deleted': ['old']}
+    assert result['diff']['before']['web']['hosts'] == [1, 2]
+    assert result['diff']['after']['web']['hosts'] == [1, 3]
+    assert sorted(group['name'] for group in fake_centreon.data['host_groups'].values()) == ['db', 'mail', 'web']
+    assert members(fake_centreon, 'web') == ['db-01', 'web-01']
+    assert members(fake_centreon, 'db') == ['db-01']
+    assert members(fake_centreon, 'mail') == ['web-02']
+    # The extra groups are deleted with one request.
+    assert fake_centreon.stats['POST configuration/hosts/groups/_delete'] == 1
+
+
+def test_synced_without_changes(run_module, fake_centreon, groups):
+    desired = [dict(name='web', alias='Web', hosts=['web-02', 'web-01']), dict(name='db', hosts=[3]), dict(name='old')]
+
+    result = run_module(manage_host_groups, state='synced', groups=desired)
+    assert result['changed'] is False
+    assert fake_centreon.stats['PUT configuration/hosts/groups/{id}'] == 0
+    assert fake_centreon.stats['POST configuration/hosts/groups'] == 0
+
+
+def test_synced_alias_keeps_the_members(run_module, fake_centreon, groups):
+    result = run_module(manage_host_groups, diff=True, state='synced', groups=[
+        dict(name='web', alias='Web servers'),
+        dict(name='db'),
+        dict(name='old'),
+    ])
+    assert result['data']['updated'] == ['web']
+    assert result['diff']['before']['web']['hosts'] == result['diff']['after']['web']['hosts'] == [1, 2]
+    assert members(fake_centreon, 'web') == ['web-01', 'web-02']
+    assert members(fake_centreon, 'db') == ['db-01']
+    assert fake_centreon.stats['PUT configuration/hosts/groups/{id}'] == 1
+
+
+def test_synced_check_mode(run_module, fake_centreon, groups):
+    result = run_module(manage_host_groups, check_mode=True, state='synced', groups=[dict(name='web')])
+    assert result['data']['deleted'] == ['db', 'old']
+    assert len(fake_centreon.data['host_groups']) == 3
+
+
+def test_synced_with_unknown_hosts(run_module, fake_centreon, groups):
+    result = run_module(manage_host_groups, state='synced', groups=[dict(name='web', hosts=['web-01', 'missing']), dict(name='db')])
+    assert result['failed'] is True
+    assert result['msg'] == 'Hosts of web not found: missing'
+    assert len(fake_centreon.data['host_groups']) == 3
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from ansible_collections.parnoud.centreon.plugins.modules import manage_hosts
+
+
+def test_results_of_each_host(run_module, fake_centreon):
+    fake_centreon.add('host_groups', name='linux')
+    web = fake_centreon.add_host(name='web', address='10.0.0.1', groups=[1])
+    old = fake_centreon.add_host(name='old', address='10.0.0.9')
+
+    result = run_module(manage_hosts, diff=True, hosts=[
+        dict(name='web', address='10.0.0.1', groups=['linux']),
+        dict(name='db', address='10.0.0.2', monitoring_server_id=1, groups=['linux']),
+        dict(name='old', state='delete'),
+        dict(name='gone', state='delete'),
+        dict(name='mail', state='update', alias='Mail'),
+        dict(name='app', address='10.0.0.3', monitoring_server_id=1, groups=['missing']),
+    ])
+
+    assert result['failed'] is True
+    assert result['changed'] is True
+    assert result['msg'] == '2 of 6 hosts failed'
+    web_result, db_result, old_result, gone_result, mail_result, app_result = result['results']
+    assert web_result == {'name': 'web', 'state': 'create', 'id': web['id'], 'changed': False, 'failed': False}
+    assert db_result['changed'] is True
+    assert fake_centreon.data['hosts'][db_result['id']]['groups'] == [1]
+    assert old_result['changed'] is True and old_result['diff']['after'] == {}
+    assert old['id'] not in fake_centreon.data['hosts']
+    assert gone_result == {'name': 'gone', 'state': 'delete', 'changed': False, 'failed': False}
+    assert mail_result['msg'] == 'Host mail not found for update.'
+    assert app_result['msg'] == 'Host groups not found: missing'
+
+    # The hosts are listed once, the group names are searched once.
+    assert fake_centreon.stats['GET configuration/hosts'] == 1
+    assert fake_centreon.stats['GET configuration/hosts/groups'] == 1
+
+
+def test_only_changed_hosts_are_sent(run_module, fake_centreon):
+    for index in range(10):
+        fake_centreon.add_host(name=f'host-{index}', address=f'10.0.0.{index}')
+
+    hosts = [dict(name=f'host-{index}', address=f'10.0.1.{index}' if index % 2 else f'10.0.0.{index}')
+             for index in range(10)]
+    result = run_module(manage_hosts, state='update', max_workers=3, hosts=hosts)
+    assert 'failed' not in result
+    assert [host['changed'] for host in result['results']] == [bool(index % 2) for index in range(10)]
+    assert fake_centreon.stats['PATCH configuration/hosts/{id}'] == 5
+    assert [host['address'] for host in fake_centreon.data['hosts'].values()] == [host['address'] for host in hosts]
+
+    result = run_module(manage_hosts, state='update', hosts=hosts)
+    assert result['changed'] is False
+    assert fake_centreon.stats['PATCH configuration/hosts/{id}'] == 5
+
+
+def test_hosts_with_unlisted_fields_are_compared(run_module, fake_centreon):
+    for index in range(4):
+        fake_centreon.add_host(name=f'host-{index}', address=f'10.0.0.{index}')
+
+    hosts = [dict(name=f'host-{index}', snmp_community='public') for index in range(2)]
+    assert run_module(manage_hosts, state='update', hosts=hosts)['changed'] is True
+    assert run_module(manage_hosts, state='update', hosts=hosts)['changed'] is False
+    assert fake_centreon.stats['PATCH configuration/hosts/{id}'] == 2
+    assert fake_centreon.stats['GET configuration/hosts/{id}'] == 4
+
+
+def test_failed_request_does_not_stop_the_others(run_module, fake_centreon):
+    fake_centreon.add_host(name='web', address='10.0.0.1')
+
+    result = run_module(manage_hosts, max_workers=1, hosts=[
+        dict(name='db', address='10.0.0.2', monitoring_server_id=1),
+        dict(name='app', address='10.0.0.3', monitoring_server_id=99),
+        dict(name='web', state='update', alias='Web server'),
+    ])
+    assert [host['failed'] for host in result['results']] == [False, True, False]
+    assert [host['changed'] for host in result['results']] == [True, False, True]
+    assert sorted(host['name'] for host in fake_centreon.data['hosts'].values()) == ['db', 'web']
+
+
+def test_check_mode(run_module, fake_centreon):
+    result = run_module(manage_hosts, check_mode=True, hosts=[dict(name='db', address='10.0.0.2', monitoring_server_id=1)])
+    assert result['changed'] is True
+    assert fake_centreon.data['hosts'] == {}
+
+
+def test_duplicate_hosts(run_module, fake_centreon):
+    result = run_module(manage_hosts, hosts=[dict(name='db'), dict(name='web'), dict(name='db')])
+    assert result['msg'] == 'Hosts listed more than once: db'
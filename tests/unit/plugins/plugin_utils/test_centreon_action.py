@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+from types import SimpleNamespace
+
+import pytest
+
+from ansible_collections.parnoud.centreon.plugins.action.list_all_host_groups import ActionModule
+from ansible_collections.parnoud.centreon.plugins.plugin_utils import centreon_action
+
+
+@pytest.fixture
+def action(fake_centreon, monkeypatch):
+    """Return a function building the list_all_host_groups action plugin for a task, with an empty client cache."""
+    monkeypatch.setattr(centreon_action, '_CLIENTS', {})
+
+    def build(transport='local', environment=None, async_val=0, **args):
+        args = dict(hostname=fake_centreon.url, username=fake_centreon.username,
+                    password=fake_centreon.password, **args)
+        task = SimpleNamespace(args=args, action='parnoud.centreon.list_all_host_groups', check_mode=False,
+                               diff=False, async_val=async_val, environment=environment)
+        connection = SimpleNamespace(transport=transport, has_native_async=False, _shell=SimpleNamespace(tmpdir=None))
+        plugin = ActionModule(task, connection, None, None, None)
+        # Records the tasks falling back to the regular module execution.
+        plugin._execute_module = lambda task_vars=None, wrap_async=False: dict(executed=True, wrap_async=wrap_async)
+        return plugin
+
+    return build
+
+
+def test_looped_items_share_one_client(fake_centreon, action):
+    fake_centreon.add('host_groups', name='linux')
+
+    for _ in range(3):
+        result = action().run(task_vars={})
+        assert [group['name'] for group in result['result']] == ['linux']
+        assert 'executed' not in result
+    assert fake_centreon.stats['logins'] == 1
+    assert len(centreon_action._CLIENTS) == 1
+
+    # Other connection parameters build another client.
+    action(timeout=5).run(task_vars={})
+    assert fake_centreon.stats['logins'] == 2
+    assert len(centreon_action._CLIENTS) == 2
+
+
+def test_client_key():
+    params = dict(hostname='https://centreon', username='admin', password='secret', token=None, search='linux')
+    key = ActionModule._client_key(params)
+
+    # Only the connection parameters count, and the secrets are not kept in clear.
+    assert key == ActionModule._client_key(dict(params, search='windows'))
+    assert key != ActionModule._client_key(dict(params, password='other'))
+    assert key != ActionModule._client_key(dict(params, timeout=5))
+    assert 'secret' not in repr(key)
+    assert dict(key)['token'] is None
+
+
+@pytest.mark.parametrize('options, in_process', [
+    (dict(), True),
+    (dict(transport='ansible.builtin.local'), True),
+    (dict(environment=[{}]), True),
+    (dict(transport='ssh'), False),
+    (dict(environment=[{'HTTPS_PROXY': 'http://proxy:3128'}]), False),
+    (dict(async_val=60), False),
+])
+def test_runs_in_process(fake_centreon, action, options, in_process):
+    plugin = action(**options)
+    assert plugin._runs_in_process() is in_process
+
+    result = plugin.run(task_vars={})
+    assert ('executed' in result) is not in_process
+    assert result.get('wrap_async', False) == bool(options.get('async_val'))
+    assert fake_centreon.stats['logins'] == int(in_process)
+
+
+def test_runs_the_module_without_the_requests_library(fake_centreon, action, monkeypatch):
+    monkeypatch.setattr(centreon_action, 'ANOTHER_LIBRARY_IMPORT_ERROR', 'No module named requests')
+    plugin = action()
+
+    assert not plugin._runs_in_process()
+    assert plugin.run(task_vars={}) == dict(executed=True, wrap_async=False)
+    assert fake_centreon.stats['logins'] == 0
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+#
+# parnoud centreon Ansible Modules
+# Version 1.0.0
+# Copyright (C) All Rights Reserved.
+
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+#
+
+import json
+
+import pytest
+import requests
+
+
+def login(server) -> dict:
+    response = requests.post(f"{server.url}/login", json={
+        'security': {'credentials': {'login': server.username, 'password': server.password}}
+    })
+    assert response.status_code == 200
+    return {'X-AUTH-TOKEN': response.json()['security']['token']}
+
+
+def get(server, endpoint: str, headers: dict, **params):
+    params = {key: json.dumps(value) if isinstance(value, (dict, list)) else value for key, value in params.items()}
+    return requests.get(f"{server.url}/{endpoint}", headers=headers, params=params)
+
+
+def test_requests_need_a_valid_token(fake_centreon):
+    assert get(fake_centreon, 'configuration/hosts', {}).status_code == 401
+    response = requests.post(f"{fake_centreon.url}/login", json={
+        'security': {'credentials': {'login': 'admin', 'password': 'wrong'}}
+    })
+    assert response.status_code == 401
+
+    headers = login(fake_centreon)
+    assert get(fake_centreon, 'configuration/hosts', headers).status_code == 200
+    assert requests.get(f"{fake_centreon.url}/logout", headers=headers).status_code == 200
+    assert get(fake_centreon, 'configuration/hosts', headers).status_code == 401
+
+
+def test_pagination_meta(fake_centreon):
+    fake_centreon.populate(hosts=25)
+    headers = login(fake_centreon)
+
+    response = get(fake_centreon, 'configuration/hosts', headers, page=3, limit=10).json()
+    assert [host['name'] for host in response['result']] == [f'host-{index:06d}' for index in range(20, 25)]
+    assert response['meta'] == {'page': 3, 'limit': 10, 'search': {}, 'sort_by': {}, 'total': 25}
+
+    fake_centreon.max_limit = 4
+    response = get(fake_centreon, 'configuration/hosts', headers, page=2, limit=10).json()
+    assert response['meta']['limit'] == 4
+    assert [host['id'] for host in response['result']] == [5, 6, 7, 8]
+
+
+@pytest.mark.parametrize('search, expected', [
+    ({'name': 'HOST-000003'}, [4]),
+    ({'name': {'$lk': 'host-00001_'}}, list(range(11, 21))),
+    ({'name': {'$nk': 'host-00000%'}}, list(range(11, 21))),
+    ({'name': {'$rg': '^host-0+[12]$'}}, [2, 3]),
+    ({'id': {'$in': [1, 5, 99]}}, [1, 5]),
+    ({'id': {'$ni': list(range(1, 19))}}, [19, 20]),
+    ({'id': {'$ge': 10, '$lt': 12}}, [10, 11]),
+    ({'id': {'$gt': 18}}, [19, 20]),
+    ({'id': {'$le': 2}}, [1, 2]),
+    ({'$or': [{'id': 1}, {'id': {'$neq': 1}, 'name': 'host-000019'}]}, [1, 20]),
+    ({'$and': [{'poller.id': 2}, {'id': {'$lt': 8}}]}, [2, 5]),
+    ([{'monitoring_server.name': 'Central'}, {'id': {'$gt': 15}}], [16, 19]),
+])
+def test_search(fake_centreon, search, expected):
+    fake_centreon.populate(hosts=20)
+    headers = login(fake_centreon)
+
+    response = get(fake_centreon, 'configuration/hosts', headers, limit=100, search=search).json()
+    assert [host['id'] for host in response['result']] == expected
+    assert response['meta']['total'] == len(expected)
+
+
+def test_search_on_relations_and_sort(fake_centreon):
+    fake_centreon.populate(hosts=30, host_groups=5)
+    group = fake_centreon.data['host_groups'][2]
+    members = sorted(host['id'] for host in fake_centreon.data['hosts'].values() if group['id'] in host['groups'])
+    headers = login(fake_centreon)
+
+    response = get(fake_centreon, 'configuration/hosts', headers, limit=100, search={'group.name': group['name']}).json()
+    assert [host['id'] for host in response['result']] == members
+
+    response = get(fake_centreon, 'configuration/hosts', headers, limit=3, sort_by={'name': 'DESC'}).json()
+    assert [host['name'] for host in response['result']] == ['host-000029', 'host-000028', 'host-000027']
+
+
+def test_injected_faults(fake_centreon):
+    headers = login(fake_centreon)
+
+    fake_centreon.fail_next(503)
+    assert get(fake_centreon, 'configuration/hosts', headers).status_code == 503
+    assert get(fake_centreon, 'configuration/hosts', headers).status_code == 200
+
+    fake_centreon.throttle_rate = 1.0
+    fake_centreon.retry_after = 7
+    response = get(fake_centreon, 'configuration/hosts', headers)
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '7'
+    assert fake_centreon.stats['throttled'] == 1
+    assert fake_centreon.stats['failures'] == 1
+
+
+def test_reload_updates_the_monitoring_server_listing(fake_centreon):
+    fake_centreon.populate(hosts=10, monitoring_servers=2)
+    headers = login(fake_centreon)
+
+    listing = get(fake_centreon, 'configuration/monitoring-servers', headers).json()['result']
+    assert [poller['is_updated'] for poller in listing] == [False, False]
+
+    host = get(fake_centreon, 'configuration/hosts', headers, search={'poller.id': 2}).json()['result'][0]
+    response = requests.patch(f"{fake_centreon.url}/configuration/hosts/{host['id']}", headers=headers, json={'alias': 'new'})
+    assert response.status_code == 204
+    listing = get(fake_centreon, 'configuration/monitoring-servers', headers).json()['result']
+    assert [poller['is_updated'] for poller in listing] == [False, True]
+
+    response = get(fake_centreon, 'configuration/monitoring-servers/2/generate-and-reload', headers)
+    assert response.status_code == 204
+    listing = get(fake_centreon, 'configuration/monitoring-servers', headers).json()['result']
+    assert listing[1]['is_updated'] is False
+    assert listing[1]['last_restart'] is not None
+
+
+def test_subprocess(fake_centreon_process):
+    url = fake_centreon_process('--hosts', '12', '--max-limit', '5')
+    base_url = url.split('/centreon/')[0]
+
+    response = requests.post(f"{url}/login", json={'security': {'credentials': {'login': 'admin', 'password': 'centreon'}}})
+    headers = {'X-AUTH-TOKEN': response.json()['security']['token']}
+    response = requests.get(f"{url}/configuration/hosts", headers=headers, params={'limit': 100}).json()
+    assert response['meta'] == {'page': 1, 'limit': 5, 'search': {}, 'sort_by': {}, 'total': 12}
+
+    assert requests.post(f"{base_url}/_fake/faults", json={'fail_next': {'code': 502}}).status_code == 204
+    assert requests.get(f"{url}/configuration/hosts", headers=headers).status_code == 502
+    assert requests.get(f"{base_url}/_fake/stats").json()['failures'] == 1